@@ -1,9 +1,17 @@
 import py_compile
+import importlib.util
 import os
 from pathlib import Path
 
 
 current_dir = Path(__file__).parent
+
+# The constants are loaded directly rather than importing pscharmonics so that a logger and its log files are not
+# created when compiling
+_spec = importlib.util.spec_from_file_location('constants', current_dir.joinpath('pscharmonics', 'constants.py'))
+constants = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(constants)
+
 target_dir = Path(current_dir).joinpath('compiled')
 
 if __name__ == '__main__':
@@ -11,6 +19,9 @@ if __name__ == '__main__':
 	if not Path(target_dir).is_dir():
 		Path(target_dir).mkdir()
 
+	# Precompile the colour map used for the graphs so that the workbook is not read when exporting results
+	print(constants.Results().compile_color_map())
+
 	for file in Path(current_dir).rglob('*.*'):
 		file_name = file.name
 		# skip test_files
@@ -10,22 +10,42 @@
 import importlib
 import sys
 
-import pscharmonics.logger as logger
-import pscharmonics.file_io as file_io
-import pscharmonics.pf as pf
 import pscharmonics.constants as constants
-import pscharmonics.gui as gui
-import pscharmonics.batch_mode as batch_mode
+import pscharmonics.logger as logger
+
+# Submodules which depend on pandas, numpy, shapely, xlsxwriter or tkinter are only imported the first time they are
+# used (i.e. pscharmonics.pf) so that each entry point only loads the dependencies it needs.  Listed in the order they
+# depend on each other.
+lazy_modules = ('timing', 'progress', 'file_io', 'pf_mock', 'pf', 'gui', 'batch_mode')
+
+
+def __getattr__(name):
+	"""
+		Imports the submodule the first time it is accessed as an attribute of the package
+	:param str name:  Name of the submodule
+	:return module:  Imported submodule
+	"""
+	if name in lazy_modules:
+		return importlib.import_module('{}.{}'.format(__name__, name))
+	raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+# Module level __getattr__ is not supported before Python 3.7 and so all submodules are imported
+if sys.version_info < (3, 7):
+	for _module_name in lazy_modules:
+		importlib.import_module('{}.{}'.format(__name__, _module_name))
 
-# Reload all modules so that if run from PowerFactory doesn't need to be closed and reopened during debugging
-logger = importlib.reload(logger)
-file_io = importlib.reload(file_io)
-pf = importlib.reload(pf)
-constants = importlib.reload(constants)
-gui = importlib.reload(gui)
-batch_mode = importlib.reload(batch_mode)
+# Reload all modules so that if run from PowerFactory doesn't need to be closed and reopened during debugging, only
+# the submodules which have already been imported are reloaded since the others will be imported when first used
+if constants.RELOAD_MODULES:
+	constants = importlib.reload(constants)
+	logger = importlib.reload(logger)
+	for _module_name in lazy_modules:
+		_full_name = '{}.{}'.format(__name__, _module_name)
+		if _full_name in sys.modules:
+			importlib.reload(sys.modules[_full_name])
 
 if constants.logger is None:
 	constants.logger = logger.Logger()
 	# Redirect exceptions to be capture by logger
-	sys.excepthook = constants.logger.exception_handler
\ No newline at end of file
+	sys.excepthook = constants.logger.exception_handler
@@ -12,13 +12,35 @@ import os
 import pscharmonics
 import time
 
-def run(pth_inputs=str(), test_settings=None, list_files=None):
+def run(pth_inputs=str(), test_settings=None, list_files=None, progress_callback=None):
 	"""
 		Function to run the study in batch mode with the inputs spreadsheet provided
 	:param str pth_inputs:  Full path of settings file to import
 	:param pscharmonics.file_io.StudyInputs test_settings:  Allows pre-loaded settings to be provided in cases where
 															settings need to be adjusted slightly for testing
 	:param list list_files:	List of files to run through for studies
+	:param function progress_callback:  (optional=None) Function called with each pscharmonics.progress.ProgressEvent
+										whilst the results are processed
+	:return bool success:  Returns True if all studies run successfully
+	"""
+	# Any progress events from processing the results are also sent to the callback provided
+	if progress_callback is not None:
+		pscharmonics.progress.add_listener(progress_callback)
+	try:
+		success = run_inputs(pth_inputs=pth_inputs, test_settings=test_settings, list_files=list_files)
+	finally:
+		if progress_callback is not None:
+			pscharmonics.progress.remove_listener(progress_callback)
+
+	return success
+
+def run_inputs(pth_inputs=str(), test_settings=None, list_files=None):
+	"""
+		Function to run the studies for each of the inputs provided, called by run
+	:param str pth_inputs:  Full path of settings file to import
+	:param pscharmonics.file_io.StudyInputs test_settings:  Allows pre-loaded settings to be provided in cases where
+															settings need to be adjusted slightly for testing
+	:param list list_files:	List of files to run through for studies
 	:return bool success:  Returns True if all studies run successfully
 	"""
 	# Initially success flag is set to False
@@ -51,6 +73,9 @@ def run(pth_inputs=str(), test_settings=None, list_files=None):
 			# Update UID
 			pscharmonics.constants.uid = time.strftime('%Y%m%d_%H%M%S')
 
+		# Timing report only includes the studies for this inputs file
+		pscharmonics.timing.timings.clear()
+
 		if test_settings:
 			inputs = input_file
 		else:
@@ -66,6 +91,15 @@ def run(pth_inputs=str(), test_settings=None, list_files=None):
 			fs_settings=inputs.fs_settings
 		)
 
+		# Results folder is named after the results file
+		pth_results = os.path.join(inputs.settings.export_folder, inputs.settings.results_name)
+		results_folder = os.path.splitext(pth_results)[0]
+
+		# If resuming a previous study then the cases which already have results are not created or checked again
+		completed = None
+		if pscharmonics.constants.Results.resume_studies and os.path.isdir(results_folder):
+			completed = pscharmonics.pf.find_completed_results(pth=results_folder, fs_settings=inputs.fs_settings)
+
 		# Determine whether to run and export a pre-case check
 		if inputs.settings.pre_case_check:
 			pre_case_check_file = os.path.join(
@@ -81,12 +115,14 @@ def run(pth_inputs=str(), test_settings=None, list_files=None):
 				export_pth=pre_case_check_file,
 				contingencies=inputs.contingencies,
 				contingencies_cmd=inputs.contingency_cmd,
-				include_intact=inputs.settings.include_intact
+				include_intact=inputs.settings.include_intact,
+				completed=completed
 			)
 
 		# Update results folder to include the results file_name
-		pth_results = os.path.join(inputs.settings.export_folder, inputs.settings.results_name)
-		inputs.settings.add_folder(pth_results_file=pth_results)
+		inputs.settings.add_folder(
+			pth_results_file=pth_results, keep_existing=pscharmonics.constants.Results.resume_studies
+		)
 
 		# Run the full study
 		# Iterate through each project and create the various cases, the includes running a pre-case check but no
@@ -8,11 +8,10 @@
 #######################################################################################################################
 """
 
-import pandas as pd
-import numpy as np
 import os
 import sys
 import glob
+import json
 import time
 
 # Label used when displaying messages
@@ -24,6 +23,10 @@ logger = None
 
 DEBUG = False
 
+# When set to True the modules that have already been imported are reloaded each time the package is imported so that
+# changes are picked up when run from PowerFactory without it needing to be closed and reopened during debugging
+RELOAD_MODULES = False
+
 # Unique identifier populated for each study run
 uid = time.strftime('%Y%m%d_%H%M%S')
 
@@ -51,6 +54,21 @@ class General:
 	progress_log = 'INFO'
 	error_log = 'ERROR'
 
+	# When set to True log messages are passed through a bounded queue to a background thread which formats them and
+	# writes them to the log files so that the studies are not held up.  If the queue is full then the study waits
+	# until there is space rather than messages being lost.
+	async_logging = False
+	log_queue_size = 10000
+
+	# Minimum time in seconds between progress messages being logged for stages with a large number of items
+	progress_log_interval = 10.0
+
+	# Files cached between runs are specific to each user and so are kept in the user's local application data folder
+	# rather than with the scripts or the results
+	cache_folder = os.path.join(
+		os.environ.get('LOCALAPPDATA', os.path.join(os.path.expanduser('~'), '.cache')), 'PSC_Harmonics'
+	)
+
 	user_guide_reference='JA7896-03 PSC Harmonics User Guide.pdf'
 	user_guide_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'docs'))
 	user_guide_pth = os.path.join(user_guide_folder, user_guide_reference)
@@ -131,6 +149,8 @@ class PowerFactory:
 	pf_results = 'ElmRes'
 	pf_network_elements = 'ElmNet'
 	pf_project = 'IntPrj'
+	# Attribute of every object which gives the time it was last modified
+	pf_modified_time = 'tstamp'
 	# Command for carrying out contingency analysis and applying each outage
 	pf_cont_analysis = 'ComSimoutage'
 	pf_outage = 'ComOutage'
@@ -139,6 +159,7 @@ class PowerFactory:
 	pf_folder_type = 'IntFolder'
 	pf_fault_cases_folder = 'IntFltcases'
 	pf_netdata_folder_type = 'netdat'
+	pf_type_library_folder_type = 'equip'
 	pf_faults_folder_type = 'fault'
 	pf_sc_folder_type = 'study'
 	pf_os_folder_type = 'scen'
@@ -189,6 +210,41 @@ class PowerFactory:
 	# Number of seconds to allow when waiting for parallel processor response
 	parallel_time_out = 100
 
+	# Maximum number of PowerFactory engines used to run the studies for different projects at the same time, each
+	# worker process has its own engine and so needs a license.  1 will run the projects one after another in this
+	# process and 0 will use a worker process for every project.
+	max_engines = 1
+
+	# When set to True the in-process stand-in for the powerfactory module (pscharmonics.pf_mock) is imported instead
+	# of the DIgSILENT module so the study pipeline can be run and benchmarked without an installation or license
+	mock_engine = False
+	# Seconds added to every Execute() call of a mock command, values in mock_latency_by_class (keyed by the
+	# PowerFactory class name, e.g. ComLdf) take precedence over the default
+	mock_latency = 0.0
+	mock_latency_by_class = dict()
+	# Names of the contingencies (wildcards supported) for which a mock load flow or the mock contingency analysis
+	# reports the case as non-convergent
+	mock_nonconvergent = tuple()
+
+	# Settings (as <class name>.<attribute>) which may be changed at runtime and so are passed from the main process to
+	# each of the worker processes used when max_engines is greater than 1
+	worker_settings = (
+		'PowerFactory.mock_engine',
+		'PowerFactory.mock_latency',
+		'PowerFactory.mock_latency_by_class',
+		'PowerFactory.mock_nonconvergent',
+		'PowerFactory.parallel_time_out',
+		'PowerFactory.license_activation_attempts',
+		'PowerFactory.license_activation_delay',
+		'Contingencies.parallel_threshold',
+		'Contingencies.batch_pre_case',
+		'Contingencies.cache_pre_case',
+		'Contingencies.pre_case_cache_file',
+		'Contingencies.pre_case_cache_max_entries',
+		'Results.resume_studies',
+		'General.progress_log_interval',
+	)
+
 	# This is a maximum impedance value, above this and it is assumed to be open circuit and will be ignored
 	max_impedance = 1E6
 
@@ -359,6 +415,7 @@ class Contingencies:
 	cont = 'Contingency'
 	idx = 'Contingency Number'
 	status = 'Convergent'
+	already_run = 'Already Run'
 
 	# Contingencies are provided for either circuit breakers or lines, these are provided in a dictionary which
 	# uses the following keys to identify them
@@ -373,6 +430,20 @@ class Contingencies:
 	# Maximum number of contingencies before which studies will be run using parallel processing
 	parallel_threshold = 50
 
+	# When set to True the pre-case check of every contingency for a study case is carried out as a single
+	# contingency analysis (ComSimoutage) run on the base case rather than a separate load flow for each contingency.
+	# If the contingency analysis cannot be run then the load flows are run for each contingency as before.
+	batch_pre_case = False
+
+	# When set to True the convergence found by the pre-case check is saved and reused for any study case where the
+	# study case, operating scenario, network elements, type library, load flow settings and contingencies have not
+	# changed since.  Only the most recently used entries are kept.
+	cache_pre_case = False
+	pre_case_cache_file = os.path.join(General.cache_folder, 'pre_case_cache.json')
+	pre_case_cache_max_entries = 200
+	# Increased if the format of the cache changes so that previous entries are ignored
+	pre_case_cache_version = 2
+
 	# Variables to keep from cont_results
 	col_object = 'b:i_obj'
 	col_number = 'b:number'
@@ -421,7 +492,18 @@ class Results:
 	study_fs = 'FS'
 	# Symbol used to join study_case name with contingency name
 	joiner = '_'
+
+	# When set to True an existing results folder is kept and any case which already has a complete frequency scan
+	# results file in it is not created or run again, so that a study which failed part way through can be resumed.
+	# The unique time stamp is then not appended to the results name in the inputs so that running the same inputs
+	# again finds the results folder from the previous run.
+	resume_studies = False
 	extension = '.xlsx'
+
+	# When set to True a report detailing the time taken by each stage of the studies is written as JSON and CSV files
+	# to the results folder and alongside the results workbook
+	timing_report = True
+	timing_file_name = 'Timings'
 	# Labels used for frequency scan results extract
 	lbl_StudyCase = 'Study Case'
 	lbl_Frequency = 'Frequency in Hz'
@@ -494,8 +576,32 @@ class Results:
 	# Font size for chart title
 	font_size_chart_title = 14
 
+	# Number of worker processes used to import the results files in each folder, 1 will import the files serially and
+	# 0 will use a worker process for each available processor
+	ingest_workers = 1
+
+	# When set to True processed results files are cached alongside the raw .csv results as numpy .npz files so that
+	# they do not need reprocessing if they are combined again.  Disabled by default since it writes additional files
+	# to the results folders.  The version is increased if the format of the processed results changes.
+	cache_results = False
+	cache_extension = '.npz'
+	cache_version = 2
+
+	# If True the results workbook is written one node at a time using the xlsxwriter constant_memory mode rather than
+	# the whole workbook being held in memory until it is saved
+	streaming_export = False
 
 
+
+	# Colour map used for the N-1 contingencies in the graphs, the precompiled table is produced from the workbook
+	# by compiler.py and is only used if it is newer than the workbook.  The table for any other workbook is stored
+	# alongside that workbook.
+	color_map_file = os.path.join(local_directory, 'N1_color_map.xlsm')
+	color_map_table = os.path.join(local_directory, 'N1_color_map.json')
+	color_map_table_extension = '.json'
+	# Colour maps already loaded by this process, keyed by the full path to the workbook
+	color_maps = dict()
+
 	def __init__(self):
 		"""
 			Initial class
@@ -504,10 +610,92 @@ class Results:
 
 	def get_color_map(self, pth_color_map=None, refresh=False):
 		"""
-			Obtains a dictionary of the colors to use for plotting graphs in excel.
+			Obtains a dictionary of the colors to use for plotting graphs in excel.  Each colour map is only loaded
+			once per process and then shared by all instances.
 		:param: str pth_color_map: (Optional=None) - If a different color map is desired can be passed as input
+		:param bool refresh: (Optional=False) - If True then the colour map is loaded again
 		:return dict color_map:  Returns a dictionary of the color map based on N-1 contingency : hex color code
 		"""
+		if not refresh and len(self.color_map) > 0:
+			return self.color_map
+
+		# If no color map has been provided then use the default one in the script directory
+		if pth_color_map is None:
+			pth_color_map = self.color_map_file
+		key = os.path.abspath(pth_color_map)
+
+		if refresh or key not in Results.color_maps:
+			if self.table_up_to_date(pth_color_map=pth_color_map):
+				Results.color_maps[key] = self.load_color_map_table(pth_table=self.table_path(pth_color_map))
+			else:
+				Results.color_maps[key] = self.read_color_map(pth_color_map=pth_color_map)
+
+		self.color_map = Results.color_maps[key]
+		return self.color_map
+
+	def table_path(self, pth_color_map=None):
+		"""
+			Returns the path to the precompiled colour map table for a workbook
+		:param: str pth_color_map: (Optional=None) - Workbook the table is produced from, if None then the default one
+		:return str pth_table:  Full path to the table
+		"""
+		if pth_color_map is None or os.path.abspath(pth_color_map) == os.path.abspath(self.color_map_file):
+			return self.color_map_table
+		return '{}{}'.format(os.path.splitext(pth_color_map)[0], self.color_map_table_extension)
+
+	def table_up_to_date(self, pth_color_map=None):
+		"""
+			Confirms the precompiled colour map table exists and was produced after the workbook was last modified
+		:param: str pth_color_map: (Optional=None) - Workbook the table is produced from, if None then the default one
+		:return bool up_to_date:
+		"""
+		if pth_color_map is None:
+			pth_color_map = self.color_map_file
+		pth_table = self.table_path(pth_color_map=pth_color_map)
+
+		if not os.path.isfile(pth_table):
+			return False
+		if not os.path.isfile(pth_color_map):
+			return True
+		return os.path.getmtime(pth_table) >= os.path.getmtime(pth_color_map)
+
+	def load_color_map_table(self, pth_table=None):
+		"""
+			Loads the precompiled colour map table
+		:param str pth_table: (Optional=None) - Table to load, if None then the table for the default workbook
+		:return dict color_map:  Dictionary of N-1 contingency : hex color code
+		"""
+		with open(pth_table or self.color_map_table, 'r') as f:
+			pairs = json.load(f)
+		# Rows in the workbook without a contingency number have nan keys which are each a separate entry, the number
+		# of entries determines the number of colours used and so a new nan is created for each one
+		return {key if key == key else float('nan'): value for key, value in pairs}
+
+	def compile_color_map(self, pth_color_map=None):
+		"""
+			Produces the precompiled colour map table from the workbook so that the workbook does not need to be
+			read when the results are exported.  The table is saved alongside the workbook.
+		:param: str pth_color_map: (Optional=None) - Workbook to compile, if None then the default one is used
+		:return str pth_table:  Full path to the table produced
+		"""
+		color_map = self.read_color_map(pth_color_map=pth_color_map or self.color_map_file)
+		pth_table = self.table_path(pth_color_map=pth_color_map)
+		# Stored as a list of pairs so that the type of the keys is retained
+		with open(pth_table, 'w') as f:
+			json.dump([[key, value] for key, value in color_map.items()], f)
+		return pth_table
+
+	@staticmethod
+	def read_color_map(pth_color_map):
+		"""
+			Reads the colour map from the workbook
+		:param: str pth_color_map: Full path to the workbook
+		:return dict color_map:  Dictionary of N-1 contingency : hex color code
+		"""
+		# Imported here so that pandas is only loaded when needed rather than whenever the constants are imported
+		import numpy as np
+		import pandas as pd
+
 		def hex_converter(value):
 			"""
 				Used to convert the number to a hex value including leading # during import of excel
@@ -520,13 +708,6 @@ class Results:
 			else:
 				return '#{}'.format(value)
 
-		if not refresh and len(self.color_map) > 0:
-			return self.color_map
-
-		# If no color map has been provided then use the default one in the script directory
-		if pth_color_map is None:
-			pth_color_map = os.path.join(os.path.dirname(os.path.realpath(__file__)),'N1_color_map.xlsm')
-
 		# Import data into a DataFrame in case there is any other processing that needs to be done
 		df_colormap = pd.read_excel(
 			pth_color_map, header=0, usecols=(0,1), converters={1: hex_converter}
@@ -537,17 +718,20 @@ class Results:
 		# to determine the plots
 		df_colormap.dropna(axis=0, inplace=True)
 
-		# Extract the index and color values
-		index = df_colormap.index
-		values = df_colormap.iloc[:,0]
+		# Extract the index and color values, converted to python types so they can be stored in the table
+		index = df_colormap.index.tolist()
+		values = df_colormap.iloc[:,0].tolist()
 
 		# Produce dictionary for lookup and return
-		self.color_map=dict(zip(index, values))
-		return self.color_map
+		return dict(zip(index, values))
 
 class StudyInputs:
 	file_name = 'Inputs'
 	file_format = '.xlsx'
+	# The parsed inputs are cached by the process, keyed by a hash of the workbook, so that the same inputs are not
+	# parsed again when combining several results folders.  Increased if the format changes.
+	cache_inputs = True
+	cache_version = 1
 	base_case = 'Base_Case'
 	mutual_variables = ["c:Z_12", "c:R_12", "c:X_12"]
 	fs_term_variables = ["m:R", "m:X", "m:Z", "m:phiz", "e:uknom"]
@@ -604,6 +788,10 @@ class LociInputs:
 	percentage_to_exclude = 'Percentage to Exclude (%)'
 	max_vertices = 'Maximum No. Vertices'
 
+	# Number of worker processes used to calculate the convex hull for each node and harmonic number, 1 will calculate
+	# them serially and 0 will use a worker process for each available processor
+	hull_workers = 1
+
 	# Default values to use for if no loci vertice restrictions are in place
 	unlimited_identifier = 10000
 	def_max_vertices = unlimited_identifier
@@ -625,6 +813,9 @@ class GuiDefaults:
 	# Default labels for buttons (only those which get changed during running)
 	button_select_settings_label = 'Select Settings File'
 
+	# Minimum time in seconds between updates of the status label with the progress of a stage
+	progress_refresh = 0.25
+
 	# Default extensions used in file type selection windows
 	xlsx_types = (('xlsx files', '*.xlsx'), ('All Files', '*.*'))
 
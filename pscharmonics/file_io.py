@@ -10,6 +10,8 @@
 
 import os
 import pscharmonics.constants as constants
+import pscharmonics.timing as timing
+import pscharmonics.progress as progress
 import glob
 import pandas as pd
 import numpy as np
@@ -17,9 +19,18 @@ import shapely.geometry
 import collections
 import math
 import shutil
+import tempfile
 import time
+import concurrent.futures
+import hashlib
+import json
+import logging
+import logging.handlers
+import io
+import pickle
 import xlsxwriter
 import xlsxwriter.utility
+import pandas.io.formats.excel
 # import matplotlib.pyplot as plt
 
 def update_duplicates(key, df):
@@ -63,6 +74,156 @@ def update_duplicates(key, df):
 
 	return df_updated, updated
 
+def remove_duplicated_columns(df):
+	"""
+		Function removes any columns which have the same column label and exactly the same values as an earlier column.
+		Only columns with duplicated labels are compared and the values of each column are hashed so that the full
+		comparison is only needed when the hashes match.
+	:param pd.DataFrame df:  DataFrame to be processed
+	:return pd.DataFrame df:  DataFrame with the duplicated columns removed
+	"""
+	duplicated_labels = df.columns.duplicated(keep=False)
+	if not duplicated_labels.any():
+		return df
+
+	to_keep = np.ones(len(df.columns), dtype=bool)
+	# Lookup of (column label, hash of values) to the column numbers already kept
+	kept_columns = dict()
+	for i in np.flatnonzero(duplicated_labels):
+		values = df.iloc[:, i]
+		key = (df.columns[i], hash(pd.util.hash_array(values.values).tobytes()))
+		if key in kept_columns:
+			# Hashes match so confirm values actually match before removing
+			if any(values.equals(df.iloc[:, j]) for j in kept_columns[key]):
+				to_keep[i] = False
+				continue
+			kept_columns[key].append(i)
+		else:
+			kept_columns[key] = [i]
+
+	return df.iloc[:, np.flatnonzero(to_keep)]
+
+def encode_labels(labels):
+	"""
+		Converts a list of index or column labels into arrays which can be saved without pickling, numbers and strings
+		are stored separately along with the type of each label
+	:param iterable labels:  Labels which are each a number or a string
+	:return (np.ndarray, np.ndarray, np.ndarray) (kinds, numbers, text):  Type of each label (0 = float, 1 = int,
+		2 = str) with the numeric and string values
+	"""
+	kinds = list()
+	numbers = list()
+	text = list()
+	for label in labels:
+		if isinstance(label, str):
+			kinds.append(2)
+			numbers.append(0.0)
+			text.append(label)
+		elif isinstance(label, (int, np.integer)) and not isinstance(label, bool):
+			kinds.append(1)
+			numbers.append(float(label))
+			text.append('')
+		elif isinstance(label, (float, np.floating)):
+			kinds.append(0)
+			numbers.append(float(label))
+			text.append('')
+		else:
+			raise TypeError('Label {} of type {} cannot be cached'.format(label, type(label)))
+	return np.array(kinds, dtype=np.int8), np.array(numbers, dtype=float), np.array(text, dtype=str)
+
+def decode_labels(kinds, numbers, text):
+	"""
+		Converts the arrays produced by encode_labels back into a list of labels
+	:param np.ndarray kinds:  Type of each label
+	:param np.ndarray numbers:  Numeric values
+	:param np.ndarray text:  String values
+	:return list labels:
+	"""
+	labels = list()
+	for kind, number, label in zip(kinds.tolist(), numbers.tolist(), text.tolist()):
+		if kind == 2:
+			labels.append(label)
+		elif kind == 1:
+			labels.append(int(number))
+		else:
+			labels.append(number)
+	return labels
+
+def write_processed_results(pth, key, df):
+	"""
+		Saves processed results to a numpy .npz file.  The values, index and each level of the columns are stored as
+		separate arrays so that the file can be loaded without unpickling anything.
+	:param str pth:  Full path to the file to write
+	:param tuple key:  Key which must match for the cached results to be used
+	:param pd.DataFrame df:  Processed results with a MultiIndex for the columns
+	:return None:
+	"""
+	# Only a single data type is supported so that the values can be stored in a single numeric array
+	dtypes = df.dtypes.unique()
+	if len(dtypes) > 1:
+		raise TypeError('Results with multiple data types {} cannot be cached'.format(dtypes))
+
+	arrays = dict()
+	arrays['values'] = df.to_numpy(dtype=float)
+	arrays['index_kinds'], arrays['index_numbers'], arrays['index_text'] = encode_labels(df.index)
+	for i, level in enumerate(df.columns.levels):
+		(
+			arrays['level{}_kinds'.format(i)], arrays['level{}_numbers'.format(i)], arrays['level{}_text'.format(i)]
+		) = encode_labels(level)
+		arrays['level{}_codes'.format(i)] = np.asarray(df.columns.codes[i], dtype=np.int64)
+
+	details = dict(
+		key=list(key),
+		dtype=str(dtypes[0]) if len(dtypes) else 'float64',
+		index_name=df.index.name,
+		index_dtype=str(df.index.dtype),
+		column_names=list(df.columns.names),
+		level_dtypes=[str(x.dtype) for x in df.columns.levels],
+	)
+	arrays['details'] = np.array(json.dumps(details))
+
+	with open(pth, 'wb') as f:
+		np.savez(f, **arrays)
+
+	return None
+
+def read_processed_results(pth, key):
+	"""
+		Loads processed results saved by write_processed_results
+	:param str pth:  Full path to the file to read
+	:param tuple key:  Key which must match for the cached results to be used
+	:return pd.DataFrame df:  Processed results or None if the key does not match
+	"""
+	with np.load(pth, allow_pickle=False) as arrays:
+		details = json.loads(str(arrays['details']))
+		if details['key'] != json.loads(json.dumps(list(key))):
+			return None
+
+		levels = list()
+		codes = list()
+		for i, dtype in enumerate(details['level_dtypes']):
+			levels.append(pd.Index(
+				decode_labels(
+					arrays['level{}_kinds'.format(i)], arrays['level{}_numbers'.format(i)],
+					arrays['level{}_text'.format(i)]
+				), dtype=dtype
+			))
+			codes.append(arrays['level{}_codes'.format(i)])
+		columns = pd.MultiIndex(levels=levels, codes=codes, names=details['column_names'])
+
+		# JSON returns lists so names which were tuples are converted back
+		index_name = details['index_name']
+		if isinstance(index_name, list):
+			index_name = tuple(index_name)
+		index = pd.Index(
+			decode_labels(arrays['index_kinds'], arrays['index_numbers'], arrays['index_text']),
+			dtype=details['index_dtype'], name=index_name
+		)
+
+		df = pd.DataFrame(arrays['values'], index=index, columns=columns).astype(details['dtype'])
+
+	return df
+
 def delete_old_files(pth, logger, thresholds=constants.General.file_number_thresholds):
 	"""
 		Counts the number of files in a folder and if greater than a certain number it will warn the
@@ -125,6 +286,169 @@ def delete_old_files(pth, logger, thresholds=constants.General.file_number_thres
 
 	return num_deleted
 
+class StreamingExcelWriter:
+	"""
+		Alternative to pd.ExcelWriter which writes the workbook using the xlsxwriter constant_memory mode so that each
+		row is written to disk once complete rather than the whole workbook being held in memory until it is saved.
+
+		Since constant_memory requires each worksheet to be written in row order the DataFrames for a worksheet are
+		buffered as cells and then written in row order when the next worksheet is started or the workbook closed.
+	"""
+	# Format used for the header and index cells to match pd.DataFrame.to_excel
+	header_format = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+	def __init__(self, pth_file):
+		"""
+			Create the workbook
+		:param str pth_file:  File to save workbook to
+		"""
+		self.book = xlsxwriter.Workbook(pth_file, {'constant_memory': True})
+		self.sheets = dict()
+		self.header = self.book.add_format(self.header_format)
+
+		# Cells buffered for the current worksheet
+		self.sheet_name = None
+		self.cells = list()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.close()
+
+	def add_sheet(self, sheet_name):
+		"""
+			Writes the cells for the previous worksheet and then adds the new worksheet
+		:param str sheet_name:  Name of the worksheet to add
+		:return None:
+		"""
+		self.write_sheet()
+		self.sheets[sheet_name] = self.book.add_worksheet(sheet_name)
+		self.sheet_name = sheet_name
+
+		return None
+
+	def to_excel(self, df, sheet_name, startrow, startcol, header=True):
+		"""
+			Buffers the cells for a DataFrame in the same layout as pd.DataFrame.to_excel with merged header cells
+		:param pd.DataFrame df:  DataFrame to be written
+		:param str sheet_name:  Name of worksheet
+		:param int startrow:  Row to start the DataFrame from
+		:param int startcol:  Column to start the DataFrame from
+		:param bool header:  (optional=True) - Include the header labels
+		:return None:
+		"""
+		if sheet_name != self.sheet_name:
+			self.add_sheet(sheet_name=sheet_name)
+
+		formatter = pandas.io.formats.excel.ExcelFormatter(df, merge_cells=True, header=header, index_label=False)
+		for cell in formatter.get_formatted_cells():
+			if cell.mergestart is not None and cell.mergeend is not None:
+				merge = (startrow + cell.mergestart, startcol + cell.mergeend)
+			else:
+				merge = None
+			self.cells.append((startrow + cell.row, startcol + cell.col, cell.val, cell.style is not None, merge))
+
+		return None
+
+	def write_sheet(self):
+		"""
+			Writes the buffered cells for the current worksheet in row order and then releases them
+		:return None:
+		"""
+		if self.sheet_name is None:
+			return None
+
+		sht = self.sheets[self.sheet_name]
+		self.cells.sort(key=lambda x: (x[0], x[1]))
+		for row, col, val, header, merge in self.cells:
+			cell_format = self.header if header else None
+			if merge is not None:
+				sht.merge_range(row, col, merge[0], merge[1], val, cell_format)
+			elif val != '':
+				sht.write(row, col, val, cell_format)
+
+		self.cells = list()
+		self.sheet_name = None
+
+		return None
+
+	def close(self):
+		"""
+			Writes the last worksheet and saves the workbook
+		:return None:
+		"""
+		self.write_sheet()
+		self.book.close()
+
+		return None
+
+class NodeResultsStore:
+	"""
+		Temporary store of the processed results split by reference terminal.  Each processed results file is split
+		into the results for each node which are appended to a separate file for that node, the results for a single
+		node can then be loaded without the results for every node being held in memory.
+	"""
+	def __init__(self):
+		self.folder = tempfile.mkdtemp(prefix='pscharmonics_nodes_')
+		# Dictionary of node name to the file containing the results for that node
+		self.files = dict()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.close()
+
+	def add(self, df):
+		"""
+			Splits the processed results by reference terminal and appends them to the file for each node
+		:param pd.DataFrame df:  Processed results as returned by PreviousResultsExport.load_file
+		:return None:
+		"""
+		for node_name, df_node in df.groupby(axis=1, level=constants.Results.lbl_Reference_Terminal):
+			# Columns which were only used for the frequency are not needed
+			if node_name == constants.Results.lbl_to_delete:
+				continue
+			if node_name not in self.files:
+				self.files[node_name] = os.path.join(self.folder, '{}.pkl'.format(len(self.files)))
+			with open(self.files[node_name], 'ab') as f:
+				pickle.dump(df_node, f, protocol=pickle.HIGHEST_PROTOCOL)
+		return None
+
+	def nodes(self):
+		"""
+			Names of the nodes in the order they are exported
+		:return list nodes:
+		"""
+		return sorted(self.files)
+
+	def load(self, node_name):
+		"""
+			Loads all of the results for a node and then deletes them from the store
+		:param str node_name:  Name of the reference terminal
+		:return pd.DataFrame df:  Results for this node from every results file
+		"""
+		pth = self.files.pop(node_name)
+		dfs = list()
+		with open(pth, 'rb') as f:
+			while True:
+				try:
+					dfs.append(pickle.load(f))
+				except EOFError:
+					break
+		os.remove(pth)
+		return pd.concat(dfs, axis=1, sort=True)
+
+	def close(self):
+		"""
+			Deletes the temporary files
+		:return None:
+		"""
+		shutil.rmtree(self.folder, ignore_errors=True)
+		self.files = dict()
+		return None
+
 class ExtractResults:
 	"""
 		Values defined during import
@@ -135,6 +459,10 @@ class ExtractResults:
 	exclude = dict()  # type: dict
 	max_vertices = dict()  # type: dict
 	nom_frequency = float()  # type: float
+	band_index = None  # type: dict
+	# If True the results for each node are loaded, processed and written in turn using StreamingExcelWriter so that
+	# only a single node is held in memory
+	streaming_export = constants.Results.streaming_export  # type: bool
 
 	def __init__(self, target_file, search_paths):
 		"""
@@ -148,28 +476,35 @@ class ExtractResults:
 		if not target_file.endswith(constants.Results.extension):
 			target_file = '{}{}'.format(target_file, constants.Results.extension)
 
-		df, extract_vars = self.combine_multiple_runs(search_paths=search_paths)
+		if self.streaming_export:
+			# Each node is loaded, processed and written in turn so the combined results are never held in memory
+			self.extract_results_by_node(pth_file=target_file, search_paths=search_paths)
+		else:
+			df, extract_vars = self.combine_multiple_runs(search_paths=search_paths)
+
+			# Rows for each of the loci frequency ranges, used for both the convex hull and the raw data references
+			self.band_index = frequency_band_index(index=df.index, frequency_bounds=self.freq_bands)
+
+			# Function will calculate the convex hull for the R and X values at each node in this DataFrame.
+			# Initially False but set to True during importing of multiple runs if appropriate
+			df_convex = pd.DataFrame()
+			if self.convex_possible(extract_vars=extract_vars):
+				with timing.timings.span('calculate_convex_vertices'):
+					df_convex = calculate_convex_vertices(
+						df=df, frequency_bounds=self.freq_bands, percentage_to_exclude=self.exclude,
+						max_vertices=self.max_vertices, nom_frequency=self.nom_frequency, band_index=self.band_index
+					)
 
-		# Function will calculate the convex hull for the R and X values at each node in this DataFrame.
-		# Initially False but set to True during importing of multiple runs if appropriate
-		df_convex = pd.DataFrame()
-		if self.include_convex:
-			if constants.PowerFactory.pf_r1 and extract_vars and constants.PowerFactory.pf_x1 in extract_vars:
-				df_convex = calculate_convex_vertices(
-					df=df, frequency_bounds=self.freq_bands, percentage_to_exclude=self.exclude,
-					max_vertices=self.max_vertices, nom_frequency=self.nom_frequency
-				)
-			else:
-				self.logger.warning(
-					(
-						'Not able to produce ConvexHull because self impedance R ({}) and X ({}) values were not '
-						'collected during the study.  Only the following values were collected:\n\t{}'
-					).format(constants.PowerFactory.pf_r1, constants.PowerFactory.pf_x1, '\n\t-'.join(extract_vars))
-				)
+			self.extract_results(pth_file=target_file, df=df, vars_to_export=extract_vars, df_convex=df_convex)
 
-		self.extract_results(pth_file=target_file, df=df, vars_to_export=extract_vars, df_convex=df_convex)
+		# Report of where the time has been spent is saved alongside the results workbook
+		if constants.Results.timing_report:
+			timing.timings.write_report(
+				pth='{}_{}'.format(os.path.splitext(target_file)[0], constants.Results.timing_file_name)
+			)
 
 	# noinspection PyMethodMayBeStatic
+	@timing.timed('ExtractResults.combine_multiple_runs')
 	def combine_multiple_runs(self, search_paths, drop_duplicates=True):
 		"""
 			Function will combine multiple results extracts into a single results file
@@ -197,63 +532,16 @@ class ExtractResults:
 		self.freq_bands = dict()
 		self.exclude = dict()
 		# Loop through each folder, import the inputs sheet and results files
+		tracker = progress.Progress(stage=progress.stage_combine, total=len(search_paths))
 		for folder in search_paths:
 			# Import results into a single dataframe
 			combined = PreviousResultsExport(pth=folder)
 			all_dfs.append(combined.df)
 
-			# Include list of variables for export
-			vars_to_export.extend(combined.inputs.settings.get_vars_to_export())
-
-			# Determine whether include_loci is set to True or False and update overall setting accordingly
-			# will latch to True if any of the imported files have include_loci and then any errors during processing
-			# are dealt with accordingly
-			self.include_convex = self.include_convex or combined.inputs.settings.include_loci
-
-			# Get nominal frequency from input settings
-			nom_frequency = combined.inputs.loci_settings.nom_freq
-			if self.nom_frequency == 0:
-				self.nom_frequency = nom_frequency
-			elif self.nom_frequency != nom_frequency:
-				self.logger.error(
-					(
-						'Nominal frequency {:.0f} Hz declared as an input in <{}> is different to the nominal '
-						'frequency declared in other input files {:.0f} Hz.  The script will continue assuming that '
-						'{:.0f} Hz is correct but this may result in some unexpected results and should be looked '
-						'into closely'
-					).format(nom_frequency, combined.inputs.pth, self.nom_frequency, self.nom_frequency)
-				)
-
-			# Get loci settings based on all inputs and then set frequency bands for each harmonic numbers based on the
-			# minimum and maximum from the provided inputs
-			for h, values in combined.inputs.loci_settings.freq_bands.items():
-				if h in self.freq_bands.keys():
-					# Obtain the start and stop frequencies
-					start_freq = min(values[0], self.freq_bands[h][0])
-					stop_freq = max(values[1], self.freq_bands[h][1])
-					# Replace existing dictionary value with new values
-					self.freq_bands[h] = (start_freq, stop_freq)
-				else:
-					# Doesn't already exist so add it
-					self.freq_bands[h] = values
+			# Include list of variables for export and combine the settings with those from the other folders
+			vars_to_export.extend(self.combine_inputs(inputs=combined.inputs))
 
-			for h, values in combined.inputs.loci_settings.exclude.items():
-				if h in self.exclude.keys():
-					# Replace existing value with new one
-					self.exclude[h] = min(values, self.exclude[h])
-				else:
-					# Doesn't already exist so add it
-					self.exclude[h] = values
-
-			# Get max vertices settings based on all inputs and then set based on either unlimited or maximum of all
-			# values provided
-			for h, values in combined.inputs.loci_settings.max_vertices.items():
-				if h in self.max_vertices.keys():
-					# Replace existing value with new one
-					self.max_vertices[h] = min(values, self.max_vertices[h])
-				else:
-					# Doesn't already exist so add it
-					self.max_vertices[h] = values
+			tracker.update(item=folder)
 
 		# Combine all results together
 		df = pd.concat(all_dfs, axis=1)
@@ -267,84 +555,7 @@ class ExtractResults:
 		vars_to_export = [x for x in vars_to_export if not (x in seen or seen_add(x))]
 
 		if drop_duplicates:
-			# Remove any duplicate data sets with matching column names and rows
-			original_shape = df.shape
-			# Gets list of duplicated index values and will only compare actual values if duplicated
-			df_t = df.T
-			cols = df_t.index[df_t.index.duplicated()].tolist()
-
-			if len(cols) != 0:
-				# Adds index to columns so only rows which are completely duplicated are considered
-				df_t['TEMP'] = df_t.index
-				# Removes any completely duplicated rows in transposed dataframe
-				# These will be columns which contain exactly the same values in both sets of results
-				df_t = df_t.drop_duplicates()
-				# Remove temporary index and transpose back
-				del df_t['TEMP']
-				df = df_t.T
-
-			# Check if any columns are still duplicated as this must now be due to different result sets
-			# Check and rename results if duplicated study case names at level (Full Results Name)
-			duplicated_col_names = df.columns.get_duplicates()
-			if not duplicated_col_names.empty:
-				# Produce dictionary for any duplicated names
-				dict_duplicates = {k: 1 for k in duplicated_col_names}
-				idx_sc = df.columns.names.index(c.lbl_StudyCase)
-				idx_full_name = df.columns.names.index(c.lbl_FullName)
-
-				# Get names for existing columns
-				existing_columns = df.columns.tolist()
-
-				new_cols = []
-				for col in existing_columns:
-					# Loop through each column and rename those which appear in the list of duplicated columns
-					try:
-						duplicated_count = dict_duplicates[col]
-					except KeyError:
-						duplicated_count = False
-
-					if duplicated_count:
-						# Rename duplicated columns to be the form 'sc_name(dup_count)'
-						new_col = list(col)
-						sc_name = col[idx_sc]
-						full_name = col[idx_full_name]
-						# Produce new names for study case and full name
-						new_sc_name = '{}({})'.format(sc_name, duplicated_count)
-						new_full_name = full_name.replace(sc_name, new_sc_name)
-						new_col[idx_sc] =  new_sc_name
-						new_col[idx_full_name] = new_full_name
-						dict_duplicates[col] += 1
-					else:
-						new_col = col
-
-					new_cols.append(tuple(new_col))
-
-				columns=pd.MultiIndex.from_tuples(tuples=new_cols, names=df.columns.names)
-				df.columns = columns
-				duplicated_col_names2 = df.columns.get_duplicates()
-				logger.warning(('Some results have the same study case name but different values, the user should '
-								'check the results that are being combined and confirm where the mistake has been made.\n'
-								'For now the studycases have been renamed with (1), (2), (etc.) for presentation.\n'
-								'In total {} columns have been renamed')
-							   .format(len(duplicated_col_names)-len(duplicated_col_names2))
-							   )
-				if not duplicated_col_names2.empty:
-					raise IOError(' There are still duplicated columns being detected')
-
-			# Check for changes and record differences
-			new_shape = df.shape
-			if new_shape[1] != original_shape[1]:
-				logger.warning(('The input data ets had duplicated columns and '
-								'therefore some have been removed.\n'
-								'{} columns have been removed')
-							   .format(original_shape[1]-new_shape[1]))
-
-			else:
-				logger.debug('No duplicated data in results files imported from: {}'
-							 .format(search_paths))
-			if new_shape[0] != original_shape[0]:
-				raise SyntaxError('There has been an error in the processing and some rows have been deleted.'
-								  'Check the script')
+			df = self.remove_duplicates(df=df, search_paths=search_paths)
 		else:
 			logger.debug('No check for duplicates carried out')
 
@@ -353,7 +564,169 @@ class ExtractResults:
 
 		return df, vars_to_export
 
-	def extract_results(self, pth_file, df, vars_to_export, df_convex, plot_graphs=True):
+	def combine_inputs(self, inputs):
+		"""
+			Combines the settings from the inputs used to produce a set of results with those from the other sets
+			of results being combined
+		:param StudyInputs inputs:  Inputs used to produce the results
+		:return list vars_to_export:  List of variables exported for these results
+		"""
+		# Determine whether include_loci is set to True or False and update overall setting accordingly
+		# will latch to True if any of the imported files have include_loci and then any errors during processing
+		# are dealt with accordingly
+		self.include_convex = self.include_convex or inputs.settings.include_loci
+
+		# Get nominal frequency from input settings
+		nom_frequency = inputs.loci_settings.nom_freq
+		if self.nom_frequency == 0:
+			self.nom_frequency = nom_frequency
+		elif self.nom_frequency != nom_frequency:
+			self.logger.error(
+				(
+					'Nominal frequency {:.0f} Hz declared as an input in <{}> is different to the nominal '
+					'frequency declared in other input files {:.0f} Hz.  The script will continue assuming that '
+					'{:.0f} Hz is correct but this may result in some unexpected results and should be looked '
+					'into closely'
+				).format(nom_frequency, inputs.pth, self.nom_frequency, self.nom_frequency)
+			)
+
+		# Get loci settings based on all inputs and then set frequency bands for each harmonic numbers based on the
+		# minimum and maximum from the provided inputs
+		for h, values in inputs.loci_settings.freq_bands.items():
+			if h in self.freq_bands.keys():
+				# Obtain the start and stop frequencies
+				start_freq = min(values[0], self.freq_bands[h][0])
+				stop_freq = max(values[1], self.freq_bands[h][1])
+				# Replace existing dictionary value with new values
+				self.freq_bands[h] = (start_freq, stop_freq)
+			else:
+				# Doesn't already exist so add it
+				self.freq_bands[h] = values
+
+		for h, values in inputs.loci_settings.exclude.items():
+			if h in self.exclude.keys():
+				# Replace existing value with new one
+				self.exclude[h] = min(values, self.exclude[h])
+			else:
+				# Doesn't already exist so add it
+				self.exclude[h] = values
+
+		# Get max vertices settings based on all inputs and then set based on either unlimited or maximum of all
+		# values provided
+		for h, values in inputs.loci_settings.max_vertices.items():
+			if h in self.max_vertices.keys():
+				# Replace existing value with new one
+				self.max_vertices[h] = min(values, self.max_vertices[h])
+			else:
+				# Doesn't already exist so add it
+				self.max_vertices[h] = values
+
+		return inputs.settings.get_vars_to_export()
+
+	def remove_duplicates(self, df, search_paths):
+		"""
+			Removes any duplicate data sets with matching column names and values and renames any columns which have
+			the same name but different values
+		:param pd.DataFrame df:  Combined results
+		:param tuple search_paths:  List of folders the results have been imported from
+		:return pd.DataFrame df:  Results with the duplicates removed
+		"""
+		c = constants.Results
+		logger = constants.logger
+
+		# Remove any duplicate data sets with matching column names and rows
+		original_shape = df.shape
+		# Only columns with duplicated names are compared and these are removed if the values are the same
+		df = remove_duplicated_columns(df=df)
+
+		# Check if any columns are still duplicated as this must now be due to different result sets
+		# Check and rename results if duplicated study case names at level (Full Results Name)
+		duplicated_col_names = df.columns[df.columns.duplicated()].unique()
+		if not duplicated_col_names.empty:
+			# Produce dictionary for any duplicated names
+			dict_duplicates = {k: 1 for k in duplicated_col_names}
+			idx_sc = df.columns.names.index(c.lbl_StudyCase)
+			idx_full_name = df.columns.names.index(c.lbl_FullName)
+
+			# Get names for existing columns
+			existing_columns = df.columns.tolist()
+
+			new_cols = []
+			for col in existing_columns:
+				# Loop through each column and rename those which appear in the list of duplicated columns
+				try:
+					duplicated_count = dict_duplicates[col]
+				except KeyError:
+					duplicated_count = False
+
+				if duplicated_count:
+					# Rename duplicated columns to be the form 'sc_name(dup_count)'
+					new_col = list(col)
+					sc_name = col[idx_sc]
+					full_name = col[idx_full_name]
+					# Produce new names for study case and full name
+					new_sc_name = '{}({})'.format(sc_name, duplicated_count)
+					new_full_name = full_name.replace(sc_name, new_sc_name)
+					new_col[idx_sc] =  new_sc_name
+					new_col[idx_full_name] = new_full_name
+					dict_duplicates[col] += 1
+				else:
+					new_col = col
+
+				new_cols.append(tuple(new_col))
+
+			columns=pd.MultiIndex.from_tuples(tuples=new_cols, names=df.columns.names)
+			df.columns = columns
+			duplicated_col_names2 = df.columns[df.columns.duplicated()].unique()
+			logger.warning(('Some results have the same study case name but different values, the user should '
+							'check the results that are being combined and confirm where the mistake has been made.\n'
+							'For now the studycases have been renamed with (1), (2), (etc.) for presentation.\n'
+							'In total {} columns have been renamed')
+						   .format(len(duplicated_col_names)-len(duplicated_col_names2))
+						   )
+			if not duplicated_col_names2.empty:
+				raise IOError(' There are still duplicated columns being detected')
+
+		# Check for changes and record differences
+		new_shape = df.shape
+		if new_shape[1] != original_shape[1]:
+			logger.warning(('The input data ets had duplicated columns and '
+							'therefore some have been removed.\n'
+							'{} columns have been removed')
+						   .format(original_shape[1]-new_shape[1]))
+
+		else:
+			logger.debug('No duplicated data in results files imported from: {}'
+						 .format(search_paths))
+		if new_shape[0] != original_shape[0]:
+			raise SyntaxError('There has been an error in the processing and some rows have been deleted.'
+							  'Check the script')
+
+		return df
+
+	def convex_possible(self, extract_vars):
+		"""
+			Whether the convex hull can be produced, logs a warning if it has been requested but is not possible
+		:param list extract_vars:  List of variables exported
+		:return bool possible:
+		"""
+		# Initially False but set to True during importing of multiple runs if appropriate
+		if not self.include_convex:
+			return False
+
+		if constants.PowerFactory.pf_r1 and extract_vars and constants.PowerFactory.pf_x1 in extract_vars:
+			return True
+
+		self.logger.warning(
+			(
+				'Not able to produce ConvexHull because self impedance R ({}) and X ({}) values were not '
+				'collected during the study.  Only the following values were collected:\n\t{}'
+			).format(constants.PowerFactory.pf_r1, constants.PowerFactory.pf_x1, '\n\t-'.join(extract_vars))
+		)
+		return False
+
+	@timing.timed('ExtractResults.extract_results')
+	def extract_results(self, pth_file, df, vars_to_export, df_convex, plot_graphs=True, streaming=None):
 		"""
 			Extract results into workbook with each result on separate worksheet
 		:param str pth_file:  File to save workbook to
@@ -361,121 +734,134 @@ class ExtractResults:
 		:param list vars_to_export:  List of variables to export based on Inputs class
 		:param pd.DataFrame df_convex:  Pandas DataFrame with the boundaries of the ConvexHull data points
 		:param bool plot_graphs:  (optional=True) - If set to False then graphs will not be exported
+		:param bool streaming:  (optional=None) - If True then each node is written to disk once complete, if None
+			then self.streaming_export is used
 		:return None:
 		"""
-
-
-
-		self.logger.info('Exporting imported results to {}'.format(pth_file))
-
 		# Obtain constants
 		c = constants.Results
 
-		start_row = c.start_row
-
 		# Delete empty column headers which correlate to either frequency of harmonic number data which
 		# has already been used as the index
 		df.drop(columns=c.lbl_to_delete, inplace=True, level=0)
 
 		# Group the data frame by node name
 		list_dfs = df.groupby(level=c.lbl_Reference_Terminal, axis=1)
-		num_nodes = len(list_dfs)
-		self.logger.info('\tExporting results for {} nodes'.format(num_nodes))
+		nodes = ((node_name, _df, df_convex, self.band_index) for node_name, _df in list_dfs)
 
-		# Will only include index and header labels if True
-		# include_index = col <= c.start_col
-		include_index = True
+		self.write_workbook(
+			pth_file=pth_file, nodes=nodes, num_nodes=len(list_dfs), vars_to_export=vars_to_export,
+			plot_graphs=plot_graphs, streaming=streaming
+		)
+
+		return None
+
+	@timing.timed('ExtractResults.extract_results_by_node')
+	def extract_results_by_node(self, pth_file, search_paths, plot_graphs=True):
+		"""
+			Imports the results from each of the folders and then loads, processes and writes the results for each node
+			in turn so that the combined results for every node are never held in memory at the same time.  The peak
+			memory is therefore determined by the largest single results file and the largest node.
+		:param str pth_file:  File to save workbook to
+		:param tuple search_paths:  List of folders which contain the results files to be combined / extracted
+		:param bool plot_graphs:  (optional=True) - If set to False then graphs will not be exported
+		:return None:
+		"""
+		c = constants.Results
+
+		self.logger.info(
+			'Importing all results files in following list of folders: \n\t{}'.format('\n\t'.join(search_paths))
+		)
+
+		vars_to_export = []
+		self.freq_bands = dict()
+		self.exclude = dict()
+		with NodeResultsStore() as store:
+			# Loop through each folder, import the inputs sheet and split each results file by node
+			tracker = progress.Progress(stage=progress.stage_combine, total=len(search_paths))
+			for folder in search_paths:
+				combined = PreviousResultsExport(pth=folder, import_results=False)
+				for df in combined.iter_results():
+					store.add(df=df)
+				vars_to_export.extend(self.combine_inputs(inputs=combined.inputs))
+				tracker.update(item=folder)
+
+			# Create unique list of variables to export without upsetting order
+			seen = set()
+			seen_add = seen.add
+			vars_to_export = [x for x in vars_to_export if not (x in seen or seen_add(x))]
+
+			convex = self.convex_possible(extract_vars=vars_to_export)
+			node_names = store.nodes()
+
+			def nodes():
+				"""
+					Loads and processes the results for each node in turn
+				:return (str, pd.DataFrame, pd.DataFrame, dict):  Node name, results, convex hull points and rows for
+					each loci frequency range for the node
+				"""
+				for node_name in node_names:
+					df_node = self.remove_duplicates(df=store.load(node_name=node_name), search_paths=search_paths)
+					df_node.sort_index(
+						axis=1, level=[c.lbl_Reference_Terminal, c.lbl_Terminal, c.lbl_StudyCase], inplace=True
+					)
+
+					# Rows for each loci frequency range are determined for each node since the frequencies may differ
+					# if the results folders have different frequency ranges
+					band_index = frequency_band_index(index=df_node.index, frequency_bounds=self.freq_bands)
+
+					df_convex = pd.DataFrame()
+					if convex:
+						with timing.timings.span('calculate_convex_vertices'):
+							df_convex = calculate_convex_vertices(
+								df=df_node, frequency_bounds=self.freq_bands, percentage_to_exclude=self.exclude,
+								max_vertices=self.max_vertices, nom_frequency=self.nom_frequency,
+								band_index=band_index, workers=1
+							)
+
+					yield node_name, df_node, df_convex, band_index
+
+			self.write_workbook(
+				pth_file=pth_file, nodes=nodes(), num_nodes=len(node_names), vars_to_export=vars_to_export,
+				plot_graphs=plot_graphs, streaming=True
+			)
+
+		return None
+
+	def write_workbook(self, pth_file, nodes, num_nodes, vars_to_export, plot_graphs=True, streaming=None):
+		"""
+			Writes the results for each node to a separate worksheet in the workbook
+		:param str pth_file:  File to save workbook to
+		:param iter nodes:  Iterable of (node name, results DataFrame, ConvexHull DataFrame, band index) for each node
+		:param int num_nodes:  Number of nodes to be exported
+		:param list vars_to_export:  List of variables to export based on Inputs class
+		:param bool plot_graphs:  (optional=True) - If set to False then graphs will not be exported
+		:param bool streaming:  (optional=None) - If True then each node is written to disk once complete, if None
+			then self.streaming_export is used
+		:return None:
+		"""
+		if streaming is None:
+			streaming = self.streaming_export
+
+		self.logger.info('Exporting imported results to {}'.format(pth_file))
+		self.logger.info('\tExporting results for {} nodes'.format(num_nodes))
 
 		# Export to excel with a new sheet for each node
-		i=0
 		try:
-			with pd.ExcelWriter(pth_file, engine='xlsxwriter') as writer:
-				for node_name, _df in list_dfs:
-					self.logger.info('\t - \t {}/{} Exporting node {}'.format(i+1, num_nodes, node_name))
-					i += 1
-					col = c.start_col
-
-					for var in vars_to_export:
-						# Extract DataFrame with just these values
-						df_to_export = _df.loc[:, _df.columns.get_level_values(level=c.lbl_Result)==var]
-						if not df_to_export.empty:
-							# Results are sorted in study case then contingency then filter order
-							df_to_export.to_excel(writer, merge_cells=True,
-												  sheet_name=node_name,
-												  startrow=start_row, startcol=col,
-												  header=include_index, index_label=False)
-
-							# Add graphs if data is self-impedance
-							if var == constants.PowerFactory.pf_z1 and plot_graphs:
-								self.logger.info(' \t - \t Adding graph for node {}'.format(node_name))
-
-								num_rows = df_to_export.shape[0]
-								# Get number of columns to include in each graph grouping
-								dict_graph_grouping = self.graph_grouping(df=df_to_export, startcol=col+1)
-								names = df_to_export.columns.names
-								row_cont = start_row + names.index(constants.Results.lbl_FullName)
-
-
-								self.add_graph(writer, sheet_name=node_name,
-										  row_cont=row_cont,
-										  row_start=start_row + len(names) + 1,
-										  col_freq=col,
-										  num_rows=num_rows,
-										  graph_groups=dict_graph_grouping,
-										  chrt_row_num=0)
-
-								# Get grouping of graphs to compare study cases
-								dict_graph_grouping = self.graph_grouping(
-									df=df_to_export, group_by=constants.Results.chart_grouping_base_case,
-									startcol=col+1
-								)
-
-								self.add_graph(writer, sheet_name=node_name,
-										  row_cont=row_cont,
-										  row_start=start_row + len(names) + 1,
-										  col_freq=col,
-										  num_rows=num_rows,
-										  graph_groups=dict_graph_grouping,
-										  chrt_row_num=1)
-
-							col = col + df_to_export.shape[1] + c.col_spacing
-						else:
-							self.logger.warning('No results imported for variable {} at node {}'.format(var, node_name))
-
-					# Once all main results have been exported ConvexHull points for each node are added
-					if not df_convex.empty:
-						# Based on the raw dataset, start row and start column determine the Excel row and columns
-						# that cover the raw R and X values for the calculated impedance loci
-						raw_x_data, raw_y_data = get_raw_data_excel_references(
-							sht_name=node_name,
-							df=_df, start_row=start_row, start_col=c.start_col,
-							target_frequencies=self.freq_bands)
-
-						# Determine which row to start the convex hull on, taking into consideration the number of
-						# rows occupied by the DataFrame
-						row_convex = start_row + len(_df) + _df.columns.nlevels + c.row_spacing + 1
-						# Get ConvexValues for this node in particular
-						df_node = df_convex.loc[:, df_convex.columns.get_level_values(level=c.lbl_Reference_Terminal)==node_name]
-
-						# Results are exported
-						df_node.to_excel(writer, merge_cells=True,
-										 sheet_name=node_name,
-										 startrow=row_convex, startcol=c.start_col,
-										 header=include_index, index_label=False)
-
-						# Add loci plots
-						self.add_loci_graphs(
-							writer=writer,
-							sheet_name=node_name,
-							plot_names=df_node.columns.get_level_values(level=c.lbl_Harmonic_Order),
-							row_labels=row_convex + 1,
-							row_start=row_convex + df_node.columns.nlevels + 1,
-							num_rows=df_node.shape[0],
-							col_start=c.start_col+1,
-							num_cols=df_node.shape[1],
-							raw_x_data=raw_x_data,
-							raw_y_data=raw_y_data
-						)
+			if streaming:
+				self.logger.debug('Workbook written using constant memory mode')
+				excel_writer = StreamingExcelWriter(pth_file)
+			else:
+				excel_writer = pd.ExcelWriter(pth_file, engine='xlsxwriter')
+
+			with excel_writer as writer:
+				tracker = progress.Progress(stage=progress.stage_export, total=num_nodes)
+				for node_name, df_node, df_convex, band_index in nodes:
+					self.write_node(
+						writer=writer, node_name=node_name, df_node=df_node, vars_to_export=vars_to_export,
+						df_convex=df_convex, plot_graphs=plot_graphs, band_index=band_index
+					)
+					tracker.update(item=node_name)
 
 		except PermissionError:
 			self.logger.critical(
@@ -490,6 +876,129 @@ class ExtractResults:
 
 		return None
 
+	def write_node(self, writer, node_name, df_node, vars_to_export, df_convex, plot_graphs=True, band_index=None):
+		"""
+			Writes the results for a single node to its own worksheet
+		:param pd.ExcelWriter or StreamingExcelWriter writer:  Handle for the workbook
+		:param str node_name:  Name of the node which is used as the worksheet name
+		:param pd.DataFrame df_node:  Results for this node
+		:param list vars_to_export:  List of variables to export based on Inputs class
+		:param pd.DataFrame df_convex:  Pandas DataFrame with the boundaries of the ConvexHull data points
+		:param bool plot_graphs:  (optional=True) - If set to False then graphs will not be exported
+		:param dict band_index:  (optional=None) - Rows for each loci frequency range in df_node, if None then it is
+			determined from the index of df_node
+		:return None:
+		"""
+		c = constants.Results
+		start_row = c.start_row
+		col = c.start_col
+
+		# Will only include index and header labels if True
+		# include_index = col <= c.start_col
+		include_index = True
+
+		for var in vars_to_export:
+			# Extract DataFrame with just these values
+			df_to_export = df_node.loc[:, df_node.columns.get_level_values(level=c.lbl_Result)==var]
+			if not df_to_export.empty:
+				# Results are sorted in study case then contingency then filter order
+				self.write_dataframe(writer, df=df_to_export, sheet_name=node_name,
+									 startrow=start_row, startcol=col, header=include_index)
+
+				# Add graphs if data is self-impedance
+				if var == constants.PowerFactory.pf_z1 and plot_graphs:
+					self.logger.info(' \t - \t Adding graph for node {}'.format(node_name))
+
+					num_rows = df_to_export.shape[0]
+					# Get number of columns to include in each graph grouping
+					dict_graph_grouping = self.graph_grouping(df=df_to_export, startcol=col+1)
+					names = df_to_export.columns.names
+					row_cont = start_row + names.index(constants.Results.lbl_FullName)
+
+
+					self.add_graph(writer, sheet_name=node_name,
+							  row_cont=row_cont,
+							  row_start=start_row + len(names) + 1,
+							  col_freq=col,
+							  num_rows=num_rows,
+							  graph_groups=dict_graph_grouping,
+							  chrt_row_num=0)
+
+					# Get grouping of graphs to compare study cases
+					dict_graph_grouping = self.graph_grouping(
+						df=df_to_export, group_by=constants.Results.chart_grouping_base_case,
+						startcol=col+1
+					)
+
+					self.add_graph(writer, sheet_name=node_name,
+							  row_cont=row_cont,
+							  row_start=start_row + len(names) + 1,
+							  col_freq=col,
+							  num_rows=num_rows,
+							  graph_groups=dict_graph_grouping,
+							  chrt_row_num=1)
+
+				col = col + df_to_export.shape[1] + c.col_spacing
+			else:
+				self.logger.warning('No results imported for variable {} at node {}'.format(var, node_name))
+
+		# Once all main results have been exported ConvexHull points for each node are added
+		if not df_convex.empty:
+			# Based on the raw dataset, start row and start column determine the Excel row and columns
+			# that cover the raw R and X values for the calculated impedance loci
+			raw_x_data, raw_y_data = get_raw_data_excel_references(
+				sht_name=node_name,
+				df=df_node, start_row=start_row, start_col=c.start_col,
+				target_frequencies=self.freq_bands, band_index=band_index)
+
+			# Determine which row to start the convex hull on, taking into consideration the number of
+			# rows occupied by the DataFrame
+			row_convex = start_row + len(df_node) + df_node.columns.nlevels + c.row_spacing + 1
+			# Get ConvexValues for this node in particular
+			df_node_convex = df_convex.loc[:, df_convex.columns.get_level_values(level=c.lbl_Reference_Terminal)==node_name]
+
+			# Results are exported
+			self.write_dataframe(writer, df=df_node_convex, sheet_name=node_name,
+								 startrow=row_convex, startcol=c.start_col, header=include_index)
+
+			# Add loci plots
+			self.add_loci_graphs(
+				writer=writer,
+				sheet_name=node_name,
+				plot_names=df_node_convex.columns.get_level_values(level=c.lbl_Harmonic_Order),
+				row_labels=row_convex + 1,
+				row_start=row_convex + df_node_convex.columns.nlevels + 1,
+				num_rows=df_node_convex.shape[0],
+				col_start=c.start_col+1,
+				num_cols=df_node_convex.shape[1],
+				raw_x_data=raw_x_data,
+				raw_y_data=raw_y_data
+			)
+
+		return None
+
+	# noinspection PyMethodMayBeStatic
+	def write_dataframe(self, writer, df, sheet_name, startrow, startcol, header=True):
+		"""
+			Writes the DataFrame to the worksheet using the relevant writer
+		:param pd.ExcelWriter or StreamingExcelWriter writer:  Handle for the workbook
+		:param pd.DataFrame df:  DataFrame to be written
+		:param str sheet_name:  Name of worksheet
+		:param int startrow:  Row to start the DataFrame from
+		:param int startcol:  Column to start the DataFrame from
+		:param bool header:  (optional=True) - Include the header labels
+		:return None:
+		"""
+		if isinstance(writer, StreamingExcelWriter):
+			writer.to_excel(df=df, sheet_name=sheet_name, startrow=startrow, startcol=startcol, header=header)
+		else:
+			df.to_excel(writer, merge_cells=True,
+						sheet_name=sheet_name,
+						startrow=startrow, startcol=startcol,
+						header=header, index_label=False)
+
+		return None
+
 	def add_graph(self, writer, sheet_name, row_cont, row_start, col_freq, num_rows,
 				  graph_groups, chrt_row_num):
 		"""
@@ -747,10 +1256,13 @@ class ExtractResults:
 
 class PreviousResultsExport:
 	""" Used for importing the settings and previously exported results """
-	def __init__(self, pth):
+	def __init__(self, pth, workers=None, import_results=True):
 		"""
 
 		:param str pth:  path that will contain the input files
+		:param int workers: (Optional=None) - Number of worker processes to use for importing the results files
+		:param bool import_results: (Optional=True) - If False then only the inputs are imported and the results must
+			be obtained using iter_results
 		"""
 
 		self.logger = constants.logger
@@ -765,8 +1277,10 @@ class PreviousResultsExport:
 		self.inputs = self.get_input_values()
 
 		# Get a single DataFrame for all results
-		self.df = self.import_all_results(study_type=constants.Results.study_fs)
-		self.logger.debug('All results for folder: {} imported'.format(self.search_pth))
+		self.df = None
+		if import_results:
+			self.df = self.import_all_results(study_type=constants.Results.study_fs, workers=workers)
+			self.logger.debug('All results for folder: {} imported'.format(self.search_pth))
 
 	def get_input_values(self):
 		"""
@@ -778,7 +1292,7 @@ class PreviousResultsExport:
 		logger = constants.logger
 
 		# Find the inputs file for this folder
-		list_of_input_files = glob.glob('{}\{}*{}'.format(self.search_pth, c.file_name, c.file_format))
+		list_of_input_files = glob.glob(os.path.join(self.search_pth, '{}*{}'.format(c.file_name, c.file_format)))
 		if len(list_of_input_files) == 0:
 			logger.critical(
 				(
@@ -798,31 +1312,23 @@ class PreviousResultsExport:
 			inputs_workbook = list_of_input_files[0]
 
 		# Process the imported workbook into (gui_mode prevents the creation of a folder for the exports)
-		processed_inputs = StudyInputs(inputs_workbook, gui_mode=True)
+		processed_inputs = load_study_inputs(pth_file=inputs_workbook)
 		# Set export folder = this folder
 		processed_inputs.settings.export_folder = self.search_pth
 		logger.info('Inputs from file: {} extracted'.format(inputs_workbook))
 		return processed_inputs
 
-	def import_all_results(self, study_type='FS'):
+	@timing.timed('PreviousResultsExport.import_all_results', 'search_pth')
+	def import_all_results(self, study_type='FS', workers=None):
 		"""
 			Function to import all results into a single DataFrame
 		:param str study_type: (Optional='FS') - Leading characters to use in search string
+		:param int workers: (Optional=None) - Number of worker processes to use for importing the files, if None then
+			the value in constants.Results.ingest_workers is used
 		:return pd.DataFrame single_df:  Combined imported files into single DataFrame
 		"""
-		self.study_type = study_type
-
-		# Get list of all files in folder for frequency scan
-		files = glob.glob('{}\{}*.csv'.format(self.search_pth, study_type))
-		no_files = len(files)
-		self.logger.debug('Importing {} results files in directory: {}'.format(no_files, self.search_pth))
-
-		# Import each results file and combine into a single dataframe
-		dfs = []
-		for i, file in enumerate(files):
-			df = self.process_file(pth=file)
-			dfs.append(df)
-			self.logger.info(' - \t {}/{} Results file: {} imported'.format(i+1, no_files, os.path.basename(file)))
+		dfs = list(self.iter_results(study_type=study_type, workers=workers))
+		no_files = len(self.results_files(study_type=study_type))
 
 		if len(dfs) != no_files:
 			self.logger.error(
@@ -840,6 +1346,104 @@ class PreviousResultsExport:
 		)
 		return single_df
 
+	def results_files(self, study_type='FS'):
+		"""
+			Returns the results files in the folder
+		:param str study_type: (Optional='FS') - Leading characters to use in search string
+		:return list files:  Full paths to each results file
+		"""
+		return glob.glob(os.path.join(self.search_pth, '{}*.csv'.format(study_type)))
+
+	def iter_results(self, study_type='FS', workers=None):
+		"""
+			Generator which imports and processes each results file in turn so that the results from every file do
+			not need to be held in memory at the same time
+		:param str study_type: (Optional='FS') - Leading characters to use in search string
+		:param int workers: (Optional=None) - Number of worker processes to use for importing the files, if None then
+			the value in constants.Results.ingest_workers is used
+		:return pd.DataFrame df:  Processed results for each file in turn
+		"""
+		self.study_type = study_type
+
+		# Get list of all files in folder for frequency scan
+		files = self.results_files(study_type=study_type)
+		no_files = len(files)
+		self.logger.debug('Importing {} results files in directory: {}'.format(no_files, self.search_pth))
+
+		# Determine number of worker processes to use
+		if workers is None:
+			workers = constants.Results.ingest_workers
+		if workers == 0:
+			workers = os.cpu_count() or 1
+		workers = min(workers, no_files)
+
+		# Import each results file, worker processes return the results in the same order as the files so the
+		# combined DataFrame is identical to importing serially
+		executor = None
+		if workers > 1:
+			self.logger.debug('Importing results files using {} worker processes'.format(workers))
+			executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+			processed_files = executor.map(self.load_file, files)
+		else:
+			processed_files = map(self.load_file, files)
+
+		tracker = progress.Progress(stage=progress.stage_ingest, total=no_files)
+		try:
+			for file, df in zip(files, processed_files):
+				yield df
+				tracker.update(item=os.path.basename(file))
+		finally:
+			if executor is not None:
+				executor.shutdown()
+
+	def cache_key(self, pth):
+		"""
+			Produces the key used to confirm whether the cached results are still valid.  The processed results
+			depend on both the raw results file and the inputs file so changes to either will invalidate the cache.
+		:param str pth:  Full path to results file
+		:return tuple key:  Key for the results file
+		"""
+		key = [constants.Results.cache_version]
+		for file in (pth, self.inputs.pth):
+			stats = os.stat(file)
+			key.extend([os.path.abspath(file), stats.st_size, stats.st_mtime_ns])
+		return tuple(key)
+
+	def load_file(self, pth):
+		"""
+			Loads the processed results from the cache if the results file has not changed since the cache was
+			written, otherwise processes the results file and writes the processed results to the cache
+		:param str pth:  Full path to results that need importing
+		:return pd.DataFrame df:  Processed results
+		"""
+		c = constants.Results
+		if not c.cache_results:
+			return self.process_file(pth=pth)
+
+		pth_cache = '{}{}'.format(pth, c.cache_extension)
+		key = self.cache_key(pth=pth)
+
+		# Load from the cache if valid, any failure to read the cache only means the results are processed again
+		if os.path.isfile(pth_cache):
+			try:
+				df = read_processed_results(pth=pth_cache, key=key)
+				if df is not None:
+					self.logger.debug('Processed results for {} loaded from cache {}'.format(pth, pth_cache))
+					return df
+				self.logger.debug('Cached results {} are out of date and will be replaced'.format(pth_cache))
+			except Exception:
+				self.logger.warning('Unable to read the cached results {} and so will be replaced'.format(pth_cache))
+
+		df = self.process_file(pth=pth)
+
+		# Write the processed results to the cache, failure to write only means it will be processed again next time
+		try:
+			write_processed_results(pth=pth_cache, key=key, df=df)
+		except (OSError, TypeError, ValueError):
+			self.logger.warning('Unable to write the processed results for {} to the cache {}'.format(pth, pth_cache))
+
+		return df
+
 	def process_file(self, pth):
 		"""
 			# Process the imported results file into a dataframe with the relevant multi-index
@@ -869,41 +1473,15 @@ class PreviousResultsExport:
 		else:
 			full_name = sc_name
 
-		columns = list(zip(*df.columns.tolist()))
-		# To manually deal with renaming of mutual impedance values
-		var_names = columns[0]
-		var_types = columns[1]
-
-		# Mutual impedance dataframe
-		df_mutual = pd.DataFrame().reindex_like(df)
-		df_mutual = df_mutual.drop(df.columns, axis=1)
-		new_var_names1 = []
-		new_var_names2 = []
-		new_ref_terminals1 = []
-		new_ref_terminals2 = []
-		new_var_types1 = []
-		new_var_types2 = []
-		for i, var in enumerate(var_names):
-			var_names, ref_terms = self.extract_var_name(var_name=var)
-			var_type = self.extract_var_type(var_types[i])
-
-			# Mutual impedance data
-			if type(var_names) is tuple:
-				# If mutual impedance data is returned then need to duplicate dataframe to create data in the other direction
-				new_var_names1.append(var_names[0])
-				new_var_names2.append(var_names[1])
-				new_ref_terminals1.append(ref_terms[0])
-				new_ref_terminals2.append(ref_terms[1])
-				new_var_types1.append(var_type)
-				new_var_types2.append(var_type)
+		# Process all of the column headers in a single pass
+		(
+			new_var_names1, new_var_names2, new_ref_terminals1, new_ref_terminals2,
+			new_var_types1, new_var_types2, mutual_cols
+		) = self.process_headers(columns=df.columns.tolist())
 
-				# Create a copy of the data
-				df_mutual[df.columns[i]] = df[df.columns[i]]
-			else:
-				# If no mutual impedance data then just extract variable names in lists
-				new_var_names1.append(var_names)
-				new_ref_terminals1.append(ref_terms)
-				new_var_types1.append(var_type)
+		# Mutual impedance dataframe is a copy of the mutual impedance data so that it can be provided in the other
+		# direction
+		df_mutual = df.iloc[:, mutual_cols].copy()
 
 		# Produce new multi-index containing new headers
 		col_headers1 = [(ref_terminal, var_name, sc_name, cont_name, full_name, var_type)
@@ -1003,6 +1581,58 @@ class PreviousResultsExport:
 
 		return df
 
+	def process_headers(self, columns):
+		"""
+			Processes all of the column headers from a results file in a single pass.  Since the same variable name
+			appears for each result type the name and type are only processed once.
+		:param list columns:  List of tuples in the format (variable name, variable type) from the results file
+		:return (list, list, list, list, list, list, list) headers:  Returns the following:
+			var_names1, var_names2 - variable names with var_names2 only for the mutual impedance data
+			ref_terminals1, ref_terminals2 - reference terminals with ref_terminals2 only for the mutual impedance data
+			var_types1, var_types2 - variable types with var_types2 only for the mutual impedance data
+			mutual_cols - column numbers that contain mutual impedance data
+		"""
+		new_var_names1 = []
+		new_var_names2 = []
+		new_ref_terminals1 = []
+		new_ref_terminals2 = []
+		new_var_types1 = []
+		new_var_types2 = []
+		mutual_cols = []
+
+		# Each unique name and type is only processed once
+		processed_names = dict()
+		processed_types = dict()
+
+		for i, (var, var_type) in enumerate(columns):
+			if var not in processed_names:
+				processed_names[var] = self.extract_var_name(var_name=var)
+			if var_type not in processed_types:
+				processed_types[var_type] = self.extract_var_type(var_type)
+			var_names, ref_terms = processed_names[var]
+			var_type = processed_types[var_type]
+
+			# Mutual impedance data
+			if type(var_names) is tuple:
+				# If mutual impedance data is returned then need to duplicate dataframe to create data in the other direction
+				new_var_names1.append(var_names[0])
+				new_var_names2.append(var_names[1])
+				new_ref_terminals1.append(ref_terms[0])
+				new_ref_terminals2.append(ref_terms[1])
+				new_var_types1.append(var_type)
+				new_var_types2.append(var_type)
+				mutual_cols.append(i)
+			else:
+				# If no mutual impedance data then just extract variable names in lists
+				new_var_names1.append(var_names)
+				new_ref_terminals1.append(ref_terms)
+				new_var_types1.append(var_type)
+
+		return (
+			new_var_names1, new_var_names2, new_ref_terminals1, new_ref_terminals2,
+			new_var_types1, new_var_types2, mutual_cols
+		)
+
 	def process_file_name(self, file_name):
 		"""
 			Splits up the file name to identify the study type, case and contingency
@@ -1043,7 +1673,7 @@ class PreviousResultsExport:
 
 		# Separate PowerFactory path into individual entries
 		vars_list = var_name.split('\\')
-		terminal_names = [x.name for x in self.inputs.terminals.values()]
+		lookup = self.inputs.terminal_lookup  # type: TerminalLookup
 
 		# Process each variable to identify the mutual / terminal names
 		for var in vars_list:
@@ -1051,16 +1681,8 @@ class PreviousResultsExport:
 				# Remove the reference to mutual impedance from the terminal
 				var_name = var.replace('.{}'.format(c.pf_mutual), '')
 
-				term1 = None
-				term2 = None
-				for term in terminal_names:
-					if var_name.startswith(term):
-						term1 = term
-					if var_name.endswith(term):
-						term2 = term
-
 				# Combine terminals into name
-				ref_terminal = (term1, term2)
+				ref_terminal = lookup.mutual_terminals(var_name=var_name)
 
 				# Check that names have been determined for each variable
 				if not all(ref_terminal):
@@ -1092,14 +1714,8 @@ class PreviousResultsExport:
 
 		# Lookup terminal name from input spreadsheet
 		if ref_terminal == '':
-			for term in self.inputs.terminals.values():
-				# Find matching substation and terminal
-				if (
-						'{}.{}'.format(term.substation, c.pf_substation) == var_sub and
-						'{}.{}'.format(term.terminal, c.pf_terminal) == var_term
-				):
-					ref_terminal = term.name
-					break
+			# Find matching substation and terminal
+			ref_terminal = lookup.terminal(var_sub=var_sub, var_term=var_term)
 
 			if ref_terminal == '':
 				self.logger.critical(
@@ -1173,8 +1789,8 @@ class StudySettings:
 			else:
 				raise IOError('No workbook or path to file provided')
 		else:
-			# Get workbook path in case path has not been provided
-			self.pth = wkbk.io
+			# Get workbook path in case path has not been provided, the workbook may have been read into memory
+			self.pth = pth_file or wkbk.io
 
 		# Import Study settings into a DataFrame and process
 		self.df = pd.read_excel(
@@ -1271,16 +1887,19 @@ class StudySettings:
 		res_name = str(self.df.loc[self.c.results_name])
 
 		# Check if any results file has been provided and then append the correct extension and UID
-		# value
+		# value.  If resuming a previous study then the UID is not appended so that the results folder from the
+		# previous run is found.
+		resume = constants.Results.resume_studies
 		if not res_name:
 			# If no folder provided then use default value
-			res_name = '{}_{}.xlsx'.format(def_value, constants.uid)
+			res_name = '{}{}.xlsx'.format(def_value, '' if resume else '_{}'.format(constants.uid))
 		else:
-			res_name = '{}{}.xlsx'.format(res_name, constants.uid)
+			res_name = '{}{}.xlsx'.format(res_name, '' if resume else constants.uid)
 
-		# Check if target file already exists and warn user that results will be overwritten
+		# Check if target file already exists and warn user that results will be overwritten, when resuming it is
+		# replaced once the results have been exported
 		overall_res_pth = os.path.join(self.export_folder, res_name)
-		if os.path.isfile(overall_res_pth):
+		if os.path.isfile(overall_res_pth) and not resume:
 			# Number of seconds to delay before deleting file
 			delay = 5.0
 			self.logger.warning(
@@ -1291,10 +1910,11 @@ class StudySettings:
 
 		return res_name
 
-	def add_folder(self, pth_results_file):
+	def add_folder(self, pth_results_file, keep_existing=False):
 		"""
 			Folder creates a results file
 		:param str pth_results_file:
+		:param bool keep_existing:  (optional=False) If True then an existing folder and its contents are kept
 		:return:
 		"""
 		delay_counter = 5
@@ -1305,6 +1925,15 @@ class StudySettings:
 
 		target_folder = os.path.join(pth, folder_name)
 
+		if keep_existing and os.path.isdir(target_folder):
+			self.logger.info(
+				'The existing results in the folder {} will be kept and only missing results produced'.format(
+					target_folder
+				)
+			)
+			self.export_folder = target_folder
+			return None
+
 		if os.path.exists(target_folder):
 			self.logger.warning(
 				(
@@ -1441,8 +2070,8 @@ class LociSettings:
 			else:
 				raise IOError('No workbook or path to file provided')
 		else:
-			# Get workbook path in case path has not been provided
-			self.pth = wkbk.io
+			# Get workbook path in case path has not been provided, the workbook may have been read into memory
+			self.pth = pth_file or wkbk.io
 
 		# Default values that are used unless a better input is provided
 		polygon_range = constants.LociInputs.def_polygon_range
@@ -1653,12 +2282,13 @@ class StudyInputs:
 	"""
 		Class used to import the Settings from the Input Spreadsheet and convert into a format usable elsewhere
 	"""
-	def __init__(self, pth_file=None, gui_mode=False):
+	def __init__(self, pth_file=None, gui_mode=False, wkbk_data=None):
 		"""
 			Initialises the settings based on the Study Settings spreadsheet
 		:param str pth_file:  Path to input settings file
 		:param bool gui_mode: (optional) when set to True this will creating the export folder since that
 							will be processed later
+		:param bytes wkbk_data:  (optional) Contents of the inputs workbook if it has already been read into memory
 		"""
 		# General constants
 		self.pth = pth_file
@@ -1670,16 +2300,24 @@ class StudyInputs:
 
 		self.logger.info('Importing settings from file: {}'.format(self.pth))
 
-		with pd.ExcelFile(io=self.pth) as wkbk:
+		# Workbook is read from disk once and each worksheet is then processed from memory
+		if wkbk_data is None:
+			with open(self.pth, 'rb') as f:
+				wkbk_data = f.read()
+
+		with pd.ExcelFile(io.BytesIO(wkbk_data)) as wkbk:
 			# Import StudySettings
-			self.settings = StudySettings(wkbk=wkbk, gui_mode=gui_mode)
+			self.settings = StudySettings(wkbk=wkbk, pth_file=self.pth, gui_mode=gui_mode)
 			self.cases = self.process_study_cases(wkbk=wkbk)
 			contingency_cmd_breaker, contingencies_breakers = self.process_contingencies(wkbk=wkbk)  # type: str, dict
 			contingency_cmd_lines, contingencies_lines = self.process_contingencies(wkbk=wkbk, line_data=True)  # type: str, dict
 			self.terminals = self.process_terminals(wkbk=wkbk)
 			self.lf_settings = self.process_lf_settings(wkbk=wkbk)
 			self.fs_settings = self.process_fs_settings(wkbk=wkbk)
-			self.loci_settings = LociSettings(wkbk=wkbk)
+			self.loci_settings = LociSettings(wkbk=wkbk, pth_file=self.pth)
+
+		# Lookup used for matching results headers to the reference terminals
+		self.terminal_lookup = TerminalLookup(terminals=self.terminals)
 
 		# Combine contingencies from breakers and lines into a single dictionary of contingencies that will be used if
 		# a fault case hasn't been defined already
@@ -1987,6 +2625,59 @@ class StudyInputs:
 		settings = FSSettings(existing_command=df.iloc[0], detailed_settings=df.iloc[1:])
 		return settings
 
+# Parsed inputs already imported by this process, keyed by the hash of the inputs workbook, along with the warnings
+# and errors logged whilst parsing
+inputs_cache = dict()
+
+def load_study_inputs(pth_file):
+	"""
+		Imports the inputs workbook in GUI mode (i.e. without creating the export folder) reusing the parsed inputs
+		if the same workbook has already been imported by this process.  The parsed inputs are keyed by a hash of the
+		workbook contents so that the inputs copied into each results folder are only parsed once.  Any warnings or
+		errors raised when the workbook was parsed are logged again when the parsed inputs are reused.
+	:param str pth_file:  Full path to the inputs workbook
+	:return StudyInputs inputs:  Parsed inputs, a separate instance is returned each time so can be modified
+	"""
+	c = constants.StudyInputs
+	logger = constants.logger
+
+	with open(pth_file, 'rb') as f:
+		wkbk_data = f.read()
+
+	if not c.cache_inputs:
+		return StudyInputs(pth_file=pth_file, gui_mode=True, wkbk_data=wkbk_data)
+
+	key = (c.cache_version, constants.__version__, hashlib.sha1(wkbk_data).hexdigest())
+
+	# Parsed inputs are stored pickled so that each caller receives its own copy
+	if key in inputs_cache:
+		data, messages = inputs_cache[key]
+		logger.info('Inputs from file: {} loaded from previously parsed inputs'.format(pth_file))
+		for level, msg in messages:
+			logger.log(level, msg)
+	else:
+		# Capture the warnings and errors so they can be logged again each time the parsed inputs are reused, the
+		# capacity is unlimited so the records are never discarded
+		handler = logging.handlers.BufferingHandler(capacity=float('inf'))
+		handler.setLevel(logging.WARNING)
+		logger.logger.addHandler(handler)
+		try:
+			data = pickle.dumps(
+				StudyInputs(pth_file=pth_file, gui_mode=True, wkbk_data=wkbk_data), protocol=pickle.HIGHEST_PROTOCOL
+			)
+		finally:
+			logger.logger.removeHandler(handler)
+		messages = [(record.levelno, record.getMessage()) for record in handler.buffer]
+		inputs_cache[key] = (data, messages)
+
+	# Workbook may have been parsed from a copy in a different folder
+	inputs = pickle.loads(data)  # type: StudyInputs
+	inputs.pth = pth_file
+	inputs.filename = os.path.basename(pth_file)
+	inputs.settings.pth = pth_file
+	inputs.loci_settings.pth = pth_file
+	return inputs
+
 class StudyCaseDetails:
 	def __init__(self, list_of_parameters):
 		"""
@@ -2158,6 +2849,68 @@ class TerminalDetails:
 		self.pf_handle = None
 		self.found = None
 
+class TerminalLookup:
+	"""
+		Index of the input terminals built once so that the results headers can be matched to the reference terminal
+		without scanning every terminal for every column
+	"""
+	def __init__(self, terminals):
+		"""
+			Build the lookup dictionaries from the terminals
+		:param collections.OrderedDict terminals:  Dictionary of TerminalDetails with the name used as the key
+		"""
+		c = constants.PowerFactory
+
+		# Lookup of (substation, terminal) as it appears in the PowerFactory results to the reference terminal name,
+		# the first terminal defined takes priority if multiple terminals have the same substation and terminal
+		self.sub_term = dict()
+		# Position of each terminal name in the inputs, used for the prefix / suffix matching of mutual names so that
+		# the last matching terminal takes priority
+		self.name_order = dict()
+		for i, term in enumerate(terminals.values()):
+			key = ('{}.{}'.format(term.substation, c.pf_substation), '{}.{}'.format(term.terminal, c.pf_terminal))
+			self.sub_term.setdefault(key, term.name)
+			self.name_order[term.name] = i
+
+		# Only the distinct lengths of terminal names need checking when looking for a prefix or suffix
+		self.name_lengths = sorted(set(len(x) for x in self.name_order.keys()))
+
+	def terminal(self, var_sub, var_term):
+		"""
+			Returns the reference terminal for a substation and terminal
+		:param str var_sub:  Substation in the format <name>.ElmSubstat
+		:param str var_term:  Terminal in the format <name>.ElmTerm
+		:return str ref_terminal:  Reference terminal name or empty string if not found
+		"""
+		return self.sub_term.get((var_sub, var_term), '')
+
+	def mutual_terminals(self, var_name):
+		"""
+			Returns the terminals that the mutual impedance name starts and ends with.  The mutual impedance is
+			expected to be named as "Terminal 1_Terminal 2"
+		:param str var_name:  Mutual impedance name with the PowerFactory type removed
+		:return (str, str) (term1, term2):  Terminal names, None if no terminal matched
+		"""
+		term1 = None
+		term2 = None
+		order1 = -1
+		order2 = -1
+		for length in self.name_lengths:
+			if length > len(var_name):
+				break
+			# Check start of name
+			order = self.name_order.get(var_name[:length], -1)
+			if order > order1:
+				term1 = var_name[:length]
+				order1 = order
+			# Check end of name
+			order = self.name_order.get(var_name[len(var_name)-length:], -1)
+			if order > order2:
+				term2 = var_name[len(var_name)-length:]
+				order2 = order
+
+		return term1, term2
+
 class LFSettings:
 	def __init__(self, existing_command, detailed_settings):
 		"""
@@ -2528,38 +3281,6 @@ class ResultsExport:
 
 		return None
 
-def angle(x1, y1, x2, y2):
-	"""
-		Use dotproduct to find the angle between vectors.
-
-		Angle returned in degrees between 0, 180 degrees
-	:param float x1:
-	:param float y1:
-	:param float x2:
-	:param float y2:
-	:return float angle:
-	"""
-	# Calculate numerator
-	numerator = (x1 * x2 + y1 * y2)
-	# Calculate denominator
-	denominator = math.sqrt((x1 ** 2 + y1 ** 2) * (x2 ** 2 + y2 ** 2))
-	an = math.degrees(math.acos(numerator / denominator))
-	return an
-
-def cross_sign(x1, y1, x2, y2):
-	"""
-		True if cross is positive, false if negative or zero
-	:param float x1:
-	:param float y1:
-	:param float x2:
-	:param float y2:
-	:return bool status:
-	"""
-	# True if cross is positive
-	# False if negative or zero
-	status = x1 * y2 > x2 * y1
-	return status
-
 def new_coordinates(x_source, y_source, x_target, y_target):
 	"""
 		Calculate a new coordinate for the loci point extending in the
@@ -2629,10 +3350,6 @@ def find_convex_vertices(x_values, y_values, max_vertices, node='None', h='None'
 	:return tuple corners: (x / y points for each corner
 	"""
 	c = constants.PowerFactory
-	# Constants used for columns in DataFrame
-	lbl_x = 'x'
-	lbl_y = 'y'
-	lbl_an = 'angle'
 
 	# # Filter out values which are outside of allowed range
 	# x_points = list()
@@ -2694,74 +3411,39 @@ def find_convex_vertices(x_values, y_values, max_vertices, node='None', h='None'
 		direction = not direction
 
 		# Remove the last point of the corner which is the same as the starting point
-		x = x_corner[:-1]
-		y = y_corner[:-1]
-
-		# Determine new expanded ConvexHull with vertices stored in DataFrame along with angle between vertices
-		df = pd.DataFrame()
-		for i in range(len(x)):
-			# Obtain the reference points so vertice can be calculated
-			point1 = (x[i], y[i])
-			point_ref = (x[i-1], y[i-1])
-			point2 = (x[i-2], y[i-2])
-
-			# Calculate vertices
-			x1, y1 = point1[0]-point_ref[0], point1[1]-point_ref[1]
-			x2, y2 = point2[0]-point_ref[0], point2[1]-point_ref[1]
-
-			# Add reference points to DataFrame
-			df.loc[i, lbl_x] = point_ref[0]
-			df.loc[i, lbl_y] = point_ref[1]
-
-			# Calculate the angle between the vertices
-			if cross_sign(x1,y1,x2,y2):
-				# If clockwise then angle is negative for inner angle
-				df.loc[i, lbl_an] = 180 - angle(x1,y1,x2,y2)
-			else:
-				df.loc[i, lbl_an] = angle(x1,y1,x2,y2)
+		x = np.array(x_corner[:-1])
+		y = np.array(y_corner[:-1])
+
+		# Determine new expanded ConvexHull with the reference vertices (the previous vertex for each point) along with
+		# the angle between the vertices either side of the reference vertex
+		x_ref = np.roll(x, 1)
+		y_ref = np.roll(y, 1)
+		x1, y1 = x - x_ref, y - y_ref
+		x2, y2 = np.roll(x, 2) - x_ref, np.roll(y, 2) - y_ref
+
+		# Calculate the angle between the vertices, if clockwise then angle is negative for inner angle
+		angles = np.degrees(np.arccos((x1 * x2 + y1 * y2) / np.sqrt((x1 ** 2 + y1 ** 2) * (x2 ** 2 + y2 ** 2))))
+		angles = np.where(x1 * y2 > x2 * y1, 180 - angles, angles)
 
 		# Calculate the point either side of the one with the greatest angle depending on the direction for
-		# this iteration
+		# this iteration, wrapping round at the first and last vertices
 		# Point to be filtered out
-		idx0 = df.loc[:, lbl_an].idxmax()
+		idx0 = np.nanargmax(angles)
 		if direction:
 			# If in one direction then obtain value 2 steps round
-			idx_target = idx0-1
-			# Check that haven't breached all the index values and if so restart at other extreme
-			if idx_target < min(df.index):
-				idx_target = max(df.index)
-
-			# Obtain source for line
-			idx_source = idx_target-1
-			# Confirm not outside of index limits
-			if idx_source < min(df.index):
-				idx_source = max(df.index)
-
+			idx_target = (idx0 - 1) % len(angles)
+			idx_source = (idx_target - 1) % len(angles)
 		else:
-			idx_target = idx0+1
-
-			# Check that haven't breached all the index values and if so restart at other extreme
-			if idx_target > max(df.index):
-				idx_target = min(df.index)
+			idx_target = (idx0 + 1) % len(angles)
+			idx_source = (idx_target + 1) % len(angles)
 
-			# Obtain source for line
-			idx_source = idx_target+1
-			# Confirm not outside of index limits
-			if idx_source > max(df.index):
-				idx_source = min(df.index)
-
-		# Obtain the coordinate that should be moved and angle it should be moved at
-		x_target, y_target = df.loc[idx_target, [lbl_x, lbl_y]]
-		x_source, y_source = df.loc[idx_source, [lbl_x, lbl_y]]
-
-		# Update the dataframe with the new x and y values
-		df.loc[idx_target, [lbl_x, lbl_y]] = new_coordinates(
-			x_source=x_source, y_source=y_source, x_target=x_target, y_target=y_target
+		# Update the coordinate that should be moved based on the angle of the line from the source
+		x_ref[idx_target], y_ref[idx_target] = new_coordinates(
+			x_source=x_ref[idx_source], y_source=y_ref[idx_source],
+			x_target=x_ref[idx_target], y_target=y_ref[idx_target]
 		)
 		# Obtain the new points that should be used for the convex hull
-		new_points = shapely.geometry.MultiPoint(
-			[shapely.geometry.Point(z) for z in df.loc[:, [lbl_x, lbl_y]].values]
-		)
+		new_points = shapely.geometry.MultiPoint(np.column_stack((x_ref, y_ref)))
 
 		# Calculate new ConvexHull corners, new vertices, etc.
 		x_corner, y_corner = new_points.convex_hull.exterior.xy
@@ -2786,13 +3468,66 @@ def find_convex_vertices(x_values, y_values, max_vertices, node='None', h='None'
 	# Return tuple of R and X values
 	return x_corner, y_corner
 
+def frequency_band_index(index, frequency_bounds):
+	"""
+		Determines the rows of the results that fall within the frequency range for each harmonic number so that the
+		selection only needs to be calculated once for each study.  If the frequencies are sorted then each selection is
+		a slice found using a binary search, otherwise the row numbers are returned.
+	:param pd.Index index:  Frequency index of the results DataFrame
+	:param dict frequency_bounds:  For each harmonic number provides the starting and stopping frequency in the format {
+									str harmonic number: (float minimum frequency, float maximum frequency)
+									}
+	:return dict band_index:  For each harmonic number the slice or array of row numbers for the frequency range
+	"""
+	band_index = dict()
+	frequencies = np.asarray(index, dtype=float)
+	sorted_frequencies = index.is_monotonic_increasing
+
+	for h, freq_range in frequency_bounds.items():
+		min_f_range = min(freq_range)
+		max_f_range = max(freq_range)
+		if sorted_frequencies:
+			# Start includes the minimum frequency and stop includes the maximum frequency
+			start = int(np.searchsorted(frequencies, min_f_range, side='left'))
+			stop = int(np.searchsorted(frequencies, max_f_range, side='right'))
+			band_index[h] = slice(start, stop)
+		else:
+			band_index[h] = np.flatnonzero((frequencies >= min_f_range) & (frequencies <= max_f_range))
+
+	return band_index
+
+def band_size(band):
+	"""
+		Returns the number of rows included in an entry from frequency_band_index
+	:param slice or np.ndarray band:  Selection of rows
+	:return int size:  Number of rows
+	"""
+	if isinstance(band, slice):
+		return max(0, band.stop - band.start)
+	else:
+		return len(band)
+
 def compare_nan_array(func, a, thresh):
 	out = ~pd.isna(a)
 	out[out] = func(a[out] , thresh)
 	return out
 
-def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_vertices, nom_frequency=50.0
-):
+def track_hulls(vertices, jobs):
+	"""
+		Reports the progress of the convex hull calculations as the vertices for each job are returned
+	:param iterable vertices:  Vertices for each job, returned in the same order as the jobs
+	:param list jobs:  Details of each job with the node name and harmonic number as the last two entries
+	:return list vertices:  Yields the vertices for each job
+	"""
+	# Only logged periodically since there is a convex hull for every node and harmonic number
+	tracker = progress.Progress(stage=progress.stage_hull, total=len(jobs), log_each=False)
+	for job, job_vertices in zip(jobs, vertices):
+		tracker.update(item='{} h{}'.format(job[3], job[4]))
+		yield job_vertices
+
+
+def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_vertices, nom_frequency=50.0,
+							  workers=None, band_index=None):
 	"""
 		Will loop through the provided DataFrame and calculate the convex hull that bounds the R and X
 		values for each.
@@ -2800,6 +3535,9 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 		The minimum and maximum values provided for each frequency bound are included
 
 		A specific percentage of points will be excluded from the impedance loci (i.e. the top 10% of values)
+
+		The convex hull for each node and harmonic number is independent and so these can be calculated using multiple
+		worker processes
 	:param pd.DataFrame df:  This is the DataFrame containing R and X values that will then be processed for extraction
 	:param dict frequency_bounds:  For each harmonic number provides the starting and stopping frequency in the format {
 									str harmonic number: (float minimum frequency, float maximum frequency)
@@ -2807,14 +3545,23 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 	:param dict percentage_to_exclude:  Percentage of maximum points to exclude from the dataset
 	:param float nom_frequency:  Nominal frequency = 50.0 Hz
 	:param dict max_vertices:  Maximum number of vertices associated with each harmonic order
+	:param int workers: (Optional=None) - Number of worker processes to use, if None then the value in
+		constants.LociInputs.hull_workers is used
+	:param dict band_index: (Optional=None) - Rows for each harmonic number from frequency_band_index, if None then it
+		is calculated from the DataFrame
 	:return pd.DataFrame df_convex:  Returns a DataFrame in the same arrangement as the supplied DataFrame but with the
 									corners for each vertices
 	"""
 	# Obtain constants
 	c = constants.Results
 
-	# Populated with the Convex Hull points for each node
-	dict_convex = dict()
+	# Populated with the harmonic numbers for each node and the details needed to calculate each convex hull
+	dict_nodes = collections.OrderedDict()
+	jobs = list()
+
+	# Rows for each frequency range are the same for every node
+	if band_index is None:
+		band_index = frequency_band_index(index=df.index, frequency_bounds=frequency_bounds)
 
 	# Loop through each node
 	for node_name, df_node in df.groupby(level=c.lbl_Reference_Terminal, axis=1):
@@ -2829,8 +3576,8 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 		df_r = df_node.loc[:, df_node.columns.get_level_values(level=c.lbl_Result)==constants.PowerFactory.pf_r1]
 		df_x = df_node.loc[:, df_node.columns.get_level_values(level=c.lbl_Result)==constants.PowerFactory.pf_x1]
 
-		# Empty Dictionary gets populated with the required harmonic numbers
-		dict_harms = dict()
+		# Empty list gets populated with the required harmonic numbers
+		dict_nodes[node_name] = list()
 
 		# Loop through each harm_number taking steps based on harm_groups and then use the middle of the range
 		for h, freq_range in frequency_bounds.items():
@@ -2841,13 +3588,13 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 			min_f_range = min(freq_range)
 			max_f_range = max(freq_range)
 			descriptor = 'h = {}  ({} - {} Hz)'.format(h, min_f_range, max_f_range)
-			idx_selection = (df_r.index >= min_f_range) & (df_r.index <= max_f_range)  # type: list
+			idx_selection = band_index[h]
 
 			# Confirm that there are actually any indexes for this harmonic number and if so extract results
-			if any(idx_selection):
+			if band_size(idx_selection) > 0:
 				# Extract the Z1 values specific to this frequency range and identify the index values for those which
 				# exceeded the allowed percentile
-				z_harm = df_z[idx_selection].values.ravel()
+				z_harm = df_z.values[idx_selection].ravel()
 				percentile_value = np.percentile(a=z_harm, q=(1-percentage_to_exclude[h])*100.0)
 				# Find index values for all values that are less than the percentile value
 				# idx_keep = z_harm<=percentile_value
@@ -2864,17 +3611,45 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 					# Extract the 2D DataFrame of values into a 1D numpy array and only keep those values which are less
 					# then the percentile values
 					# https://stackoverflow.com/questions/13730468/from-nd-to-1d-arrays
-					r_harm = df_r[idx_selection].values.ravel()[idx_keep]
-					x_harm = df_x[idx_selection].values.ravel()[idx_keep]
-
-					vertices = find_convex_vertices(
-						x_values=r_harm, y_values=x_harm, max_vertices=max_vertices[h],
-						node=node_name, h=h
-					)
+					r_harm = df_r.values[idx_selection].ravel()[idx_keep]
+					x_harm = df_x.values[idx_selection].ravel()[idx_keep]
+
+					dict_nodes[node_name].append(descriptor)
+					jobs.append((r_harm, x_harm, max_vertices[h], node_name, h))
+
+	# Determine number of worker processes to use
+	if workers is None:
+		workers = constants.LociInputs.hull_workers
+	if workers == 0:
+		workers = os.cpu_count() or 1
+	workers = min(workers, len(jobs))
+
+	# Calculate the vertices for each node and harmonic number, results are returned in the same order as the jobs
+	if workers > 1:
+		constants.logger.debug(
+			'Calculating {} convex hulls using {} worker processes'.format(len(jobs), workers)
+		)
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+			# Jobs are sent in chunks to reduce the overhead of passing each one to a worker process
+			chunk_size = max(1, len(jobs) // (4 * workers))
+			all_vertices = list(track_hulls(
+				vertices=executor.map(find_convex_vertices, *zip(*jobs), chunksize=chunk_size), jobs=jobs
+			))
+	else:
+		all_vertices = list(track_hulls(vertices=(find_convex_vertices(*job) for job in jobs), jobs=jobs))
 
-					# Create a new DataFrame with the vertices as columns
-					df_single_harm = pd.DataFrame(data=np.array(vertices).T, columns=(constants.PowerFactory.pf_r1, constants.PowerFactory.pf_x1))
-					dict_harms[descriptor] = df_single_harm
+	# Populated with the Convex Hull points for each node
+	dict_convex = dict()
+	i = 0
+	for node_name, descriptors in dict_nodes.items():
+		dict_harms = collections.OrderedDict()
+		for descriptor in descriptors:
+			# Create a new DataFrame with the vertices as columns
+			df_single_harm = pd.DataFrame(
+				data=np.array(all_vertices[i]).T, columns=(constants.PowerFactory.pf_r1, constants.PowerFactory.pf_x1)
+			)
+			dict_harms[descriptor] = df_single_harm
+			i += 1
 
 		# Combine all into a single DataFrame
 		df_all_harms = pd.concat(dict_harms.values(), keys=dict_harms.keys(), axis=1)
@@ -2891,7 +3666,7 @@ def calculate_convex_vertices(df, frequency_bounds, percentage_to_exclude, max_v
 
 	return df_convex
 
-def get_raw_data_excel_references(sht_name, df, start_row, start_col, target_frequencies):
+def get_raw_data_excel_references(sht_name, df, start_row, start_col, target_frequencies, band_index=None):
 	"""
 		Function returns the cell references which contain all of the raw data points associated with each convex hull
 	:param str, sht_name:  Name of the worksheet being written to
@@ -2899,6 +3674,8 @@ def get_raw_data_excel_references(sht_name, df, start_row, start_col, target_fre
 	:param int start_row:  Starting row number that will be plotted
 	:param int start_col:  Starting column number that data will begin in
 	:param dict target_frequencies:  Dictionary of the frequencies associated with each harmonic number
+	:param dict band_index: (Optional=None) - Rows for each harmonic number from frequency_band_index, if None then it
+		is calculated from the DataFrame
 	:return (dict, dict), (raw_x, raw_y):  Dictionary of the values to be returned
 	"""
 
@@ -2921,11 +3698,13 @@ def get_raw_data_excel_references(sht_name, df, start_row, start_col, target_fre
 	raw_x = dict()
 	raw_y = dict()
 
+	if band_index is None:
+		band_index = frequency_band_index(index=df.index, frequency_bounds=target_frequencies)
+
 	# Loop through each harmonic order and find all of the rows within each frequency range
 	for h, freq_limits in target_frequencies.items():
 		# Get rows that correspond to this frequency range
-		idx_selection = (df.index >= min(freq_limits)) & (df.index <= max(freq_limits))
-		row_numbers = np.where(idx_selection==True)[0]
+		row_numbers = np.arange(len(df.index))[band_index[h]]
 
 		# Convert to include the start and header row numbers (+2 is to account for index header names and extra rows)
 		row_numbers = [row+2+number_of_header_rows+start_row for row in row_numbers]
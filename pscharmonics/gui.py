@@ -10,11 +10,14 @@ import tkinter.ttk as ttk
 import sys
 import os
 import webbrowser
+import time
 from PIL import Image, ImageTk
 
 import pscharmonics
 import pscharmonics.constants as constants
 import pscharmonics.file_io as file_io
+import pscharmonics.progress as progress
+import pscharmonics.timing as timing
 import inspect
 
 def file_selector(initial_pth='', open_file=False, save_dir=False,
@@ -344,6 +347,9 @@ class CombineFiles:
 				).format(self.export_file, '\n\t'.join(self.results_files_list))
 			)
 
+			# Timing report only includes this export rather than any previous runs from the GUI
+			timing.timings.clear()
+
 			# Combine results
 			pscharmonics.file_io.ExtractResults(
 				target_file=self.export_file,
@@ -424,6 +430,8 @@ class MainGui:
 		self.init_dir = start_directory
 		# Status set to True if user aborts rather than running studies
 		self.abort = False
+		# Time the status label was last updated with the progress of a stage
+		self.progress_updated = 0.0
 
 		# Initialise constants and Tk window
 		tk.Tk.report_callback_exception = self.show_error
@@ -547,6 +555,9 @@ class MainGui:
 			self.button_run_studies
 		)
 
+		# Progress of the results processing is displayed in the status label
+		progress.add_listener(self.show_progress)
+
 		self.logger.debug('GUI window created')
 
 	def __enter__(self):
@@ -555,6 +566,7 @@ class MainGui:
 
 	def __exit__(self, exc_type, exc_val, exc_tb):
 		""" Called when the GUI window is closed """
+		progress.remove_listener(self.show_progress)
 		self.logger.debug('GUI window closed')
 
 	def row(self, i=0):
@@ -835,7 +847,7 @@ class MainGui:
 		# Ask user for file to save results of pre_case check into
 		pth_results = tk.filedialog.asksaveasfilename(
 			initialdir=self.init_dir,
-			initialfile='Results_{}.xlsx'.format(constants.uid),
+			initialfile='Results{}.xlsx'.format('' if constants.Results.resume_studies else '_{}'.format(constants.uid)),
 			filetypes=constants.GuiDefaults.xlsx_types,
 			title='Select the file to save the overall results to'
 		)
@@ -848,9 +860,12 @@ class MainGui:
 			self.results_file = pth_results
 
 			# Set the export folder for the inputs to be a new folder with the same name as the pth_results
-			self.inputs.settings.add_folder(pth_results)
+			self.inputs.settings.add_folder(pth_results, keep_existing=constants.Results.resume_studies)
 
 
+			# Timing report only includes these studies rather than any previous runs from the GUI
+			timing.timings.clear()
+
 			# Run the pre-case check
 			try:
 				self.logger.info('Starting Power Factory frequency scan studies')
@@ -906,7 +921,7 @@ class MainGui:
 			# Import the settings file and check if import successful
 			self.lbl_status.configure(text='Loading settings file')
 			self.master.update()
-			self.inputs = file_io.StudyInputs(pth_file=pth_settings, gui_mode=True)
+			self.inputs = file_io.load_study_inputs(pth_file=pth_settings)
 
 			if self.inputs.error:
 				# If there is an error when importing workbook
@@ -1011,12 +1026,37 @@ class MainGui:
 
 			# Close window
 			self.abort = True
+			progress.remove_listener(self.show_progress)
 			self.master.destroy()
 			# return None
 		else:
 			pass
 			# return None
 
+	def show_progress(self, event):
+		"""
+			Displays the progress of the stage being processed in the status label, the window is only redrawn every
+			constants.GuiDefaults.progress_refresh seconds so that a large number of events does not slow the processing
+		:param progress.ProgressEvent event:  Latest progress of the stage
+		:return None:
+		"""
+		now = time.perf_counter()
+		if event.done < event.total and now - self.progress_updated < constants.GuiDefaults.progress_refresh:
+			return None
+		self.progress_updated = now
+
+		if event.eta is None:
+			remaining = 'estimating time remaining'
+		else:
+			remaining = '{:.0f} seconds remaining'.format(event.eta)
+		self.lbl_status.configure(
+			text='{}: {} of {} ({:.1f} per second, {})'.format(
+				event.stage, event.done, event.total, event.rate, remaining
+			)
+		)
+		self.master.update()
+		return None
+
 	def show_error(self, *args):
 		"""
 			Function to deal with error handling that occurs when running tkinter
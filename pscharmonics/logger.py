@@ -8,21 +8,56 @@
 ###																													###
 #######################################################################################################################
 """
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 import os
 import traceback
 
 import pscharmonics.constants as constants
 
+class LazyMessage:
+	"""
+		Message and arguments which are only combined using str.format when the message is written to a log, so that
+		debug messages in loops do not need to be formatted unless they are written
+	"""
+	__slots__ = ('msg', 'args')
+
+	def __init__(self, msg, args):
+		"""
+		:param str msg:  Message including {} for each argument
+		:param tuple args:  Arguments to format the message with
+		"""
+		self.msg = msg
+		self.args = args
+
+	def __str__(self):
+		return self.msg.format(*self.args)
+
+
+class BlockingQueueHandler(logging.handlers.QueueHandler):
+	"""
+		Passes records to the queue for the background thread.  If the queue is full this waits for space rather than
+		the record being lost and the records are not formatted here so that formatting takes place in the background
+		thread.
+	"""
+	def enqueue(self, record):
+		self.queue.put(record, block=True)
+
+	def prepare(self, record):
+		# Records are passed within the same process and so do not need to be formatted and copied to be pickled
+		return record
+
+
 class Logger:
 	""" Contained within a class since logger will need to print to both power factory and
 		to the various log files
 	"""
 	logger = None # type: logging.Logger
 
-	def __init__(self, pth_debug_log=str(), pth_progress_log=str(), pth_error_log=str(), app=None):
+	def __init__(self, pth_debug_log=str(), pth_progress_log=str(), pth_error_log=str(), app=None, handlers=None):
 		"""
 			Initialise logger
 		:param str pth_progress_log:  Full path to the location of the log file that contains the process messages
@@ -30,6 +65,8 @@ class Logger:
 		:param str pth_debug_log:  Full path to the location of the log file that contains the error messages
 		:param bool debug:  True / False on whether running in debug mode or not
 		:param powerfactory app: (optional) - If not None then will use this to provide updates to powerfactory
+		:param list handlers: (optional=None) - If provided then messages are only passed to these handlers and no log
+			files are created, used by worker processes which return their messages to the main process
 		"""
 		# Attributes used during setup_logging
 		self.handler_progress_log = None
@@ -46,11 +83,17 @@ class Logger:
 		self.pth_progress_log = pth_progress_log
 		self.pth_error_log = pth_error_log
 		self.app = app
+		self.handlers = handlers
 		self.pf_executed = False
 		self.debug_mode = constants.DEBUG
 
 		self.file_handlers=[]
 
+		# Queue and background thread used if constants.General.async_logging is True
+		self.log_queue = None
+		self.listener = None
+		self.listener_running = False
+
 		# Set up logger and establish handle for logger
 		self.setup_logging()
 		self.initial_log_messages()
@@ -127,6 +170,13 @@ class Logger:
 		# Ensures that even debug messages are captured even if they are not written to log file
 		self.logger.setLevel(logging.DEBUG)
 
+		if self.handlers is not None:
+			# Messages are only passed to the handlers provided
+			for handler in self.handlers:
+				self.logger.addHandler(handler)
+			self.logger.propagate = False
+			return None
+
 		# Produce formatter for log entries
 		log_formatter = logging.Formatter(fmt='%(asctime)s - %(levelname)s - %(message)s',
 										  datefmt='%Y-%m-%d %H:%M:%S')
@@ -158,12 +208,41 @@ class Logger:
 		else:
 			self.handler_stream_log.setLevel(logging.INFO)
 
-		# Add handlers to logger
-		self.logger.addHandler(self.handler_progress_log)
-		self.logger.addHandler(self.handler_debug_log)
-		self.logger.addHandler(self.handler_error_log)
-		self.logger.addHandler(self.handler_stream_log)
+		handlers = (self.handler_progress_log, self.handler_debug_log, self.handler_error_log, self.handler_stream_log)
+
+		if constants.General.async_logging:
+			# Messages are written to the handlers by a background thread
+			self.log_queue = queue.Queue(maxsize=constants.General.log_queue_size)
+			self.listener = logging.handlers.QueueListener(self.log_queue, *handlers, respect_handler_level=True)
+			self.logger.addHandler(BlockingQueueHandler(self.log_queue))
+			self.start_listener()
+			# Ensures any remaining messages are written before Python exits
+			atexit.register(self.stop_listener)
+		else:
+			# Add handlers to logger
+			for handler in handlers:
+				self.logger.addHandler(handler)
+
+		return None
 
+	def start_listener(self):
+		"""
+			Starts the background thread which writes the log messages when running asynchronously
+		:return None:
+		"""
+		if self.listener is not None and not self.listener_running:
+			self.listener.start()
+			self.listener_running = True
+		return None
+
+	def stop_listener(self):
+		"""
+			Stops the background thread once all of the messages in the queue have been written
+		:return None:
+		"""
+		if self.listener is not None and self.listener_running:
+			self.listener.stop()
+			self.listener_running = False
 		return None
 
 	def initial_log_messages(self):
@@ -171,6 +250,10 @@ class Logger:
 			Display initial messages for logger including paths where log files will be stored
 		:return:
 		"""
+		# No log files are created if the handlers have been provided
+		if self.handlers is not None:
+			return None
+
 		# Initial announcement of directories for log messages to be saved in
 		self.info('Path for debug log is {} and will be created if any WARNING messages occur'
 				  .format(self.pth_debug_log))
@@ -192,7 +275,10 @@ class Logger:
 		# Close the debug handler so that no debug outputs will be written to the log files again
 		# This is a safe close of the logger and any other close, i.e. an exception will result in writing the
 		# debug file.
-		# Flush existing progress and error logs
+		# Write any queued messages and then flush existing progress and error logs
+		self.stop_listener()
+		if self.handlers is not None:
+			return None
 		self.handler_progress_log.flush()
 		self.handler_error_log.flush()
 
@@ -237,36 +323,49 @@ class Logger:
 
 		return handler
 
-	def debug(self, msg):
-		""" Handler for debug messages """
+	def debug(self, msg, *args):
+		"""
+			Handler for debug messages, if args are provided then the message is only formatted with them if it is
+			written i.e. logger.debug('Results: {}', results)
+		"""
+		if args:
+			msg = LazyMessage(msg=msg, args=args)
 		# Only print output to powerfactory if it has been passed to logger
 		if self.app and self.pf_executed and self.debug_mode:
-			self.app.PrintPlain(msg)
+			self.app.PrintPlain(str(msg))
 		self.logger.debug(msg)
 
-	def info(self, msg):
+	def info(self, msg, *args):
 		""" Handler for info messages """
+		if args:
+			msg = LazyMessage(msg=msg, args=args)
 		# Only print output to powerfactory if it has been passed to logger
 		if self.app and self.pf_executed:
-			self.app.PrintPlain(msg)
+			self.app.PrintPlain(str(msg))
 		self.logger.info(msg)
 
-	def warning(self, msg):
+	def warning(self, msg, *args):
 		""" Handler for warning messages """
+		if args:
+			msg = LazyMessage(msg=msg, args=args)
 		self.warning_count += 1
 		if self.app and self.pf_executed:
-			self.app.PrintWarn(msg)
+			self.app.PrintWarn(str(msg))
 		self.logger.warning(msg)
 
-	def error(self, msg):
+	def error(self, msg, *args):
 		""" Handler for warning messages """
+		if args:
+			msg = LazyMessage(msg=msg, args=args)
 		self.error_count += 1
 		if self.app and self.pf_executed:
-			self.app.PrintError(msg)
+			self.app.PrintError(str(msg))
 		self.logger.error(msg)
 
-	def critical(self, msg):
+	def critical(self, msg, *args):
 		""" Critical error has occurred """
+		if args:
+			msg = LazyMessage(msg=msg, args=args)
 		# Get calling function to include in log message
 		# noinspection PyProtectedMember
 		caller = sys._getframe().f_back.f_code.co_name
@@ -275,11 +374,45 @@ class Logger:
 		if self.app and self.pf_executed:
 			try:
 				# Try statement since possible that an error has occurred and it might not run
-				self.app.PrintError(msg)
+				self.app.PrintError(str(msg))
 			# If attribute doesn't exist then continue
 			except AttributeError:
 				pass
-		self.logger.critical('function <{}> reported {}'.format(caller, msg))
+		self.logger.critical(LazyMessage(msg='function <{}> reported {}', args=(caller, msg)))
+
+	def progress(self, event):
+		"""
+			Handler for progress events from pscharmonics.progress
+		:param pscharmonics.progress.ProgressEvent event:  Progress of the stage
+		:return None:
+		"""
+		if event.eta is None:
+			remaining = 'unknown'
+		else:
+			remaining = '{:.0f} seconds'.format(event.eta)
+		self.info(
+			' - \t {}/{} {}{} ({:.2f} per second, {} remaining)'.format(
+				event.done, event.total, event.stage, ': {}'.format(event.item) if event.item else '', event.rate,
+				remaining
+			)
+		)
+		return None
+
+	def log(self, level, msg):
+		""" Handler for messages where the level is only known when running, i.e. those from worker processes """
+		if level >= logging.CRITICAL:
+			self.critical_count += 1
+			if self.app and self.pf_executed:
+				self.app.PrintError(msg)
+			self.logger.critical(msg)
+		elif level >= logging.ERROR:
+			self.error(msg)
+		elif level >= logging.WARNING:
+			self.warning(msg)
+		elif level >= logging.INFO:
+			self.info(msg)
+		else:
+			self.debug(msg)
 
 	def exception_handler(self, exception_type, value, tb):
 		"""
@@ -309,6 +442,12 @@ class Logger:
 
 	def flush(self):
 		""" Flush all loggers to file before continuing """
+		# Any queued messages are written by stopping the background thread which is then restarted
+		if self.listener_running:
+			self.stop_listener()
+			self.start_listener()
+		if self.handlers is not None:
+			return None
 		self.handler_progress_log.flush()
 		self.handler_error_log.flush()
 
@@ -326,6 +465,7 @@ class Logger:
 		else:
 			self.logger.info('Log file closing, there were 0 important messages')
 		self.logger.debug('Logging stopped')
+		self.stop_listener()
 		logging.shutdown()
 
 	# def __del__(self):
@@ -340,4 +480,21 @@ class Logger:
 			To correctly handle deleting and therefore shutting down of logging module
 		:return None:
 		"""
-		self.logging_final_report_and_closure()
\ No newline at end of file
+		self.logging_final_report_and_closure()
+
+	def __reduce__(self):
+		"""
+			The file handlers cannot be pickled and so when an object with a reference to the logger is passed to a
+			worker process it is replaced with the logger for that process
+		:return tuple:
+		"""
+		return get_logger, ()
+
+def get_logger():
+	"""
+		Returns the logger for the current process, creating it if it does not already exist
+	:return Logger logger:  Handle to the logger
+	"""
+	if constants.logger is None:
+		constants.logger = Logger()
+	return constants.logger
\ No newline at end of file
@@ -12,15 +12,29 @@
 import os
 import sys
 import math
+import collections
+import concurrent.futures
+import glob
+import hashlib
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import traceback
 import pscharmonics.constants as constants
+import pscharmonics.logger
 import pscharmonics.file_io as file_io
+import pscharmonics.timing as timing
 import time
 import distutils.version
 import pandas as pd
+import numpy as np
 
 # powerfactory will be defined after initialisation by the PowerFactory class
 powerfactory = None
 app = None
+# PowerFactory version initialised by this process so that the same version is used by any worker processes
+selected_version = None
 
 
 def create_object(location, pfclass, name):  # Creates a database object in a specified location of a specified class
@@ -41,6 +55,59 @@ def create_object(location, pfclass, name):  # Creates a database object in a sp
 		already_existed = False
 	return _new_object, already_existed
 
+def get_column_values(elmres, col, rno):
+	"""
+		Obtains all of the values for a single column of the results file.  ElmRes.GetColumnValues(dataList, column)
+		is used if available since it fills the provided list with the entire column in a single call, otherwise each
+		row is read using ElmRes.GetValue
+	:param powerfactory.Results elmres: handle for powerfactory results file (must already be loaded)
+	:param int col:  Column number
+	:param int rno:  Number of rows in the results file
+	:return (np.ndarray, bool) (values, bulk):  Values for the column and whether the column getter was used
+	"""
+	getter = getattr(elmres, 'GetColumnValues', None)
+	if getter is not None:
+		values = list()
+		# Returns 0 if successful and 1 if the column does not exist
+		error = getter(values, col)
+		if not error and len(values) == rno:
+			return np.asarray(values, dtype=float), True
+
+	values = np.empty(rno, dtype=float)
+	for j in range(rno):
+		_, values[j] = elmres.GetValue(j, col)
+	return values, False
+
+def retrieve_results_array(elmres):
+	"""
+		Reads all of the results from the results file into a single preallocated array
+	:param powerfactory.Results elmres: handle for powerfactory results file
+	:return (list, list, np.ndarray) (variables, objects, values):  Variable and object names for each column and an
+		array of the values in the shape (number of rows, number of columns)
+	"""
+	t0 = time.time()
+	elmres.Load()
+	cno = elmres.GetNumberOfColumns()  # Returns number of Columns
+	rno = elmres.GetNumberOfRows()  # Returns number of Rows in File
+
+	variables = []
+	objects = []
+	values = np.empty((rno, cno), dtype=float)
+	bulk_columns = 0
+	for i in range(cno):
+		variables.append(elmres.GetVariable(i))
+		objects.append(str(elmres.GetObject(i)))
+		values[:, i], bulk = get_column_values(elmres=elmres, col=i, rno=rno)
+		bulk_columns += bulk
+	elmres.Release()
+
+	# PowerFactory objects are converted to strings here since the message may be formatted by a background thread
+	constants.logger.debug(
+		'Retrieved {} rows x {} columns from results file {} in {:.3f} seconds ({} columns read in bulk)',
+		rno, cno, str(elmres), time.time() - t0, bulk_columns
+	)
+	return variables, objects, values
+
 def retrieve_results(elmres, res_type, write_as_df=False):  # Reads results into python lists from results file
 	"""
 		Reads results into python lists from results file for processing to add to Excel
@@ -53,43 +120,31 @@ def retrieve_results(elmres, res_type, write_as_df=False):  # Reads results into
 	# The first column is usually the scale ie timestep, frequency etc.
 	# The columns are made up of Objects from left to right (ElmTerm, ElmLne)
 	# The Objects then have sub variables (m:R, m:X etc)
-	elmres.Load()
-	cno = elmres.GetNumberOfColumns()  # Returns number of Columns
-	rno = elmres.GetNumberOfRows()  # Returns number of Rows in File
-	results = []
-	for i in range(cno):
-		column = []
-		p = elmres.GetObject(i)  # Object
-		d = elmres.GetVariable(i)  # Variable
-		column.append(d)
-		column.append(str(p))
-		# column.append(d)
-		# app.PrintPlain([i,p,d])
-		for j in range(rno):
-			r, t = elmres.GetValue(j, i)
-			# app.PrintPlain([i,p,d,j,t])
-			column.append(t)
-		results.append(column)
+	variables, objects, values = retrieve_results_array(elmres=elmres)
+
+	# Last column is the scale and if res_type == 1 then the column before the scale is also not included
+	cols = list(range(len(variables)))
 	if res_type == 1:
-		results = results[:-1]
-	scale = results[-1:]
-	results = results[:-1]
-	elmres.Release()
+		cols = cols[:-1]
+	scale_col = cols[-1:]
+	cols = cols[:-1]
 
 	logger = constants.logger
-	logger.debug(results)
-
 
 	if write_as_df:
-		# For some reason when running directly in PowerFactory cannot initiate immediately into a populated DataFrame
-		# therefore create empty dataFrame and then populate
-		logger.debug('Processing results: {} into a Dataframe'.format(elmres))
-		df = pd.DataFrame()
-		for i,res in enumerate(results):
-			# Extract the relevant data values into a DataFrame
-			df[res[0]] = res[2:-1]
+		t0 = time.time()
+		# Where a variable appears more than once the last column is used but in the position of the first
+		name_cols = dict()
+		for i in cols:
+			name_cols[variables[i]] = i
+		# The final row is not included in the DataFrame
+		df = pd.DataFrame(values[:-1, list(name_cols.values())], columns=list(name_cols.keys()))
+		logger.debug('Processing results: {} into a Dataframe took {:.3f} seconds', str(elmres), time.time() - t0)
 		return df
 	else:
+		results = [[variables[i], objects[i]] + values[:, i].tolist() for i in cols]
+		scale = [[variables[i], objects[i]] + values[:, i].tolist() for i in scale_col]
+		logger.debug('{}', results)
 		return scale[0], results
 
 def add_vars_res(elmres, element, res_vars):	# Adds the results variables to the results file
@@ -153,12 +208,157 @@ def create_mutual_elm(location, name, bus1, bus2):		# Creates Mutual Impedance b
 	return elmmut
 
 
+def modified_time(pf_obj):
+	"""
+		Returns the time the object was last modified
+	:param powerfactory.DataObject pf_obj:  Object to check
+	:return int modified:  Modified time or None if it cannot be determined
+	"""
+	try:
+		return pf_obj.GetAttribute(constants.PowerFactory.pf_modified_time)
+	except AttributeError:
+		return None
+
+class PreCaseCache:
+	"""
+		Convergence of each contingency found by previous pre-case checks, stored in a JSON file and keyed by a
+		fingerprint of the models and inputs used.  Only the most recently used entries are kept when saved.
+	"""
+	def __init__(self, pth, max_entries=None):
+		"""
+		:param str pth:  Full path to the cache file, created when the cache is saved if it does not exist
+		:param int max_entries:  (optional=None) Maximum number of entries kept, if None then
+			constants.Contingencies.pre_case_cache_max_entries is used
+		"""
+		self.logger = constants.logger
+		self.pth = pth
+		self.max_entries = constants.Contingencies.pre_case_cache_max_entries if max_entries is None else max_entries
+		self.entries = dict()
+		self.changed = False
+
+		if os.path.isfile(self.pth):
+			try:
+				with open(self.pth, 'r') as f:
+					data = json.load(f)
+				if data.get('version') == constants.Contingencies.pre_case_cache_version:
+					self.entries = data['entries']
+			except (ValueError, KeyError, IOError):
+				self.logger.warning(
+					'Unable to read the pre-case check cache {} and so it will be replaced'.format(self.pth)
+				)
+
+	def get(self, fingerprint):
+		"""
+			Returns the convergence of each contingency for the fingerprint provided
+		:param str fingerprint:  Fingerprint returned by PFProject.pre_case_fingerprint
+		:return dict convergence:  Dictionary of contingency name to convergence, None if not in the cache
+		"""
+		entry = self.entries.get(fingerprint)
+		if entry is None:
+			return None
+
+		# Time last used is updated so that the entries used most recently are kept
+		entry['used'] = time.time()
+		self.changed = True
+		return entry['convergence']
+
+	def update(self, fingerprint, cases):
+		"""
+			Stores the convergence of the cases provided
+		:param str fingerprint:  Fingerprint returned by PFProject.pre_case_fingerprint
+		:param list cases:  List of the PFStudyCase instances that have been checked
+		:return None:
+		"""
+		self.entries[fingerprint] = dict(
+			used=time.time(),
+			convergence={case.cont_name: bool(case.ldf_convergent) for case in cases}
+		)
+		self.changed = True
+		return None
+
+	def save(self):
+		"""
+			Writes the cache to file if it has changed
+		:return None:
+		"""
+		if self.changed:
+			# Least recently used entries are removed so the cache does not keep growing
+			if len(self.entries) > self.max_entries:
+				keep = sorted(self.entries, key=lambda x: self.entries[x]['used'], reverse=True)[:self.max_entries]
+				self.entries = {x: self.entries[x] for x in keep}
+
+			folder = os.path.dirname(self.pth)
+			if not os.path.isdir(folder):
+				os.makedirs(folder)
+			with open(self.pth, 'w') as f:
+				json.dump(dict(version=constants.Contingencies.pre_case_cache_version, entries=self.entries), f)
+			self.changed = False
+			self.logger.debug('Pre-case check cache saved to {}'.format(self.pth))
+		return None
+
+class ElementLookup:
+	"""
+		Index of the network elements in a project by name so that elements can be found without searching all of the
+		network data folders each time.  Each element class is indexed with a single search of the network data folders
+		the first time it is needed.
+	"""
+	def __init__(self, net_data_items):
+		"""
+		:param list net_data_items:  Network data folders (ElmNet) containing the network elements
+		"""
+		self.net_data_items = net_data_items
+		# Dictionary of (element class, recursive) to a dictionary of element name to list of elements
+		self.index = dict()
+
+	def find(self, element_name, pf_type, recursive=0):
+		"""
+			Returns all the elements of the class provided with the name provided.  If the name is not in the index or
+			includes wildcards then the network data folders are searched directly so the result is unchanged.
+		:param str element_name:  Name of element to be found
+		:param str pf_type:  PowerFactory class of the element
+		:param int recursive:  If set to 1 will search recursively
+		:return list elements:  List of elements found
+		"""
+		if not any(x in element_name for x in '*?'):
+			key = (pf_type, recursive)
+			if key not in self.index:
+				t0 = time.time()
+				elements_by_name = dict()
+				for net_item in self.net_data_items:
+					for element in net_item.GetContents('*.{}'.format(pf_type), recursive):
+						elements_by_name.setdefault(element.loc_name, list()).append(element)
+				self.index[key] = elements_by_name
+				constants.logger.debug(
+					'Index of {} {} elements created in {:.3f} seconds'.format(
+						sum([len(x) for x in elements_by_name.values()]), pf_type, time.time() - t0
+					)
+				)
+
+			elements = self.index[key].get(element_name)
+			if elements:
+				return list(elements)
+
+		element_name_to_find = '{}.{}'.format(element_name, pf_type)
+		elements = list()
+		for net_item in self.net_data_items:
+			# Loop through each net_item folder and search for element
+			elements.extend(net_item.GetContents(element_name_to_find, recursive))
+		return elements
+
+	def clear(self):
+		""" Clears the index so that it is recreated the next time an element is searched for """
+		self.index = dict()
+		return None
+
+
 class PFStudyCase:
 	""" Class containing the details for each study case contained within a project """
 	# The full path where results will be saved is defined just prior to creating the studies
 	res_pth = str()  # type: str
 
-	def __init__(self, name, cont_name, sc, op, prj, sc_source_name, op_source_name, base_case=False):
+	def __init__(
+			self, name, cont_name, sc, op, prj, sc_source_name, op_source_name, base_case=False, element_lookup=None
+	):
 		"""
 			Initialises the class with a list of parameters taken from the Study Settings import
 		:param str name:  Name of study case
@@ -169,6 +369,8 @@ class PFStudyCase:
 		:param str sc_source_name:  Name for the study case used as the basis for this study case
 		:param str op_source_name:  Name of the operating scenario used as the basis for this operating scenario
 		:param bool base_case: (optional=False) - Set to True for the base cases
+		:param ElementLookup element_lookup:  (optional=None) - Index of the network elements for the project, if not
+			provided then a new index is created
 		"""
 
 
@@ -197,6 +399,8 @@ class PFStudyCase:
 		self.ldf_convergent = False
 		# Set to True if an error occurs to avoid trying to run additional studies
 		self.skip = False
+		# Set to True if the results for this case already exist from a previous run and so it is not run again
+		self.already_run = False
 
 		# Reference to powerfactory handle for study case
 		self.sc = sc
@@ -223,6 +427,10 @@ class PFStudyCase:
 		self.net_data = app.GetProjectFolder(constants.PowerFactory.pf_netdata_folder_type)
 		# Get all folders which contain network elements
 		self.net_data_items = self.net_data.GetContents('*.{}'.format(constants.PowerFactory.pf_network_elements))
+		# Index used to find network elements which is shared by all of the cases in a project
+		if element_lookup is None:
+			element_lookup = ElementLookup(net_data_items=self.net_data_items)
+		self.element_lookup = element_lookup
 
 		# If no results path is provided then warn user and saved results to same folder as the script
 		# Removed from here since now only check the path exists at the point the studies are created
@@ -576,13 +784,22 @@ class PFStudyCase:
 			self.fs = fs
 		return None
 
-	def pre_case_check(self):
+	def pre_case_check(self, convergence=None):
 		"""
 			Function to create all the necessary contingency cases and run a pre-case check to confirm that all
 			cases are convergent.  The status of each case is then updated in the DataFrame which will be exported
 			at the end of the study and used as the basis for whether frequency scans should be run
+		:param dict convergence:  (optional=None) Dictionary of contingency name to whether the load flow is
+			convergent, determined by batch_pre_case_check, if provided no load flow is run
 		:return None:
 		"""
+		# Cases where the outage could not be applied remain non-convergent
+		if self.skip:
+			return None
+
+		if convergence is not None:
+			self.ldf_convergent = bool(convergence.get(self.cont_name, False))
+			return None
 
 		# Since creating contingency analysis is to confirm that model is convergent for every contingency initially
 		# run a load flow study to confirm the intact condition is convergent.
@@ -590,6 +807,114 @@ class PFStudyCase:
 
 		return None
 
+	@timing.timed('PFStudyCase.batch_pre_case_check', 'name')
+	def batch_pre_case_check(self, contingencies=None, contingencies_cmd=str()):
+		"""
+			Function carries out the pre-case check for every contingency as a single contingency analysis run on
+			this base case rather than running a load flow for each of the contingency study cases.  A temporary
+			contingency analysis command is created containing a fault case for each contingency, either copied from
+			the contingencies command or created from the contingencies inputs, and the results are then processed
+			into a status DataFrame.  The temporary command is deleted once complete.
+		:param dict contingencies:  (optional) Dictionary of the outages to be considered
+		:param str contingencies_cmd:  (optional) Name of the contingencies command to use, takes preference
+		:return pd.DataFrame df_status:  Contingency name, fault case number and whether the load flow is convergent
+			for each contingency, None if the contingency analysis could not be run and so a load flow must be run for
+			each case instead.  Contingencies for which a fault case could not be created have a fault case number of 0
+		"""
+		c = constants.Contingencies
+		t0 = time.time()
+
+		# Case needs to be active for the commands to be created and results file to be found
+		self.toggle_state()
+		self.create_results_files()
+
+		# Any previous temporary contingency analysis command is replaced
+		for cont_analysis in self.sc.GetContents(
+				'{}.{}'.format(constants.General.cmd_cont_leader, constants.PowerFactory.pf_cont_analysis)
+		):
+			cont_analysis.Delete()
+
+		# Contingencies for which the outage elements could not be found are not convergent
+		failed = list()
+		cont_analysis = None
+		try:
+			if contingencies_cmd:
+				fault_cases = self.find_fault_cases(contingencies_cmd=contingencies_cmd)
+				if len(fault_cases) == 0:
+					return pd.DataFrame(columns=[c.cont, c.idx, c.status])
+
+				# The command is copied so the fault cases can be renumbered without changing the user's command
+				cont_analysis = self.sc.AddCopy(fault_cases[0].GetParent(), constants.General.cmd_cont_leader)
+				fault_cases = cont_analysis.GetContents('*.{}'.format(constants.PowerFactory.pf_outage))
+			else:
+				cont_analysis, _ = create_object(
+					location=self.sc, pfclass=constants.PowerFactory.pf_cont_analysis,
+					name=constants.General.cmd_cont_leader
+				)
+				fault_cases = list()
+				for cont_name, cont_item in contingencies.items():
+					# Skips the intact case or any which have been flagged for skipping
+					if cont_name == c.intact or all([x.skip for x in cont_item.values()]):
+						continue
+
+					couplers, lines, fault_case_error = self.find_outage_elements(cont_item=cont_item)
+					if fault_case_error:
+						failed.append(cont_name)
+						continue
+
+					# Each circuit breaker is switched to the required status and each line is taken out of service
+					fault_case = cont_analysis.CreateObject(constants.PowerFactory.pf_outage, cont_name)
+					for breaker, status in couplers:
+						event = fault_case.CreateObject(constants.PowerFactory.pf_switch_event, breaker.loc_name)
+						event.p_target = breaker
+						event.i_switch = int(status)
+					for pf_line in lines:
+						event = fault_case.CreateObject(constants.PowerFactory.pf_outage_event, pf_line.loc_name)
+						event.p_target = pf_line
+					fault_cases.append(fault_case)
+
+			# Each fault case is numbered so the results can be matched to the contingency
+			for i, fault_case in enumerate(fault_cases):
+				fault_case.number = i + 1
+			df_status = pd.DataFrame(
+				collections.OrderedDict((
+					(c.cont, [x.loc_name for x in fault_cases]),
+					(c.idx, [x.number for x in fault_cases]),
+				))
+			)
+
+			cont_analysis.p_res = self.cont_results
+			cont_analysis.iEnableParal = int(len(fault_cases) > c.parallel_threshold)
+
+			error_code = cont_analysis.Execute()
+			if error_code != 0:
+				self.logger.error(
+					(
+						'Contingency analysis {} for the pre-case check of study case {} failed with error code {} and '
+						'so a load flow will be run for each contingency instead'
+					).format(cont_analysis, self.name, error_code)
+				)
+				return None
+
+			df_status = self.process_cont_results(df_status=df_status)
+		finally:
+			# Temporary command is not left in the user's study case
+			if cont_analysis is not None:
+				cont_analysis.Delete()
+
+		if failed:
+			df_status = pd.concat(
+				[df_status, pd.DataFrame({c.cont: failed, c.idx: 0, c.status: False})], ignore_index=True
+			)
+
+		self.logger.info(
+			'Pre-case check of {} contingencies for study case {} completed in {:.2f} seconds, {} convergent'.format(
+				len(fault_cases), self.name, time.time() - t0, int(df_status[c.status].sum())
+			)
+		)
+
+		return df_status
+
 	def delete_sc_objects(self, pf_cmd, pf_type):
 		"""
 			Function to delete all of the other items of a particular type from the study case except the one provided
@@ -681,11 +1006,11 @@ class PFStudyCase:
 	#
 	# 	return fs_res
 
-	def process_cont_results(self):
+	def process_cont_results(self, df_status):
 		"""
 			Function will process the contingencies to check the results and determine which were convergent
-			with the status being updated in the DataFrame.
-		:return:
+		:param pd.DataFrame df_status:  Contingency name and fault case number for each contingency
+		:return pd.DataFrame df_status:  Copy of the DataFrame with the status of each contingency added
 		"""
 		self.logger.debug(
 			'For ({}, {}, {}) processing contingency pre-case check results'.format(self.prj, self.sc, self.op)
@@ -696,10 +1021,9 @@ class PFStudyCase:
 		self.logger.debug('Results retrieved for contingency results {}'.format(self.cont_results))
 
 		# If an empty DataFrame is returned then means all contingencies failed so set status to False
-		# DEBUG TESTING
-		self.df[c.status] = False
+		df_status = df_status.copy()
 		if df.empty:
-			self.df[c.status] = False
+			df_status[c.status] = False
 			self.logger.info(
 				'No successful contingencies for study case {}, ({}, {}, {})'.format(
 					self.name, self.prj, self.sc, self.op)
@@ -708,14 +1032,15 @@ class PFStudyCase:
 			# Set columns to be based on first index
 			self.logger.debug('Setting columns for DataFrame')
 
-			# Set the index for the DataFrame based on the object number
-			df.set_index(c.col_number, inplace=True)
-
-			# Get list of contingencies which were not convergent
-			for cont_number, series in df.iterrows():
-				# Populate the status of the convergence
-				self.df.loc[self.df[c.idx]==cont_number, c.status] = not bool(series[c.col_nonconvergent])
+			# Non-convergence flag for each object number, if an object number appears more than once the last
+			# result is used
+			non_convergent = df.drop_duplicates(subset=c.col_number, keep='last').set_index(c.col_number)
+			non_convergent = non_convergent[c.col_nonconvergent]
 
+			# Map the non-convergence flag onto each contingency using the contingency number, contingencies with no
+			# results or where the flag is missing are not convergent
+			status = df_status[c.idx].map(non_convergent)
+			df_status[c.status] = status.notna() & ~status.fillna(1).astype(bool)
 
 			self.logger.debug(
 				'Processing contingency analysis results for case {}, consisting of sc {} and op {}'.format(
@@ -723,7 +1048,7 @@ class PFStudyCase:
 				)
 			)
 
-		return None
+		return df_status
 
 	def create_results_files(self):
 		"""
@@ -815,6 +1140,7 @@ class PFStudyCase:
 
 		return None
 
+	@timing.timed('PFStudyCase.create_studies', 'name')
 	def create_studies(self, lf_settings=None, fs_settings=None):
 		"""
 			Function to either create a new command or change the reference of an existing command to results file
@@ -843,6 +1169,17 @@ class PFStudyCase:
 
 		return None
 
+	def export_name(self):
+		"""
+			Returns the name used for the results exported for this case
+		:return str name:
+		"""
+		if self.base_case:
+			name = '{}_{}'.format(self.name, constants.Contingencies.intact)
+		else:
+			name = self.name
+		return name
+
 	def set_results_export(self, result, res_type):
 		"""
 			Function will create a results export command (.ComRes) to then use to deal with exporting all the results
@@ -852,12 +1189,9 @@ class PFStudyCase:
 		:return (powerfactory.DataObject, res_export_pth):  Handle to PF ComRes function, Full path to exported result
 		"""
 
-		if self.base_case:
-			name = '{}_{}'.format(self.name, constants.Contingencies.intact)
-		else:
-			name = self.name
-
-		res_export_path = os.path.join(self.res_pth, '{}{}{}.csv'.format(res_type, constants.Results.joiner, name))
+		res_export_path = os.path.join(
+			self.res_pth, '{}{}{}.csv'.format(res_type, constants.Results.joiner, self.export_name())
+		)
 
 		c = constants.PowerFactory.ComRes
 		# Create com_res file to deal with extracting the results
@@ -897,6 +1231,7 @@ class PFStudyCase:
 		t1 = time.time()
 		error_code = self.ldf.Execute()
 		t2 = time.time() - t1
+		timing.timings.add(stage='PFStudyCase.run_load_flow', duration=t2, start=t1, name=self.name)
 		if error_code == 0:
 			self.logger.debug('\t - Load Flow calculation {} successful for {}, time taken: {:.2f} seconds'
 						.format(self.ldf, self.name, t2))
@@ -919,19 +1254,12 @@ class PFStudyCase:
 
 		return success
 
-	def create_cases_cmd(self, sc_folder, op_folder, lf_settings=None, fs_settings=None, contingencies_cmd=None):
+	def find_fault_cases(self, contingencies_cmd):
 		"""
-			Function retrieves all of the elements listed in the contingencies command, creates new study cases and
-			runs initial load flow to confirm if they are convergent
-		:param powerfactory.DataObject sc_folder:  Reference to the folder to store temporary study cases in
-		:param powerfactory.DataObject op_folder:  Reference to the folder to store temporary operating scenarios in
-		:param file_io.LFSettings lf_settings:  Settings for load flow
-		:param file_io.FSSettings fs_settings:  Settings for frequency scans
+			Function finds the contingencies command in the study case and returns all of the fault cases it contains
 		:param str contingencies_cmd:  Name of command to use
-		:return list new_cases:  List of all the new cases that have been created
+		:return list fault_cases:  List of the fault cases (empty if the command cannot be found)
 		"""
-		new_cases = list()
-
 		# Find contingency command in study case using a recursive search in case located in a folder
 		cont_cmd = self.sc.GetContents(contingencies_cmd, recursive=1)
 		if len(cont_cmd) == 0:
@@ -941,7 +1269,7 @@ class PFStudyCase:
 					'contingency analysis will be carried out'
 				).format(contingencies_cmd, self.sc)
 			)
-			# Return an empty dictionary
+			# Return an empty list
 			return list()
 
 		elif len(cont_cmd) > 1:
@@ -964,6 +1292,32 @@ class PFStudyCase:
 					'therefore no contingencies will be included for this study case'
 				).format(cont_cmd, self.sc)
 			)
+
+		return fault_cases
+
+	@timing.timed('PFStudyCase.create_cases_cmd', 'name')
+	def create_cases_cmd(
+			self, sc_folder, op_folder, lf_settings=None, fs_settings=None, contingencies_cmd=None, convergence=None, completed=None
+	):
+		"""
+			Function retrieves all of the elements listed in the contingencies command, creates new study cases and
+			runs initial load flow to confirm if they are convergent
+		:param powerfactory.DataObject sc_folder:  Reference to the folder to store temporary study cases in
+		:param powerfactory.DataObject op_folder:  Reference to the folder to store temporary operating scenarios in
+		:param file_io.LFSettings lf_settings:  Settings for load flow
+		:param file_io.FSSettings fs_settings:  Settings for frequency scans
+		:param str contingencies_cmd:  Name of command to use
+		:param dict convergence:  (optional=None) Dictionary of contingency name to whether the load flow is
+			convergent, determined by batch_pre_case_check, if provided cases are only created for the convergent
+			contingencies otherwise a load flow is run for every new case
+		:param set completed:  (optional=None) Names of cases which already have results and so are not created
+		:return list new_cases:  List of all the new cases that have been created
+		"""
+		new_cases = list()
+
+		# Retrieve all fault cases detailed in the contingencies command
+		fault_cases = self.find_fault_cases(contingencies_cmd=contingencies_cmd)
+		if len(fault_cases) == 0:
 			return list()
 
 		# Confirm case is deactivated
@@ -975,6 +1329,17 @@ class PFStudyCase:
 
 			# Create name for new case as combination of provided name and contingency
 			new_name = '{}{}{}'.format(self.name, constants.Results.joiner, cont_name)
+
+			# Cases for which the results have already been produced are not created again
+			if completed and new_name in completed:
+				new_cases.append(self.completed_case(name=new_name, cont_name=cont_name))
+				continue
+
+			# Where the contingency analysis has shown the contingency is non-convergent no copy is needed
+			if convergence is not None and not convergence.get(cont_name, False):
+				new_cases.append(self.non_convergent_case(name=new_name, cont_name=cont_name))
+				continue
+
 			self.logger.info('Creating case and confirming if convergent for contingency:  {}'.format(new_name))
 
 			# Copy the current study_case and operating scenario
@@ -990,7 +1355,8 @@ class PFStudyCase:
 				# Reference is now added to the original source names used for the study cases and operating scenarios
 				sc_source_name=self.sc_source_name,
 				op_source_name=self.op_source_name,
-				prj=self.prj
+				prj=self.prj,
+				element_lookup=self.element_lookup
 			)
 
 			# Adjust the operating scenario to represent the identified outage
@@ -999,8 +1365,8 @@ class PFStudyCase:
 			# Update load flow and frequency sweep commands to reflect relevant locations
 			case.create_studies(lf_settings=lf_settings, fs_settings=fs_settings)
 
-			# Run load flow to confirm if case convergent
-			case.pre_case_check()
+			# Run load flow to confirm if case convergent unless already known from the contingency analysis
+			case.pre_case_check(convergence=convergence)
 
 			# Deactivate case
 			self.toggle_state(deactivate=True)
@@ -1014,7 +1380,81 @@ class PFStudyCase:
 
 		return new_cases
 
-	def create_cases(self, sc_folder, op_folder, lf_settings=None, fs_settings=None, contingencies=None):
+	def non_convergent_case(self, name, cont_name):
+		"""
+			Function returns a case for a contingency which is already known to be non-convergent so that it can be
+			reported in the pre-case check without copying the study case and operating scenario
+		:param str name:  Name that would have been given to the new case
+		:param str cont_name:  Name of contingency
+		:return PFStudyCase case:  Case with no study case or operating scenario which is marked as non-convergent
+		"""
+		self.logger.info(
+			'Contingency {} is non-convergent for study case {} and so no case has been created'.format(
+				cont_name, self.name
+			)
+		)
+		case = PFStudyCase(
+			name=name,
+			cont_name=cont_name,
+			sc=None,
+			op=None,
+			sc_source_name=self.sc_source_name,
+			op_source_name=self.op_source_name,
+			prj=self.prj,
+			element_lookup=self.element_lookup
+		)
+		case.skip = True
+		return case
+
+	def completed_case(self, name, cont_name):
+		"""
+			Function returns a case for a contingency which already has results from a previous run so that it is
+			reported in the pre-case check without copying the study case and operating scenario or running a load
+			flow.  Since results were produced the case must have been convergent.
+		:param str name:  Name that would have been given to the new case
+		:param str cont_name:  Name of contingency
+		:return PFStudyCase case:  Case with no study case or operating scenario which is marked as already run
+		"""
+		self.logger.info('Results already exist for case {} and so it will not be created'.format(name))
+		case = PFStudyCase(
+			name=name,
+			cont_name=cont_name,
+			sc=None,
+			op=None,
+			sc_source_name=self.sc_source_name,
+			op_source_name=self.op_source_name,
+			prj=self.prj,
+			element_lookup=self.element_lookup
+		)
+		case.skip = True
+		case.already_run = True
+		case.ldf_convergent = True
+		return case
+
+	def intact_pre_case_check(self, completed=None, convergence=None):
+		"""
+			Function confirms whether the intact base case is convergent unless its results already exist from a
+			previous run in which case it is marked as already run without running a load flow
+		:param set completed:  (optional=None) Names of cases which already have results
+		:param dict convergence:  (optional=None) Dictionary of contingency name to whether the load flow is
+			convergent from a previous pre-case check
+		:return None:
+		"""
+		if completed and self.export_name() in completed:
+			self.logger.info('Results already exist for intact case {} and so it will not be run again'.format(self.name))
+			self.already_run = True
+			self.ldf_convergent = True
+			return None
+
+		# Run a load flow to update the status flag
+		self.toggle_state()
+		self.pre_case_check(convergence=convergence)
+		return None
+
+	@timing.timed('PFStudyCase.create_cases', 'name')
+	def create_cases(
+			self, sc_folder, op_folder, lf_settings=None, fs_settings=None, contingencies=None, convergence=None, completed=None
+	):
 		"""
 			Function will loop through every contingency and create a new study case setup to reflect that contingency
 			and that will then be stored in the temporary sc and op folders
@@ -1023,6 +1463,10 @@ class PFStudyCase:
 		:param file_io.LFSettings lf_settings:  Settings for load flow
 		:param file_io.FSSettings fs_settings:  Settings for frequency scans
 		:param dict contingencies:  Dictionary of contingencies with elements to consider for this element
+		:param dict convergence:  (optional=None) Dictionary of contingency name to whether the load flow is
+			convergent, determined by batch_pre_case_check, if provided cases are only created for the convergent
+			contingencies otherwise a load flow is run for every new case
+		:param set completed:  (optional=None) Names of cases which already have results and so are not created
 		:return list new_cases:  List of references to the newly created study cases
 		"""
 
@@ -1037,6 +1481,17 @@ class PFStudyCase:
 
 				# Create name for new case as combination of provided name and contingency
 				new_name = '{}{}{}'.format(self.name, constants.Results.joiner, cont_name)
+
+				# Cases for which the results have already been produced are not created again
+				if completed and new_name in completed:
+					new_cases.append(self.completed_case(name=new_name, cont_name=cont_name))
+					continue
+
+				# Where the contingency analysis has shown the contingency is non-convergent no copy is needed
+				if convergence is not None and not convergence.get(cont_name, False):
+					new_cases.append(self.non_convergent_case(name=new_name, cont_name=cont_name))
+					continue
+
 				self.logger.info('Creating case and confirming if convergent for contingency:  {}'.format(new_name))
 
 				# Copy the current study_case and operating scenario
@@ -1052,7 +1507,8 @@ class PFStudyCase:
 					# Reference is now added to the original source names used for the study cases and operating scenarios
 					sc_source_name=self.sc_source_name,
 					op_source_name=self.op_source_name,
-					prj=self.prj
+					prj=self.prj,
+					element_lookup=self.element_lookup
 				)
 
 				# Adjust the operating scenario to represent the identified outage
@@ -1061,8 +1517,8 @@ class PFStudyCase:
 				# Update load flow and frequency sweep commands to reflect relevant locations
 				case.create_studies(lf_settings=lf_settings, fs_settings=fs_settings)
 
-				# Run load flow to confirm if case convergent
-				case.pre_case_check()
+				# Run load flow to confirm if case convergent unless already known from the contingency analysis
+				case.pre_case_check(convergence=convergence)
 
 				# Deactivate case
 				self.toggle_state(deactivate=True)
@@ -1086,16 +1542,11 @@ class PFStudyCase:
 		:param int recursive:  If set to 1 will search recursively (needed for finding lines)
 		:return powerfactory.DataObject element: Reference to the powerfactory substation element
 		"""
-		# Find substation using a recursive search of the network elements folders
+		# Find substation using the index of the network elements folders
 		elements = list()
 		# Loop through each element in list of endings
 		for pf_type in ending:
-			# Check ends with the substation element ending
-			element_name_to_find = '{}.{}'.format(element_name, pf_type)
-
-			for net_item in self.net_data_items:
-				# Loop through each net_item folder and search for element
-				elements.extend(net_item.GetContents(element_name_to_find, recursive))
+			elements.extend(self.element_lookup.find(element_name=element_name, pf_type=pf_type, recursive=recursive))
 
 		# Check that only a single substation is found
 		if len(elements) == 0:
@@ -1163,18 +1614,17 @@ class PFStudyCase:
 
 		return None
 
-	def apply_outage(self, cont_name, cont_item):
+	def find_outage_elements(self, cont_item):
 		"""
-			Function will apply outages to the elements detailed in the contingencies inputs which can be of either a
-			type or a branch
+			Function will find the circuit breakers and lines detailed in the contingencies inputs which can be of
+			either a type or a branch
 
-		:param str cont_name:  Name of contingency being applied
 		:param dict cont_item:  Dictionary of contingency specific to this outage
-		:return None:
+		:return (list, list, bool) (couplers, lines, fault_case_error):  List of tuples in the format (breaker, status)
+			for each circuit breaker, list of lines to switch off and True if any element could not be found
 		"""
-		# Active study case and operating scenario (also ensures these are combined together for a future activation)
-		self.toggle_state()
-
+		couplers = list()
+		lines = list()
 		fault_case_error = False
 
 		# Loop through each contingency and look for relevant elements
@@ -1219,11 +1669,8 @@ class PFStudyCase:
 						)
 						fault_case_error = True
 						break
-					else:
-						breaker = breaker[0]
 
-					# Change the status of the breaker
-					breaker.on_off = coupler.status
+					couplers.append((breaker[0], coupler.status))
 
 			elif cont_type == constants.Contingencies.lines:
 				# Process contingencies that relate to line outages
@@ -1249,20 +1696,44 @@ class PFStudyCase:
 						fault_case_error = True
 						break
 
-					ierr = pf_line.SwitchOff()
-					if ierr == 1:
-						self.logger.error(
-							'Unable to switch off the circuit {} and so the contingency {} will be skipped'.format(
-								line_cont.line, cont.name
-							)
-						)
-						fault_case_error = True
-						break
+					lines.append(pf_line)
+
+		return couplers, lines, fault_case_error
+
+	@timing.timed('PFStudyCase.apply_outage', 'name')
+	def apply_outage(self, cont_name, cont_item):
+		"""
+			Function will apply outages to the elements detailed in the contingencies inputs which can be of either a
+			type or a branch
+
+		:param str cont_name:  Name of contingency being applied
+		:param dict cont_item:  Dictionary of contingency specific to this outage
+		:return None:
+		"""
+		# Active study case and operating scenario (also ensures these are combined together for a future activation)
+		self.toggle_state()
+
+		couplers, lines, fault_case_error = self.find_outage_elements(cont_item=cont_item)
+
+		# Change the status of the breakers
+		for breaker, status in couplers:
+			breaker.on_off = status
+
+		for pf_line in lines:
+			ierr = pf_line.SwitchOff()
+			if ierr == 1:
+				self.logger.error(
+					'Unable to switch off the circuit {} and so the contingency {} will be skipped'.format(
+						pf_line.loc_name, cont_name
+					)
+				)
+				fault_case_error = True
+				break
 
-			# Check if all events added successfully otherwise mark contingency as failed
-			if fault_case_error:
-				self.skip = True
-				self.ldf_convergent = False
+		# Check if all events added successfully otherwise mark contingency as failed
+		if fault_case_error:
+			self.skip = True
+			self.ldf_convergent = False
 
 		# Save operating scenario so that it is remembered in this state and if errors then raise error to user
 		err = self.op.Save()
@@ -1351,6 +1822,10 @@ class PFProject(object):
 		self.net_data = app.GetProjectFolder(constants.PowerFactory.pf_netdata_folder_type)
 		# Get all folders which contain network elements
 		self.net_data_items = self.net_data.GetContents('*.{}'.format(constants.PowerFactory.pf_network_elements))
+		# Index used to find network elements in this project, shared with all of the study cases
+		self.element_lookup = ElementLookup(net_data_items=self.net_data_items)
+		# Types used by the network elements
+		self.type_library = app.GetProjectFolder(constants.PowerFactory.pf_type_library_folder_type)
 
 		# Set to true once temporary folders associated with this project have been deleted
 		self.temp_folders_deleted = False
@@ -1379,9 +1854,15 @@ class PFProject(object):
 
 		# List is populated with all of the cases within this project
 		self.cont_cases = dict()
+		# Convergence of each contingency for each base study case from a pre-case check already carried out in
+		# another process, used instead of repeating the pre-case check
+		self.previous_convergence = dict()
 		# Create the command for the auto tasks associated with this project
 		self.task_auto = self.create_task_auto()
 
+		# Source study case and operating scenario for each of the base cases
+		self.source_objects = dict()
+
 		# Initialise study_cases
 		self.base_sc = self.initialise_study_cases()
 
@@ -1446,7 +1927,8 @@ class PFProject(object):
 				# study case and operating scenario names added so reference can be made to them in the exported results
 				sc_source_name=sc_name, op_source_name=os_name,
 				base_case=True,
-				cont_name=constants.Contingencies.intact
+				cont_name=constants.Contingencies.intact,
+				element_lookup=self.element_lookup
 			)
 
 			# Only need to create the load flow study case and target results files at this point
@@ -1455,6 +1937,7 @@ class PFProject(object):
 
 			self.logger.debug('Duplicated case and associated studies created for intact model with name {}'.format(name))
 			base_study_cases[name] = study_case_class
+			self.source_objects[name] = (pf_sc, pf_os)
 
 		return base_study_cases
 
@@ -1605,6 +2088,8 @@ class PFProject(object):
 		# If a temporary folder then add to list of temporary folders
 		if temp:
 			self.temp_folders.append(new_folder)
+			# Elements may be created in the folder and so the index of the network elements is recreated when needed
+			self.element_lookup.clear()
 			self.logger.debug('Folder: {} added to list of temporary folders for deletion at the end'.format(new_folder))
 
 		return new_folder
@@ -1623,6 +2108,7 @@ class PFProject(object):
 					self.logger.debug('Temporary folder {} deleted'.format(folder))
 				# folder = None
 			self.temp_folders_deleted = True
+			self.element_lookup.clear()
 
 			self.logger.debug('Temporary folders created in project {} have all been deleted'.format(self.prj))
 		else:
@@ -1643,16 +2129,11 @@ class PFProject(object):
 		:param int recursive:  If set to 1 will search recursively (needed for finding lines)
 		:return powerfactory.DataObject element: Reference to the powerfactory substation element
 		"""
-		# Find substation using a recursive search of the network elements folders
+		# Find substation using the index of the network elements folders
 		elements = list()
 		# Loop through each element in list of endings
 		for pf_type in ending:
-			# Check ends with the substation element ending
-			element_name_to_find = '{}.{}'.format(element_name, pf_type)
-
-			for net_item in self.net_data_items:
-				# Loop through each net_item folder and search for element
-				elements.extend(net_item.GetContents(element_name_to_find, recursive))
+			elements.extend(self.element_lookup.find(element_name=element_name, pf_type=pf_type, recursive=recursive))
 
 		# Check that only a single substation is found
 		if len(elements) == 0:
@@ -1671,7 +2152,102 @@ class PFProject(object):
 
 		return element
 
-	def pre_case_check(self, contingencies=None, contingencies_cmd=str(), include_intact=False):
+	def pre_case_fingerprint(self, sc_name, contingencies=None, contingencies_cmd=str()):
+		"""
+			Function returns a fingerprint of everything that determines whether the contingencies for a base study
+			case converge so that it can be used to identify previous results of the pre-case check
+		:param str sc_name:  Name of the base study case
+		:param dict contingencies:  (optional) Dictionary of the outages to be considered
+		:param str contingencies_cmd: (optional) Name of the contingencies command to be used
+		:return str fingerprint:  Fingerprint, None if the time any of the models were last modified is not available
+		"""
+		# The project itself is not included since it is modified by the creation of the temporary folders.  Changes
+		# to an element or type only update the time the element or type was modified and so every element in the
+		# network data folders, the contents of the operating scenario and the type library are included.
+		pf_sc, pf_os = self.source_objects[sc_name]
+		pf_objects = [pf_sc, pf_os] + pf_os.GetContents('*', 1)
+		for net_data_item in self.net_data_items:
+			pf_objects.append(net_data_item)
+			pf_objects.extend(net_data_item.GetContents('*', 1))
+		if self.type_library is not None:
+			pf_objects.extend(self.type_library.GetContents('*', 1))
+
+		if contingencies_cmd:
+			cont_cmd = pf_sc.GetContents(contingencies_cmd, recursive=1)
+			if cont_cmd:
+				pf_objects.append(cont_cmd[0])
+				pf_objects.extend(cont_cmd[0].GetContents('*.{}'.format(constants.PowerFactory.pf_outage)))
+			cont_details = contingencies_cmd
+		else:
+			cont_details = [
+				(
+					cont_name, cont_type, cont.skip,
+					[(x.substation, x.breaker, x.status) for x in cont.couplers],
+					[(x.line, x.status) for x in cont.lines]
+				)
+				for cont_name, cont_item in contingencies.items() for cont_type, cont in cont_item.items()
+			]
+
+		# Time each object was last modified is combined into a single hash rather than stored for every object
+		modified = hashlib.sha1()
+		for name, modified_stamp in sorted(
+				((x.GetFullName(), modified_time(pf_obj=x)) for x in pf_objects), key=lambda x: x[0]
+		):
+			if modified_stamp is None:
+				return None
+			modified.update('{}|{}\n'.format(name, modified_stamp).encode())
+
+		lf_settings = None
+		if self.lf_settings is not None:
+			lf_settings = {
+				key: value for key, value in vars(self.lf_settings).items()
+				if isinstance(value, (bool, int, float, str))
+			}
+
+		values = dict(
+			project=self.name,
+			study_case=pf_sc.loc_name,
+			operating_scenario=pf_os.loc_name,
+			modified=modified.hexdigest(),
+			lf_settings=lf_settings,
+			contingencies=cont_details,
+		)
+		return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+	def cached_convergence(self, cache, sc_name, contingencies=None, contingencies_cmd=str()):
+		"""
+			Function returns the convergence of each contingency from a previous pre-case check if the models and
+			inputs are unchanged
+		:param PreCaseCache cache:  Cache of previous results, None if not being used
+		:param str sc_name:  Name of the base study case
+		:param dict contingencies:  (optional) Dictionary of the outages to be considered
+		:param str contingencies_cmd: (optional) Name of the contingencies command to be used
+		:return (str, dict) (fingerprint, convergence):  Fingerprint and convergence of each contingency, None if not
+			available
+		"""
+		if cache is None:
+			return None, None
+
+		fingerprint = self.pre_case_fingerprint(
+			sc_name=sc_name, contingencies=contingencies, contingencies_cmd=contingencies_cmd
+		)
+		if fingerprint is None:
+			self.logger.debug('Unable to fingerprint study case {} and so the pre-case check cache is not used'.format(
+				sc_name
+			))
+			return None, None
+
+		convergence = cache.get(fingerprint)
+		if convergence is not None:
+			self.logger.info(
+				'Pre-case check for study case {} in project {} is unchanged and so previous results have been used'.format(
+					sc_name, self.name
+				)
+			)
+		return fingerprint, convergence
+
+	@timing.timed('PFProject.pre_case_check', 'name')
+	def pre_case_check(self, contingencies=None, contingencies_cmd=str(), include_intact=False, completed=None):
 		"""
 			Function runs through all of the base study cases and checks which contingencies pass
 			the user is then provided with a dataframe summarising for this project all of the study case
@@ -1681,10 +2257,14 @@ class PFProject(object):
 									created into fault cases
 		:param str contingencies_cmd: (optional) String of the command to be used for contingency analysis
 		:param bool include_intact:  (optional) - Set to True if intact system should be considered
+		:param set completed:  (optional=None) Names of cases which already have results and so are not created
 		:return pd.DataFrame df_status:  Combined DataFrame showing those which are convergent
 		"""
 		c = constants.Contingencies
 
+		# Convergence found by previous pre-case checks
+		cache = PreCaseCache(pth=c.pre_case_cache_file) if c.cache_pre_case else None
+
 		if contingencies_cmd:
 			if contingencies:
 				self.logger.warning('Input provided for both contingencies and contingencies_cmd, '
@@ -1693,11 +2273,17 @@ class PFProject(object):
 			# Loop through all contingencies to create cases
 			for sc_name, sc in self.base_sc.items():  # type: PFStudyCase
 
+				# Convergence from a previous pre-case check is used if nothing has changed since
+				fingerprint, cached = self.cached_convergence(cache=cache, sc_name=sc_name, contingencies_cmd=contingencies_cmd)
+				if cached is None:
+					cached = self.previous_convergence.get(sc_name)
+
 				if include_intact:
 					self.logger.info('Confirming intact study case: {} convergent'.format(sc_name))
 					# Run a load flow to update the status flag and add to the list of contingency cases
-					sc.toggle_state()
-					sc.pre_case_check()
+					sc.intact_pre_case_check(
+						completed=completed, convergence=cached if cached is not None and c.intact in cached else None
+					)
 					cont_cases = [sc]
 				else:
 					# Just produce an empty list
@@ -1713,24 +2299,41 @@ class PFProject(object):
 				# Create cases for all the convergent contingencies associated with this study case and then returns
 				# a list of references to the PFStudyCase class.  The results path is added at this point based on the
 				# location that is either selected by the user or included in the settings
+				# If enabled the convergence of every contingency is determined from a single contingency analysis
+				convergence = cached
+				if convergence is None and c.batch_pre_case:
+					df_status = sc.batch_pre_case_check(contingencies_cmd=contingencies_cmd)
+					if df_status is not None:
+						convergence = dict(zip(df_status[c.cont], df_status[c.status]))
+
 				new_cases = sc.create_cases_cmd(
 					sc_folder=self.sc_folder, op_folder=self.op_folder,
 					lf_settings=self.lf_settings, fs_settings=self.fs_settings,
-					contingencies_cmd=contingencies_cmd
+					contingencies_cmd=contingencies_cmd, convergence=convergence, completed=completed
 				)
 				# Add contingency cases to base study case and to project dictionary
 				sc.cont_cases = cont_cases + new_cases
 				self.cont_cases[sc_name] = cont_cases + new_cases
+
+				# Cache is only updated if every contingency has been checked
+				if fingerprint is not None and not completed:
+					cache.update(fingerprint=fingerprint, cases=cont_cases + new_cases)
 		# Create fault cases if no command provided
 		elif contingencies:
 			# Loop through all contingencies to create cases
 			for sc_name, sc in self.base_sc.items():  # type: str, PFStudyCase
 
+				# Convergence from a previous pre-case check is used if nothing has changed since
+				fingerprint, cached = self.cached_convergence(cache=cache, sc_name=sc_name, contingencies=contingencies)
+				if cached is None:
+					cached = self.previous_convergence.get(sc_name)
+
 				if include_intact:
 					self.logger.info('Confirming intact study case: {} convergent'.format(sc_name))
 					# Run a load flow to update the status flag and add to the list of contingency cases
-					sc.toggle_state()
-					sc.pre_case_check()
+					sc.intact_pre_case_check(
+						completed=completed, convergence=cached if cached is not None and c.intact in cached else None
+					)
 					cont_cases = [sc]
 				else:
 					# Just produce an empty list
@@ -1746,21 +2349,31 @@ class PFProject(object):
 				# Create cases for all the convergent contingencies associated with this study case and then returns
 				# a list of references to the PFStudyCase class.  The results path is added at this point based on the
 				# location that is either selected by the user or included in the settings
+				# If enabled the convergence of every contingency is determined from a single contingency analysis
+				convergence = cached
+				if convergence is None and c.batch_pre_case:
+					df_status = sc.batch_pre_case_check(contingencies=contingencies)
+					if df_status is not None:
+						convergence = dict(zip(df_status[c.cont], df_status[c.status]))
+
 				new_cases = sc.create_cases(
 					sc_folder=self.sc_folder, op_folder=self.op_folder,
 					lf_settings=self.lf_settings, fs_settings=self.fs_settings,
-					contingencies=contingencies
+					contingencies=contingencies, convergence=convergence, completed=completed
 				)
 				# Add contingency cases to base study case and to project dictionary
 				sc.cont_cases = cont_cases + new_cases
 				self.cont_cases[sc_name] = cont_cases + new_cases
+
+				# Cache is only updated if every contingency has been checked
+				if fingerprint is not None and not completed:
+					cache.update(fingerprint=fingerprint, cases=cont_cases + new_cases)
 		elif include_intact:
 			# Loop through all contingencies to create cases
 			for sc_name, sc in self.base_sc.items():  # type: str, PFStudyCase
 				if include_intact:
 					# Run a load flow to update the status flag and add to the list of contingency cases
-					sc.toggle_state()
-					sc.pre_case_check()
+					sc.intact_pre_case_check(completed=completed)
 					cont_cases = [sc]
 				else:
 					# Just produce an empty list
@@ -1786,21 +2399,29 @@ class PFProject(object):
 		# Loop through each of the base study cases, create the cases and run a load flow to confirm if convergent.
 		dfs = dict()
 		for sc_name, cont_cases in self.cont_cases.items():  # type: str,list
-			df = pd.DataFrame()
+			# Details for each contingency are collected and then converted into a DataFrame in a single step, if the
+			# same contingency name appears more than once the last one is used
+			records = collections.OrderedDict()
 			for cont in cont_cases:  # type: PFStudyCase
 				cont_name = cont.cont_name
 				self.logger.debug(
 					'For ({}, {}, {}) carrying out pre-case check of contingencies'.format(self.prj, sc.sc, sc.op)
 				)
 				# Populate DataFrame with results
-				df.loc[cont_name, c.cont] = cont.cont_name
-				df.loc[cont_name, c.status] = cont.ldf_convergent
-				df.loc[cont_name, c.prj] = self.name
-				df.loc[cont_name, c.sc] = cont.sc.loc_name
-				df.loc[cont_name, c.op] = cont.op.loc_name
+				# Cases that were not created because they are non-convergent are reported with the name they would
+				# have been given
+				if cont.sc is None:
+					sc_name_case, op_name_case = cont.name, cont.name
+				else:
+					sc_name_case, op_name_case = cont.sc.loc_name, cont.op.loc_name
+				records[cont_name] = (
+					cont.cont_name, cont.ldf_convergent, cont.already_run, self.name, sc_name_case, op_name_case
+				)
 
 			# Add to dictionary
-			dfs[sc_name] = df
+			dfs[sc_name] = pd.DataFrame.from_dict(
+				records, orient='index', columns=(c.cont, c.status, c.already_run, c.prj, c.sc, c.op)
+			)
 
 		# Get a dictionary of all of the study_case DataFrames so they can be combined to the project
 		# level
@@ -1813,8 +2434,24 @@ class PFProject(object):
 		# Assign the pre_case_check dataframe for this project
 		self.df_pre_case = df
 
+		if cache is not None:
+			cache.save()
+
 		return df
 
+	def pre_case_convergence(self):
+		"""
+			Function returns the convergence of each contingency found by the pre-case check so that it can be
+			passed to another process rather than the pre-case check being repeated
+		:return dict convergence:  Dictionary of base study case name to a dictionary of contingency name to whether
+			the load flow is convergent, empty if the pre-case check has not been run
+		"""
+		return {
+			sc_name: {case.cont_name: bool(case.ldf_convergent) for case in cases}
+			for sc_name, cases in self.cont_cases.items()
+		}
+
+	@timing.timed('PFProject.create_cases', 'name')
 	def create_cases(self, study_settings, terminals=None, contingencies=None, contingencies_cmd=str()):
 		"""
 			Function adjusted so that cases are now created as part of the pre_case_check and that is used to
@@ -1826,18 +2463,6 @@ class PFProject(object):
 		:param str contingencies_cmd: (optional) String of the command to be used for contingency analysis
 		:return None:
 		"""
-		# If pre_case_check has not yet been run then run now
-		if self.df_pre_case.empty:
-			self.logger.debug('Running pre-case check')
-			_ = self.pre_case_check(contingencies=contingencies, contingencies_cmd=contingencies_cmd,
-									include_intact=study_settings.include_intact)
-
-		# Check terminals have been defined otherwise do that now
-		if not self.terminals:
-			_ = self.find_terminals(terminals_to_include=terminals, include_mutual=study_settings.export_mutual)
-
-		df_convergent = self.df_pre_case[self.df_pre_case[constants.Contingencies.status]==True]
-
 		# Check that the target folder for the results to be saved in has been provided, if not then use the default
 		# folder.  Also check the folder exists and if not then create it
 		if not study_settings.export_folder:
@@ -1856,6 +2481,23 @@ class PFProject(object):
 				).format(study_settings.export_folder)
 			)
 
+		# If resuming a previous study then cases which already have results are not created or run again
+		completed = set()
+		if constants.Results.resume_studies:
+			completed = find_completed_results(pth=study_settings.export_folder, fs_settings=self.fs_settings)
+
+		# If pre_case_check has not yet been run then run now
+		if self.df_pre_case.empty:
+			self.logger.debug('Running pre-case check')
+			_ = self.pre_case_check(contingencies=contingencies, contingencies_cmd=contingencies_cmd,
+									include_intact=study_settings.include_intact, completed=completed)
+
+		# Check terminals have been defined otherwise do that now
+		if not self.terminals:
+			_ = self.find_terminals(terminals_to_include=terminals, include_mutual=study_settings.export_mutual)
+
+		df_convergent = self.df_pre_case[self.df_pre_case[constants.Contingencies.status]==True]
+
 		# Check if the intact case should be included and then if so add to cases
 		self.cases_to_run = list()
 
@@ -1877,6 +2519,8 @@ class PFProject(object):
 
 		else:
 			for sc_name, cases in self.cont_cases.items():  # type: str, list
+				# Cases which already have results are not run again
+				cases = [x for x in cases if x.export_name() not in completed]
 				for cont_case in cases:  # type: PFStudyCase
 					if cont_case.ldf_convergent:
 						self.logger.info('Preparing case: {}'.format(cont_case.name))
@@ -1918,6 +2562,7 @@ class PFProject(object):
 
 		return task_auto
 
+	@timing.timed('PFProject.find_terminals', 'name')
 	def find_terminals(self, terminals_to_include, include_mutual=False):
 		"""
 			Function finds all the terminals in the active project and returns details of those
@@ -1928,14 +2573,10 @@ class PFProject(object):
 		"""
 		self.logger.debug('Checking for relevant terminals in project:  {}'.format(self.prj))
 
-		# Empty DataFrame which will be populated with the status of this terminal for this project
+		# Details of each terminal are collected and then converted into a DataFrame of the status of each terminal
+		# for this project in a single step
 		c = constants.Terminals
-		# For some unknown reason when running from PowerFactory doesn't like to initialise an empty DataFrame with
-		# preset columns and therefore need to create empty DataFrame and subsequently assign the columns
-		# df = pd.DataFrame(columns=c.columns)
-		df = pd.DataFrame()
-		# df.columns = c.columns
-		df[c.status] = False
+		records = collections.OrderedDict()
 
 		# Confirm project is active
 		# TODO: What happens if try to find a terminal that exists in project but not study case
@@ -1951,12 +2592,6 @@ class PFProject(object):
 					'Looking for terminal {}, associated with substation {} and busbar {} in project {}'
 				).format(term_name, terminal.substation, terminal.terminal, self.prj)
 			)
-			# Populate DataFrame with details for this terminal
-			df.loc[term_name, c.name] = terminal.name
-			df.loc[term_name, c.sub1] = terminal.substation
-			df.loc[term_name, c.bus1] = terminal.terminal
-			df.loc[term_name, c.include_mutual] = terminal.include_mutual
-
 			# Find substation which contains this terminal
 			pf_sub = self.find_element(element_name=terminal.substation)
 
@@ -2009,8 +2644,12 @@ class PFProject(object):
 					# Create reference to terminal and then add to dictionary
 					self.terminals[term_name] = new_term_object
 
-			# Update terminals dictionary and DataFrame of status
-			df.loc[term_name, c.status] = found
+			# Populate details for this terminal
+			records[term_name] = (found, terminal.name, terminal.substation, terminal.terminal, terminal.include_mutual)
+
+		df = pd.DataFrame.from_dict(
+			records, orient='index', columns=(c.status, c.name, c.sub1, c.bus1, c.include_mutual)
+		)
 
 		# All terminals have been added so print list of terminals which couldn't be found as warning to user
 		missing_terms = df[df[c.status]==True].index
@@ -2035,6 +2674,7 @@ class PFProject(object):
 		# Returns DataFrame with details of terminals that have been found and those which are missing
 		return df
 
+	@timing.timed('PFProject.create_mutual_impedance', 'name')
 	def create_mutual_impedance(self, df):
 		"""
 			Based on the terminals that have been found within the project the mutual impedance elements are
@@ -2083,6 +2723,8 @@ class PFProject(object):
 			# Reset mutual elements dictionary which is populated for each mutual element created in the form
 			# of having the name (term1_term2) and then the reference to the powerfactory DataObject that is created
 			self.mutuals = dict()
+			# Details of each mutual element which are added to the DataFrame once all have been created
+			records = collections.OrderedDict()
 
 			# Loop through all terminals that have already been found
 			for name, term in self.terminals.items():
@@ -2094,15 +2736,11 @@ class PFProject(object):
 						if other_name != name:
 							planned_name, used_name = create_mutual_name(term1=name, term2=other_name)
 
-							# Update dataframe
-							df.loc[used_name, c.name] = used_name
-							df.loc[used_name, c.sub1] = term.substation
-							df.loc[used_name, c.bus1] = term.terminal
-							df.loc[used_name, c.include_mutual] = term.include_mutual
-							df.loc[used_name, c.planned_name] = planned_name
-							df.loc[used_name, c.sub2] = other_term.substation
-							df.loc[used_name, c.bus2] = other_term.terminal
-							df.loc[used_name, c.status] = True
+							# Details for the dataframe
+							records[used_name] = (
+								True, used_name, term.substation, term.terminal, term.include_mutual,
+								planned_name, other_term.substation, other_term.terminal
+							)
 
 							# Create mutual element in the mutual folder
 							elmmut = create_mutual_elm(
@@ -2120,9 +2758,17 @@ class PFProject(object):
 								)
 							)
 
+			# Add the mutual elements to the DataFrame of terminals
+			df_mutual = pd.DataFrame.from_dict(
+				records, orient='index',
+				columns=(c.status, c.name, c.sub1, c.bus1, c.include_mutual, c.planned_name, c.sub2, c.bus2)
+			)
+			df = pd.concat([df, df_mutual], axis=0, sort=False)
+
 		# Return updated DataFrame with mutual elements
 		return df
 
+	@timing.timed('PFProject.run_parallel_tasks', 'name')
 	def run_parallel_tasks(self):
 		"""
 			Function to run parallel tasks and then detects if an error has occurred.
@@ -2189,6 +2835,13 @@ class PowerFactory:
 			Function retrieves the relevant python paths, adds them and then imports the powerfactory module
 			Importing of the powerfactory module has to happen here due to the location
 		"""
+		global powerfactory
+		# When the mock engine is selected the stand-in module is used and no installation is needed
+		if self.c.mock_engine:
+			import pscharmonics.pf_mock as powerfactory
+			self.logger.debug('Mock PowerFactory engine <{}> imported in place of powerfactory'.format(powerfactory))
+			return None
+
 		self.logger.debug('Searching of paths to PowerFactory and adding the Python search path')
 		# Get the python paths if not already populated
 		if not (self.c.dig_path and self.c.dig_python_path):
@@ -2209,7 +2862,6 @@ class PowerFactory:
 		# Try and import the powerfactory module
 		try:
 			self.logger.debug('Importing the powerfactory module')
-			global powerfactory
 			import powerfactory
 			self.logger.debug('Imported successfully')
 		except ImportError:
@@ -2234,17 +2886,20 @@ class PowerFactory:
 		# Check if already running from PowerFactory and if so then update to use that power factory version
 
 		# Check the paths have already been found and if not call the relevant function
-		if not (self.c.dig_path and self.c.dig_python_path):
+		if self.c.mock_engine:
+			self.add_python_paths()
+		elif not (self.c.dig_path and self.c.dig_python_path):
 			# Initialise so that the paths are looked for with the provided pf_version
 			pf_version = self.c.select_power_factory_version(pf_version=pf_version)
 			self.add_python_paths()
 
 		# Different APIs exist for different PowerFactory versions, if an old version is run then different
 		# initialisation route.  When initialising need to warn user that old version is being used
-		global app
+		global app, selected_version
 		# Only initialise PowerFactory if not already initialised
 		if app is None:
 			self.logger.info('Initialising PowerFactory version {}'.format(pf_version))
+			selected_version = pf_version
 			if distutils.version.StrictVersion(powerfactory.__version__) > distutils.version.StrictVersion('17.0.0'):
 				# Error sometimes in getting access to a license which returns certain error codes and therefore
 				# script will now make a few attempts for those cases
@@ -2601,7 +3256,7 @@ def create_pf_project_instances(df_study_cases, uid=constants.uid, lf_settings=N
 def run_pre_case_checks(
 		pf_projects, terminals, include_mutual=False, export_pth=str(),
 		contingencies=None, contingencies_cmd=str(),
-		include_intact=False
+		include_intact=False, completed=None
 
 ):
 	"""
@@ -2617,6 +3272,8 @@ def run_pre_case_checks(
 									created into fault cases
 	:param str contingencies_cmd: (optional) String of the command to be used for contingency analysis
 	:param bool include_intact: (optional) Where to include intact contingencies
+	:param set completed:  (optional=None) Names of cases which already have results from a previous run, these are
+		not created or checked again and are reported as already run
 	:return pd.DataFrame df_case_check: DataFrame showing contingencies which are convergent
 	"""
 	logger = constants.logger
@@ -2633,7 +3290,8 @@ def run_pre_case_checks(
 		# Obtain contingency analysis results for all relevant cases in this project
 		logger.info('For project {}, running a check on all of the contingencies'.format(project_name))
 		df_cont = prj.pre_case_check(
-			contingencies=contingencies, contingencies_cmd=contingencies_cmd, include_intact=include_intact
+			contingencies=contingencies, contingencies_cmd=contingencies_cmd, include_intact=include_intact,
+			completed=completed
 		)
 		dfs_cont.append(df_cont)
 
@@ -2691,57 +3349,295 @@ def run_pre_case_checks(
 	# Return the summary DataFrame
 	return df_case_check_cont, df_case_check_term
 
-def run_studies(pf_projects, inputs):
+def find_completed_results(pth, fs_settings=None):
 	"""
-		Function runs the studies to create the cases and run all studies based on
-		the provided dictionary of projects and input settings
-	:param dict pf_projects:  Dictionary of projects for which all studies will be run
+		Function finds the frequency scan results files in the folder which are complete so that the cases they
+		relate to do not need to be run again.  A file is complete if it contains the number of frequencies expected
+		from the frequency sweep settings, or if this cannot be determined then at least one frequency.
+	:param str pth:  Folder containing the exported results
+	:param file_io.FSSettings fs_settings:  (optional=None) Settings for the frequency sweep
+	:return set completed:  Names of the cases with complete results as used by PFStudyCase.export_name
+	"""
+	logger = constants.logger
+	leader = '{}{}'.format(constants.Results.study_fs, constants.Results.joiner)
+
+	# Number of frequencies can only be determined if a fixed step size has been used
+	expected_rows = None
+	if (
+			fs_settings is not None and not fs_settings.settings_error and not fs_settings.i_adapt and
+			fs_settings.fstep > 0
+	):
+		expected_rows = int(round((fs_settings.fstop - fs_settings.fstart) / fs_settings.fstep)) + 1
+
+	completed = set()
+	for pth_file in glob.glob(os.path.join(pth, '{}*.csv'.format(leader))):
+		# First two rows of the export contain the element names and variables
+		with open(pth_file, 'r') as f:
+			rows = sum(1 for _ in f) - 2
+
+		name = os.path.splitext(os.path.basename(pth_file))[0][len(leader):]
+		if rows > 0 and (expected_rows is None or rows == expected_rows):
+			completed.add(name)
+		else:
+			logger.warning(
+				(
+					'The results file {} contains {} frequencies rather than the expected {} and so the case will be '
+					'run again'
+				).format(pth_file, rows, expected_rows if expected_rows is not None else 'at least 1')
+			)
+
+	logger.info('{} complete results files found in the folder {}'.format(len(completed), pth))
+	return completed
+
+def run_project(project, inputs):
+	"""
+		Function creates the cases for a single project and then runs all of the studies
+	:param PFProject project:  Project for which all studies will be run
 	:param file_io.StudyInputs inputs:  Input settings
-	:return None
+	:return list results:  Full paths to the results files exported for this project
 	"""
 	t0 = time.time()
 	logger = constants.logger
-	# Instruct saving of the inputs folder to the desired results folder
-	inputs.copy_inputs_file()
-
 
-	# Iterate through each project and create the various cases, the includes running a pre-case check but no
-	# output is saved at this point
-	for project_name, project in pf_projects.items():  # type: str, PFProject
-		logger.info('Studies being run for project {}:\t{}'.format(project_name, project.prj))
-		project.create_cases(
-			study_settings=inputs.settings,
-			terminals=inputs.terminals,
-			contingencies=inputs.contingencies,
-			contingencies_cmd=inputs.contingency_cmd
-		)
+	logger.info('Studies being run for project {}:\t{}'.format(project.name, project.prj))
+	project.create_cases(
+		study_settings=inputs.settings,
+		terminals=inputs.terminals,
+		contingencies=inputs.contingencies,
+		contingencies_cmd=inputs.contingency_cmd
+	)
 
-		logger.debug('Cases created for project: {}:\t{}'.format(project_name, project.prj))
+	logger.debug('Cases created for project: {}:\t{}'.format(project.name, project.prj))
 
+	if project.cases_to_run:
 		# Update the auto executable for this project
 		project.update_auto_exec()
 
 		# Batch run the results
-		logger.info('Running of studies associated with project {} started'.format(project_name))
+		logger.info('Running of studies associated with project {} started'.format(project.name))
 		project.run_parallel_tasks()
-		t1 = time.time()
 		logger.info('Running of studies associated with project {} completed in {:.0f} seconds'.format(
-			project_name, t1-t0)
+			project.name, time.time()-t0)
 		)
+	else:
+		logger.info('There are no studies to run for project {}'.format(project.name))
 
-		# Delete temporary folders created for this project
-		if inputs.settings.delete_created_folders:
-			project.delete_temp_folders()
-		else:
-			logger.info(
+	# Delete temporary folders created for this project
+	if inputs.settings.delete_created_folders:
+		project.delete_temp_folders()
+	else:
+		logger.info(
+			(
+				'As per user inputs, temporary folders associated with project {} have not been deleted and so will '
+				'need tidying within PowerFactory directly'
+			).format(project.name)
+		)
+
+	timing.timings.add(stage='run_project', duration=time.time() - t0, start=t0, name=project.name)
+	return [pth for case in project.cases_to_run for pth in case.fs_result_exports]
+
+def worker_settings():
+	"""
+		Returns the current values of the settings in constants.PowerFactory.worker_settings so that they can be passed
+		to a worker process, worker processes which are spawned rather than forked import constants again and so any
+		settings changed at runtime would otherwise be lost
+	:return dict settings:  Setting as <class name>.<attribute> with the current value
+	"""
+	settings = dict()
+	for setting in constants.PowerFactory.worker_settings:
+		cls_name, attr = setting.split('.')
+		settings[setting] = getattr(getattr(constants, cls_name), attr)
+	return settings
+
+def apply_worker_settings(settings):
+	"""
+		Applies the settings returned by worker_settings to the constants in this process
+	:param dict settings:  Setting as <class name>.<attribute> with the value to set
+	:return None:
+	"""
+	for setting, value in settings.items():
+		cls_name, attr = setting.split('.')
+		setattr(getattr(constants, cls_name), attr, value)
+	return None
+
+def run_project_worker(project_name, inputs, uid, pf_version=None, settings=None, convergence=None):
+	"""
+		Function is run in a worker process to initialise a separate PowerFactory engine and run all of the studies
+		for a single project.  The log messages are collected and returned rather than written to file so that they
+		can be included in the log files of the main process.
+	:param str project_name:  Name of the project to run studies for
+	:param file_io.StudyInputs inputs:  Input settings
+	:param str uid:  Unique identifier for this study
+	:param str pf_version:  (optional=None) PowerFactory version to initialise
+	:param dict settings:  (optional=None) Settings from the main process as returned by worker_settings
+	:param dict convergence:  (optional=None) Convergence of each contingency from a pre-case check already carried
+		out by the main process as returned by PFProject.pre_case_convergence
+	:return dict summary:  Summary of the project run including the results files and the log messages
+	"""
+	global app
+	t0 = time.time()
+
+	# Logger for this process is created with the messages collected for the main process rather than being written
+	# to the log files
+	handler = logging.handlers.BufferingHandler(capacity=sys.maxsize)
+	handler.setLevel(logging.DEBUG)
+	constants.logger = pscharmonics.logger.Logger(handlers=[handler])
+	logger = constants.logger
+
+	constants.uid = uid
+	if settings:
+		apply_worker_settings(settings=settings)
+
+	# Only the timings for this project are returned to the main process
+	timing.timings.clear()
+
+	results = list()
+	success = False
+	try:
+		if constants.PowerFactory.mock_engine:
+			# The mock database only exists in the process that created it and so is populated from the inputs
+			import pscharmonics.pf_mock as pf_mock
+			app = None
+			pf_mock.reset()
+			pf_mock.create_project_from_inputs(inputs=inputs)
+
+		pf = PowerFactory()
+		pf.initialise_power_factory(pf_version=pf_version)
+
+		df = inputs.cases[inputs.cases[constants.StudySettings.project] == project_name]
+		pf_projects = create_pf_project_instances(
+			df_study_cases=df, uid=uid, lf_settings=inputs.lf_settings, fs_settings=inputs.fs_settings
+		)
+		if project_name in pf_projects:
+			if convergence:
+				logger.debug('Pre-case check results from the main process used for project {}'.format(project_name))
+				pf_projects[project_name].previous_convergence = convergence
+			results = run_project(project=pf_projects[project_name], inputs=inputs)
+			success = True
+			pf.deactivate_project()
+	except Exception:
+		logger.error(
+			'Running of studies for project {} failed with the exception:\n{}'.format(project_name, traceback.format_exc())
+		)
+
+	summary = dict(
+		project=project_name,
+		success=success,
+		results=results,
+		run_time=time.time() - t0,
+		logs=[(record.levelno, record.getMessage()) for record in handler.buffer],
+		timings=timing.timings.records,
+	)
+	return summary
+
+def run_studies(pf_projects, inputs):
+	"""
+		Function runs the studies to create the cases and run all studies based on
+		the provided dictionary of projects and input settings.  If constants.PowerFactory.max_engines allows, the
+		projects are run at the same time with each project in a separate worker process with its own engine.
+	:param dict pf_projects:  Dictionary of projects for which all studies will be run
+	:param file_io.StudyInputs inputs:  Input settings
+	:return dict results:  Dictionary of project name to the full paths of the exported results files
+	"""
+	t0 = time.time()
+	logger = constants.logger
+	# Instruct saving of the inputs folder to the desired results folder
+	inputs.copy_inputs_file()
+
+	workers = constants.PowerFactory.max_engines
+	if workers == 0:
+		workers = len(pf_projects)
+	workers = min(workers, len(pf_projects))
+
+	# Worker processes need a Python interpreter to be started with
+	if workers > 1:
+		executable = worker_executable()
+		if executable is None:
+			logger.warning(
 				(
-					'As per user inputs, temporary folders associated with project {} have not been deleted and so will '
-					'need tidying within PowerFactory directly'
-				).format(project_name)
+					'Unable to find the Python interpreter used by PowerFactory and so the studies for each project '
+					'will be run one after the other rather than in separate engines'
+				)
 			)
+			workers = 1
+		else:
+			multiprocessing.set_executable(executable)
+
+	results = dict()
+	if workers > 1:
+		# Projects are released by this engine so that they can be activated by the worker engines, the temporary
+		# folders are recreated by each worker but the results of any pre-case check already carried out are used
+		convergence = dict()
+		for project_name, project in pf_projects.items():  # type: str, PFProject
+			convergence[project_name] = project.pre_case_convergence()
+			project.delete_temp_folders()
+		PowerFactory().deactivate_project()
+
+		# The PowerFactory version and any settings changed at runtime are passed explicitly since they are not
+		# inherited by spawned worker processes
+		settings = worker_settings()
+		pf_version = selected_version or running_in_powerfactory()
+
+		logger.info('Studies for {} projects being run using {} PowerFactory engines'.format(len(pf_projects), workers))
+		with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+			futures = [
+				executor.submit(
+					run_project_worker, project_name=project_name, inputs=inputs, uid=constants.uid,
+					pf_version=pf_version, settings=settings, convergence=convergence[project_name]
+				)
+				for project_name in pf_projects.keys()
+			]
 
-	return None
+			# Log messages from each worker are added to the log files as each project is completed
+			for future in concurrent.futures.as_completed(futures):
+				summary = future.result()
+				for level, msg in summary['logs']:
+					logger.log(level=level, msg='{}: {}'.format(summary['project'], msg))
+
+				timing.timings.extend(records=summary['timings'])
 
+				if summary['success']:
+					results[summary['project']] = summary['results']
+					logger.info('Studies for project {} completed in {:.0f} seconds'.format(
+						summary['project'], summary['run_time'])
+					)
+				else:
+					logger.error('Studies for project {} could not be completed'.format(summary['project']))
+
+	else:
+		# Iterate through each project and create the various cases, the includes running a pre-case check but no
+		# output is saved at this point
+		for project_name, project in pf_projects.items():  # type: str, PFProject
+			results[project_name] = run_project(project=project, inputs=inputs)
+
+	run_time = time.time() - t0
+	timing.timings.add(stage='run_studies', duration=run_time, start=t0, projects=len(pf_projects), engines=workers)
+	logger.info('Running of studies for all projects completed in {:.0f} seconds'.format(run_time))
+
+	# Report of where the time has been spent is saved with the results
+	if constants.Results.timing_report:
+		timing.timings.write_report(
+			pth=os.path.join(inputs.settings.export_folder, constants.Results.timing_file_name)
+		)
+
+	return results
+
+
+def worker_executable():
+	"""
+		Returns the Python interpreter to start worker processes with.  When running from within PowerFactory
+		sys.executable is PowerFactory itself and so starting worker processes with it would start new instances of
+		PowerFactory, instead the interpreter for the Python installation loaded by PowerFactory is used.
+	:return str pth:  Full path to the Python interpreter, None if it cannot be found
+	"""
+	if os.path.basename(sys.executable).lower().startswith('python'):
+		return sys.executable
+
+	for folder in (sys.exec_prefix, getattr(sys, 'base_exec_prefix', sys.exec_prefix)):
+		pth = os.path.join(folder, 'python.exe')
+		if os.path.isfile(pth):
+			return pth
+	return None
 
 def running_in_powerfactory():
 	"""
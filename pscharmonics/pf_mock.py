@@ -0,0 +1,867 @@
+"""
+#######################################################################################################################
+###													pf_mock.py														###
+###		In-process stand-in for the DIgSILENT powerfactory module.  It provides a small database of DataObjects,	###
+###		the commands used by pf.py and results files that export in the same CSV layout as PowerFactory so that		###
+###		the complete study pipeline can be run and benchmarked without a PowerFactory installation or license.		###
+###																													###
+#######################################################################################################################
+"""
+
+import copy
+import csv
+import fnmatch
+import itertools
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+
+import pscharmonics.constants as constants
+
+# Version of the powerfactory module being replicated, must be later than 17.0.0 so the engine mode API is used
+__version__ = '20.0.0'
+
+# Single application instance returned by GetApplication / GetApplicationExt, the database is retained for as long
+# as this exists
+_app = None
+
+# Time each object was last modified (tstamp) is taken from this so that it increases with every modification even
+# if several are made within the same second
+_modified_times = itertools.count(int(time.time()))
+
+
+class ExitError(Exception):
+	""" Equivalent of the error raised by powerfactory when it is not possible to start the application """
+	def __init__(self, code, msg=str()):
+		"""
+		:param int code:  Error code returned by PowerFactory
+		:param str msg:  Error message
+		"""
+		super(ExitError, self).__init__(msg)
+		self.code = code
+
+
+def GetApplicationExt(*args):
+	"""
+		Returns the mock application, creating it if it does not already exist
+	:return Application _app:
+	"""
+	global _app
+	if _app is None:
+		_app = Application()
+	return _app
+
+
+def GetApplication():
+	""" Older API for obtaining a handle to the application """
+	return GetApplicationExt()
+
+
+def reset():
+	"""
+		Deletes the mock application and therefore all of the projects that have been created in it
+	:return None:
+	"""
+	global _app
+	_app = None
+	return None
+
+
+def latency(pfclass):
+	"""
+		Waits for the time configured in constants.PowerFactory to represent PowerFactory running a command
+	:param str pfclass:  PowerFactory class of the command being executed
+	:return None:
+	"""
+	c = constants.PowerFactory
+	delay = c.mock_latency_by_class.get(pfclass, c.mock_latency)
+	if delay > 0:
+		time.sleep(delay)
+	return None
+
+
+def nonconvergent(name, leader=str()):
+	"""
+		Whether the load flow for the contingency provided should be reported as non-convergent based on the names
+		configured in constants.PowerFactory.mock_nonconvergent
+	:param str name:  Name of the fault case or study case
+	:param str leader:  (optional) Pattern that must come before the contingency name
+	:return bool nonconvergent:
+	"""
+	return any(fnmatch.fnmatchcase(name, '{}{}'.format(leader, x)) for x in constants.PowerFactory.mock_nonconvergent)
+
+
+def name_matches(obj, pattern):
+	"""
+		Replicates the name matching of GetContents, the pattern is compared against both the full name
+		(loc_name.class) and just the loc_name and can include the wildcards * and ?
+	:param DataObject obj:  Object to compare
+	:param str pattern:  Pattern to match
+	:return bool match:
+	"""
+	full_name = '{}.{}'.format(obj.loc_name, obj.GetClassName())
+	return fnmatch.fnmatchcase(full_name, pattern) or fnmatch.fnmatchcase(obj.loc_name, pattern)
+
+
+def new_object(pfclass, name, parent=None):
+	"""
+		Creates a new object of the relevant mock class for the PowerFactory class provided
+	:param str pfclass:  PowerFactory class name, i.e. ElmTerm
+	:param str name:  Name to give the new object
+	:param DataObject parent:  (optional=None) Location for new object
+	:return DataObject obj:
+	"""
+	obj = pf_classes.get(pfclass, DataObject)(loc_name=name, pfclass=pfclass)
+	if parent is not None:
+		obj._parent = parent
+		parent._children.append(obj)
+	return obj
+
+
+class DataObject(object):
+	""" Object within the PowerFactory database, the attributes are stored directly on the instance """
+	# Attributes populated for every new object of this class
+	defaults = dict()
+
+	def __init__(self, loc_name, pfclass):
+		"""
+		:param str loc_name:  Name of object
+		:param str pfclass:  PowerFactory class name
+		"""
+		self._pfclass = pfclass
+		self._parent = None
+		self._children = list()
+		self.loc_name = loc_name
+		self.outserv = 0
+		self.tstamp = next(_modified_times)
+
+		for key, value in self.defaults.items():
+			setattr(self, key, copy.copy(value))
+
+	def __setattr__(self, key, value):
+		"""
+			Sets the attribute and updates the time the object was last modified.  As in PowerFactory, changes to the
+			network elements whilst an operating scenario is active are recorded by the operating scenario rather than
+			the element.
+		:param str key:  Name of attribute
+		:param value:  Value to set
+		"""
+		object.__setattr__(self, key, value)
+		if key.startswith('_') or key == 'tstamp':
+			return
+
+		modified = self
+		if _app is not None and _app.active_scenario is not None and self.in_network_data():
+			modified = _app.active_scenario
+		object.__setattr__(modified, 'tstamp', next(_modified_times))
+
+	def in_network_data(self):
+		"""
+			Whether this object is contained within a grid (ElmNet)
+		:return bool in_network_data:
+		"""
+		obj = self._parent
+		while obj is not None:
+			if obj.GetClassName() == constants.PowerFactory.pf_network_elements:
+				return True
+			obj = obj._parent
+		return False
+
+	def __str__(self):
+		return self.GetFullName()
+
+	def __repr__(self):
+		return '<{} {}>'.format(self.__class__.__name__, self.GetFullName())
+
+	def GetClassName(self):
+		return self._pfclass
+
+	def GetParent(self):
+		return self._parent
+
+	def GetFullName(self, type=0):
+		"""
+			Full path to the object in the database (type is accepted for compatibility but ignored)
+		:return str full_name:
+		"""
+		names = list()
+		obj = self
+		while obj is not None:
+			names.append('{}.{}'.format(obj.loc_name, obj.GetClassName()))
+			obj = obj._parent
+		return '\\{}'.format('\\'.join(reversed(names)))
+
+	def GetContents(self, name='*', recursive=0):
+		"""
+			Returns all the objects contained within this object that match the name provided
+		:param str name:  (optional='*') Name to match which can include wildcards and a relative path
+		:param int recursive:  (optional=0) If set to 1 (True) then all sub-folders are searched
+		:return list contents:
+		"""
+		# Relative paths (Set\Def\Settings.SetUser) are resolved one level at a time
+		if '\\' in name:
+			parts = name.split('\\')
+			locations = [self]
+			for part in parts[:-1]:
+				locations = [child for location in locations for child in location._children if name_matches(child, part)]
+			return [x for location in locations for x in location.GetContents(parts[-1], recursive)]
+
+		contents = list()
+		for child in self._children:
+			if name_matches(child, name):
+				contents.append(child)
+			if recursive:
+				contents.extend(child.GetContents(name, recursive))
+		return contents
+
+	def CreateObject(self, pfclass, name):
+		"""
+			Creates a new object in this location
+		:param str pfclass:  PowerFactory class of new object
+		:param str name:  Name to give new object
+		:return DataObject obj:
+		"""
+		return new_object(pfclass=pfclass, name=name, parent=self)
+
+	def AddCopy(self, obj, name=None):
+		"""
+			Copies the object and all of its contents into this location.  References between objects within the copy
+			are updated to refer to the new objects as they would be by PowerFactory
+		:param DataObject obj:  Object to be copied
+		:param str name:  (optional=None) Name to give the copy
+		:return DataObject new_obj:
+		"""
+		name = obj.loc_name if name is None else name
+
+		# Avoid name clashes in the same way as PowerFactory by appending (i)
+		existing = set(x.loc_name for x in self._children if x.GetClassName() == obj.GetClassName())
+		new_name = name
+		i = 1
+		while new_name in existing:
+			new_name = '{}({})'.format(name, i)
+			i += 1
+
+		memo = dict()
+		new_obj = obj._clone(parent=self, memo=memo)
+		new_obj._remap(memo=memo)
+		new_obj.loc_name = new_name
+		self._children.append(new_obj)
+		return new_obj
+
+	def _clone(self, parent, memo):
+		"""
+			Returns a copy of this object and its contents with memo updated to map the original objects to the copies
+		:param DataObject parent:  Location of the copy
+		:param dict memo:  Dictionary of id(original) to copy
+		:return DataObject new_obj:
+		"""
+		new_obj = copy.copy(self)
+		memo[id(self)] = new_obj
+		for key, value in vars(self).items():
+			if isinstance(value, (list, dict, np.ndarray)):
+				setattr(new_obj, key, copy.copy(value))
+		new_obj._parent = parent
+		new_obj._children = [child._clone(parent=new_obj, memo=memo) for child in self._children]
+		return new_obj
+
+	def _remap(self, memo):
+		"""
+			Updates references to any objects that have been copied so they refer to the copies
+		:param dict memo:  Dictionary of id(original) to copy
+		:return None:
+		"""
+		def lookup(value):
+			if isinstance(value, DataObject):
+				return memo.get(id(value), value)
+			elif isinstance(value, tuple):
+				return tuple(lookup(x) for x in value)
+			return value
+
+		for key, value in vars(self).items():
+			if key in ('_parent', '_children'):
+				continue
+			elif isinstance(value, list):
+				setattr(self, key, [lookup(x) for x in value])
+			else:
+				setattr(self, key, lookup(value))
+
+		for child in self._children:
+			child._remap(memo=memo)
+		return None
+
+	def Delete(self):
+		""" Removes the object from the database """
+		if self._parent is not None:
+			self._parent._children.remove(self)
+			self._parent = None
+		return 0
+
+	def Move(self, obj):
+		"""
+			Moves the object provided into this location
+		:param DataObject obj:  Object to move
+		:return int error:
+		"""
+		if obj._parent is not None:
+			obj._parent._children.remove(obj)
+		obj._parent = self
+		self._children.append(obj)
+		return 0
+
+	def SetAttribute(self, name, value):
+		# Attributes can be provided with the type prefix, i.e. e:g_file
+		setattr(self, name.split(':')[-1], value)
+		return None
+
+	def GetAttribute(self, name):
+		return getattr(self, name.split(':')[-1])
+
+	def Activate(self):
+		return 0
+
+	def Deactivate(self):
+		return 0
+
+	def Save(self):
+		return 0
+
+	def SwitchOff(self):
+		self.outserv = 1
+		return 0
+
+	def Execute(self):
+		"""
+			Runs the command after waiting for the configured latency
+		:return int error:  0 if successful
+		"""
+		latency(pfclass=self.GetClassName())
+		return self.run()
+
+	def run(self):
+		""" Behaviour of the command when executed, overridden by each command """
+		return 0
+
+	def study_case(self):
+		"""
+			Returns the study case that this object is contained within
+		:return IntCase case:
+		"""
+		obj = self._parent
+		while obj is not None and obj.GetClassName() != constants.PowerFactory.pf_case:
+			obj = obj._parent
+		return obj
+
+
+class IntCase(DataObject):
+	""" Study case """
+	def Activate(self):
+		app = GetApplicationExt()
+		if app.active_case is not None and app.active_case is not self:
+			app.active_case.Deactivate()
+		app.active_case = self
+		return 0
+
+	def Deactivate(self):
+		app = GetApplicationExt()
+		if app.active_case is self:
+			app.active_case = None
+			# The operating scenario is deactivated with the study case
+			app.active_scenario = None
+		return 0
+
+
+class IntScenario(DataObject):
+	""" Operating scenario """
+	def Activate(self):
+		GetApplicationExt().active_scenario = self
+		return 0
+
+	def Deactivate(self):
+		app = GetApplicationExt()
+		if app.active_scenario is self:
+			app.active_scenario = None
+		return 0
+
+
+class IntPrj(DataObject):
+	""" Project """
+	def Activate(self):
+		app = GetApplicationExt()
+		if app.active_project is not None and app.active_project is not self:
+			app.active_project.Deactivate()
+		app.active_project = self
+		return 0
+
+	def Deactivate(self):
+		app = GetApplicationExt()
+		if app.active_project is self:
+			if app.active_case is not None:
+				app.active_case.Deactivate()
+			app.active_project = None
+		return 0
+
+
+class ComLdf(DataObject):
+	""" Load flow which converges unless the study case has been created for a non-convergent contingency """
+	def run(self):
+		case = self.study_case()
+		# Contingency study cases are named <base case><joiner><contingency>
+		if case is not None and nonconvergent(name=case.loc_name, leader='*{}'.format(constants.Results.joiner)):
+			return 1
+		return 0
+
+
+class ComFsweep(DataObject):
+	""" Frequency sweep which calculates the impedances for all the variables in the results file """
+	defaults = dict(iopt_net=0, fstart=50.0, fstop=2500.0, fstep=5.0, frnom=50.0, p_resvar=None, c_butldf=None)
+
+	def run(self):
+		if self.p_resvar is None:
+			return 1
+		frequencies = np.arange(float(self.fstart), float(self.fstop) + float(self.fstep) / 2.0, float(self.fstep))
+		self.p_resvar.sweep(frequencies=frequencies, frnom=float(self.frnom))
+		return 0
+
+
+class ComRes(DataObject):
+	""" Results export, only exporting to CSV (iopt_exp = 6) is replicated """
+	defaults = dict(pResult=None, f_name=str(), iopt_exp=6)
+
+	def run(self):
+		if self.pResult is None or not self.f_name:
+			return 1
+		self.pResult.export(pth=self.f_name)
+		return 0
+
+
+class ComTasks(DataObject):
+	""" Task automation command which runs the commands associated with each study case in turn """
+	defaults = dict(iEnableParal=1, study_cases=list(), commands=list())
+
+	def AppendStudyCase(self, sc):
+		if sc not in self.study_cases:
+			self.study_cases.append(sc)
+		return 0
+
+	def AppendCommand(self, cmd, level=0):
+		self.commands.append(cmd)
+		return 0
+
+	def run(self):
+		for sc in self.study_cases:
+			sc.Activate()
+			for cmd in [x for x in self.commands if x.study_case() is sc]:
+				error = cmd.Execute()
+				if error:
+					return error
+			sc.Deactivate()
+		return 0
+
+
+class ComOutage(DataObject):
+	""" Fault case contained within a contingency analysis command """
+	defaults = dict(number=0, Couplers=list(), CouplersClose=list(), Elms=list(), Nodes=list())
+
+
+class ComSimoutage(DataObject):
+	"""
+		Contingency analysis which writes the fault case number and non-convergence flag for each fault case it
+		contains to the results file
+	"""
+	defaults = dict(p_res=None, iEnableParal=0)
+
+	def run(self):
+		if self.p_res is None:
+			return 1
+		c = constants.Contingencies
+		rows = [
+			(fault_case.number, int(nonconvergent(name=fault_case.loc_name)))
+			for fault_case in self.GetContents('*.{}'.format(constants.PowerFactory.pf_outage))
+		]
+		# PowerFactory includes a final row for the base case
+		rows.append((c.intact_cont_num, 0))
+
+		self.p_res.variables = [(self, c.col_number), (self, c.col_nonconvergent)]
+		self.p_res.values = np.array(rows, dtype=float)
+		self.p_res.frequencies = np.arange(len(rows), dtype=float)
+		return 0
+
+
+class IntUser(DataObject):
+	""" User with the license details that are checked """
+	defaults = dict(harm=1)
+
+
+class ElmTerm(DataObject):
+	""" Terminal """
+	defaults = dict(uknom=132.0)
+
+
+class ElmRes(DataObject):
+	""" Results file which stores the results of a frequency sweep for each variable that has been added """
+	defaults = dict(calTp=0, calTpSub=0, variables=list(), frequencies=None, frnom=50.0, values=None)
+
+	# Units used for the variable descriptions in the exported results
+	units = {constants.PowerFactory.pf_nom_voltage: 'kV'}
+	default_unit = 'Ohm'
+
+	def AddVariable(self, element, var):
+		if (element, var) not in self.variables:
+			self.variables.append((element, var))
+		return 0
+
+	def Load(self):
+		return 0
+
+	def Release(self):
+		return 0
+
+	def GetNumberOfColumns(self):
+		# Last column is the frequency scale
+		return len(self.variables) + 1 if self.values is not None else 0
+
+	def GetNumberOfRows(self):
+		return len(self.frequencies) if self.frequencies is not None else 0
+
+	def GetObject(self, col):
+		return self.variables[col][0] if col < len(self.variables) else self
+
+	def GetVariable(self, col):
+		return self.variables[col][1] if col < len(self.variables) else 'b:fnow'
+
+	def GetValue(self, row, col):
+		if col < len(self.variables):
+			return 0, self.values[row, col]
+		return 0, self.frequencies[row]
+
+	def GetColumnValues(self, values, col):
+		# Matches ElmRes.GetColumnValues which fills the provided list and returns an error code
+		if col > len(self.variables):
+			return 1
+		if col < len(self.variables):
+			values.extend(self.values[:, col].tolist())
+		else:
+			values.extend(self.frequencies.tolist())
+		return 0
+
+	def sweep(self, frequencies, frnom):
+		"""
+			Populates the results for every variable at the frequencies provided
+		:param np.ndarray frequencies:  Frequencies in Hz
+		:param float frnom:  Nominal frequency in Hz
+		:return None:
+		"""
+		h = frequencies / frnom
+		case = self.study_case()
+		case_name = case.loc_name if case is not None else str()
+
+		impedances = dict()
+		values = np.zeros((len(h), len(self.variables)))
+		for col, (element, var) in enumerate(self.variables):
+			if var == constants.PowerFactory.pf_nom_voltage:
+				values[:, col] = element.uknom
+				continue
+
+			if id(element) not in impedances:
+				impedances[id(element)] = element_impedance(element=element, h=h, case_name=case_name)
+			z = impedances[id(element)]
+
+			if var in (constants.PowerFactory.pf_z1, constants.PowerFactory.pf_z12):
+				values[:, col] = np.abs(z)
+			elif var in (constants.PowerFactory.pf_r1, constants.PowerFactory.pf_r12):
+				values[:, col] = z.real
+			elif var in (constants.PowerFactory.pf_x1, constants.PowerFactory.pf_x12):
+				values[:, col] = z.imag
+
+		self.frequencies = frequencies
+		self.frnom = frnom
+		self.values = values
+		return None
+
+	def export(self, pth):
+		"""
+			Writes the results to a CSV file in the same layout as a PowerFactory ComRes export, the first row contains
+			the object names, the second the variable descriptions and the harmonic order and frequency are the first
+			and last columns
+		:param str pth:  Full path to CSV file
+		:return None:
+		"""
+		variables = self.variables if self.values is not None else list()
+		objects = [self.GetFullName()] + [x.GetFullName() for x, _ in variables] + [self.GetFullName()]
+		descriptions = (
+			[constants.PowerFactory.pf_harm] +
+			['{} in {}'.format(var, self.units.get(var, self.default_unit)) for _, var in variables] +
+			[constants.PowerFactory.pf_freq]
+		)
+
+		if self.values is None:
+			data = np.zeros((0, 2))
+		else:
+			data = np.column_stack((self.frequencies / self.frnom, self.values, self.frequencies))
+
+		with open(pth, 'w', newline='') as f:
+			writer = csv.writer(f)
+			writer.writerow(objects)
+			writer.writerow(descriptions)
+			np.savetxt(f, data, fmt='%f', delimiter=',')
+		return None
+
+
+def element_impedance(element, h, case_name):
+	"""
+		Synthetic impedance seen at a terminal (or between two terminals for a mutual element) for the harmonic orders
+		provided.  The source impedance is in parallel with the network capacitance and a tuned filter so that there
+		are parallel and series resonances.  The values are repeatable for a terminal with the resonances shifted
+		slightly for each study case so that each contingency produces a different result.
+	:param DataObject element:  Terminal or mutual impedance element
+	:param np.ndarray h:  Harmonic orders
+	:param str case_name:  Name of study case
+	:return np.ndarray z:  Complex impedance in Ohms
+	"""
+	if element.GetClassName() == constants.PowerFactory.pf_mutual:
+		z1 = element_impedance(element=element.bus1, h=h, case_name=case_name)
+		z2 = element_impedance(element=element.bus2, h=h, case_name=case_name)
+		coupling = np.random.RandomState(zlib.crc32(element.loc_name.encode())).uniform(0.05, 0.6)
+		return coupling * np.sqrt(z1 * z2)
+
+	seed = zlib.crc32(element.GetFullName().encode())
+	rs = np.random.RandomState(seed)
+	shift = 1.0 + 0.1 * np.random.RandomState(seed ^ zlib.crc32(case_name.encode())).uniform(-1.0, 1.0)
+
+	# Source impedance based on the fault level at the terminal
+	x1 = float(element.uknom) ** 2 / rs.uniform(500.0, 5000.0)
+	r1 = x1 / rs.uniform(5.0, 20.0)
+	z_source = r1 * np.sqrt(h) + 1j * x1 * h
+
+	# Network capacitance (parallel resonance) and a damped shunt filter (series resonance)
+	h_parallel = rs.uniform(3.0, 25.0) * shift
+	h_series = rs.uniform(2.5, 15.0) * shift
+	y_network = 1j * h / (x1 * h_parallel ** 2) + 1.0 / (x1 * rs.uniform(20.0, 100.0))
+	x_filter = x1 * rs.uniform(2.0, 10.0)
+	z_filter = x_filter / rs.uniform(10.0, 50.0) + 1j * x_filter * (h - h_series ** 2 / h)
+
+	return 1.0 / (1.0 / z_source + y_network + 1.0 / z_filter)
+
+
+class Application(object):
+	""" Replicates the parts of the PowerFactory application used by pf.py """
+	def __init__(self):
+		self.user = new_object(pfclass='IntUser', name='mock_user')
+		self.active_project = None
+		self.active_case = None
+		self.active_scenario = None
+
+		# User default settings checked when changing the parallel processing settings
+		settings_folder = self.user.CreateObject(constants.PowerFactory.pf_folder_type, 'Set')
+		settings_folder = settings_folder.CreateObject(constants.PowerFactory.pf_folder_type, 'Def')
+		settings = settings_folder.CreateObject('SetUser', 'Settings')
+		settings.procTimeOut = constants.PowerFactory.parallel_time_out
+
+	def GetCurrentUser(self):
+		return self.user
+
+	def ActivateProject(self, name):
+		"""
+			Activates the project
+		:param str name:  Name of project which may include a path
+		:return int error:  0 if successful, 1 if the project cannot be found
+		"""
+		name = name.split('\\')[-1]
+		if not name.endswith(constants.PowerFactory.pf_project):
+			name = '{}.{}'.format(name, constants.PowerFactory.pf_project)
+		prj = self.user.GetContents(name)
+		if len(prj) == 0:
+			return 1
+		return prj[0].Activate()
+
+	def GetActiveProject(self):
+		return self.active_project
+
+	def GetActiveStudyCase(self):
+		return self.active_case
+
+	def GetActiveScenario(self):
+		return self.active_scenario
+
+	def GetProjectFolder(self, folder_type):
+		"""
+			Returns the project folder of the type provided for the active project
+		:param str folder_type:  Type of folder, i.e. netdat, study, scen
+		:return DataObject folder:
+		"""
+		if self.active_project is None:
+			return None
+		for folder in self.active_project.GetContents('*.IntPrjfolder', 1):
+			if folder.iopt_typ == folder_type:
+				return folder
+		return None
+
+	def GetCalcRelevantObjects(self, name='*'):
+		net_data = self.GetProjectFolder(constants.PowerFactory.pf_netdata_folder_type)
+		return net_data.GetContents(name, 1) if net_data is not None else list()
+
+	def GetInterfaceVersion(self):
+		# 0 is returned when PowerFactory is started from an external Python session
+		return 0
+
+	def GetInstallationDirectory(self):
+		return os.path.dirname(os.path.abspath(__file__))
+
+	# Messages are written to the log files by the logger and so the output window is not replicated
+	def PrintPlain(self, msg):
+		return None
+
+	def PrintInfo(self, msg):
+		return None
+
+	def PrintWarn(self, msg):
+		return None
+
+	def PrintError(self, msg):
+		return None
+
+	def ClearOutputWindow(self):
+		return None
+
+	def SetGraphicUpdate(self, value):
+		return None
+
+	def EchoOff(self):
+		return None
+
+	def EchoOn(self):
+		return None
+
+
+# Mock classes with specific behaviour, all other PowerFactory classes are created as a plain DataObject
+pf_classes = {
+	'IntCase': IntCase,
+	'IntScenario': IntScenario,
+	'IntPrj': IntPrj,
+	'IntUser': IntUser,
+	'ElmTerm': ElmTerm,
+	'ElmRes': ElmRes,
+	'ComLdf': ComLdf,
+	'ComFsweep': ComFsweep,
+	'ComRes': ComRes,
+	'ComTasks': ComTasks,
+	'ComOutage': ComOutage,
+	'ComSimoutage': ComSimoutage,
+}
+
+
+def get_or_create(location, pfclass, name):
+	"""
+		Returns the object with this name in the location, creating it if it does not already exist
+	:param DataObject location:
+	:param str pfclass:
+	:param str name:
+	:return DataObject obj:
+	"""
+	existing = location.GetContents('{}.{}'.format(name, pfclass))
+	if existing:
+		return existing[0]
+	return location.CreateObject(pfclass, name)
+
+
+def create_project(name):
+	"""
+		Creates a new project for the current user with the standard project folders and a single grid
+	:param str name:  Name of project
+	:return DataObject prj:
+	"""
+	app = GetApplicationExt()
+	name = name.replace('.{}'.format(constants.PowerFactory.pf_project), '')
+
+	prj = get_or_create(location=app.user, pfclass=constants.PowerFactory.pf_project, name=name)
+	folders = (
+		('Network Model', 'netmod', prj),
+		('Network Data', constants.PowerFactory.pf_netdata_folder_type, 'Network Model'),
+		('Study Cases', constants.PowerFactory.pf_sc_folder_type, prj),
+		('Operation Scenarios', constants.PowerFactory.pf_os_folder_type, prj),
+		('Library', 'lib', prj),
+		('Equipment Type Library', constants.PowerFactory.pf_type_library_folder_type, 'Library'),
+	)
+	created = dict()
+	for folder_name, folder_type, location in folders:
+		location = created.get(location, location)
+		folder = get_or_create(location=location, pfclass='IntPrjfolder', name=folder_name)
+		folder.iopt_typ = folder_type
+		created[folder_name] = folder
+
+	get_or_create(location=created['Network Data'], pfclass=constants.PowerFactory.pf_network_elements, name='Grid')
+	return prj
+
+
+def create_project_from_inputs(inputs):
+	"""
+		Populates the mock application with projects containing all of the study cases, operating scenarios,
+		terminals, breakers, lines and commands referred to in the inputs so that the study can be run
+	:param pscharmonics.file_io.StudyInputs inputs:  Settings imported from the inputs workbook
+	:return dict projects:  Dictionary of project name to project
+	"""
+	c = constants.PowerFactory
+	projects = dict()
+	for prj_name, df in inputs.cases.groupby(by=constants.StudySettings.project):
+		prj = create_project(name=prj_name)
+		projects[prj_name] = prj
+		prj.Activate()
+		app = GetApplicationExt()
+
+		# Network elements, nominal voltage of the terminals is taken from the substation name if it includes one
+		grid = app.GetProjectFolder(c.pf_netdata_folder_type).GetContents('*.{}'.format(c.pf_network_elements))[0]
+		for terminal in inputs.terminals.values():
+			substation = get_or_create(location=grid, pfclass=c.pf_substation, name=terminal.substation)
+			term = get_or_create(location=substation, pfclass=c.pf_terminal, name=terminal.terminal)
+			voltage = re.search(r'(\d+)\s*KV', terminal.substation, re.IGNORECASE)
+			if voltage:
+				term.uknom = float(voltage.group(1))
+
+		outages = dict()
+		for cont_name, cont_item in inputs.contingencies.items():
+			elements = list()
+			for cont in cont_item.values():
+				for coupler in cont.couplers:
+					substation = get_or_create(location=grid, pfclass=c.pf_substation, name=coupler.substation)
+					elements.append(get_or_create(location=substation, pfclass=c.pf_coupler, name=coupler.breaker))
+				for line in cont.lines:
+					elements.append(get_or_create(location=grid, pfclass=c.pf_line, name=line.line))
+			outages[cont_name] = elements
+
+		# Study cases with default commands and any commands referred to in the inputs
+		sc_folder = app.GetProjectFolder(c.pf_sc_folder_type)
+		op_folder = app.GetProjectFolder(c.pf_os_folder_type)
+		for sc_name, op_name in zip(df[constants.StudySettings.studycase], df[constants.StudySettings.scenario]):
+			sc = get_or_create(location=sc_folder, pfclass=c.pf_case, name=sc_name.replace('.{}'.format(c.pf_case), ''))
+			get_or_create(location=op_folder, pfclass=c.pf_scenario, name=op_name.replace('.{}'.format(c.pf_scenario), ''))
+
+			get_or_create(location=sc, pfclass=c.ldf_command, name='Load Flow Calculation')
+			get_or_create(location=sc, pfclass=c.fs_command, name='Frequency Sweep')
+			for settings, pfclass in ((inputs.lf_settings, c.ldf_command), (inputs.fs_settings, c.fs_command)):
+				if settings is not None and settings.cmd:
+					get_or_create(location=sc, pfclass=pfclass, name=settings.cmd.replace('.{}'.format(pfclass), ''))
+
+			# Existing frequency sweeps are given the same frequency range as the inputs so that the results from
+			# every case can be combined
+			fs_settings = inputs.fs_settings
+			if fs_settings is not None and not fs_settings.settings_error:
+				for fs in sc.GetContents('*.{}'.format(c.fs_command)):
+					for attr in ('frnom', 'fstart', 'fstop', 'fstep'):
+						setattr(fs, attr, getattr(fs_settings, attr))
+
+			if inputs.contingency_cmd:
+				cont_cmd = get_or_create(
+					location=sc, pfclass=c.pf_cont_analysis,
+					name=inputs.contingency_cmd.replace('.{}'.format(c.pf_cont_analysis), '')
+				)
+				for cont_name, elements in outages.items():
+					fault_case = get_or_create(location=cont_cmd, pfclass=c.pf_outage, name=cont_name)
+					fault_case.Couplers = [x for x in elements if x.GetClassName() == c.pf_coupler]
+					fault_case.Elms = [x for x in elements if x.GetClassName() != c.pf_coupler]
+
+		prj.Deactivate()
+
+	return projects
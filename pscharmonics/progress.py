@@ -0,0 +1,140 @@
+"""
+#######################################################################################################################
+###													progress.py														###
+###		Reports the progress of the long running stages of the results processing as events detailing the number	###
+###		of items completed, the rate they are being completed and the estimated time remaining so that they can		###
+###		be displayed by the logger, the GUI or any other listener													###
+###																													###
+#######################################################################################################################
+"""
+import collections
+import contextlib
+import time
+
+import pscharmonics.constants as constants
+
+# Names of the stages which report progress
+stage_ingest = 'Importing results files'
+stage_combine = 'Combining results folders'
+stage_hull = 'Calculating convex hulls'
+stage_export = 'Exporting nodes'
+
+# Details of the progress of a stage
+#	stage:  Name of the stage
+#	done:  Number of items completed
+#	total:  Total number of items
+#	item:  Name of the item just completed
+#	elapsed:  Time in seconds since the stage started
+#	rate:  Items completed per second
+#	eta:  Estimated time in seconds until the stage is completed, None until the rate is known
+ProgressEvent = collections.namedtuple('ProgressEvent', ('stage', 'done', 'total', 'item', 'elapsed', 'rate', 'eta'))
+
+# Functions called with every ProgressEvent, in addition to the logger
+listeners = list()
+
+
+def add_listener(callback):
+	"""
+		Adds a function to be called with every progress event
+	:param callback:  Function which takes a single ProgressEvent as an input
+	:return None:
+	"""
+	if callback not in listeners:
+		listeners.append(callback)
+	return None
+
+
+def remove_listener(callback):
+	"""
+		Removes a function that was added with add_listener
+	:param callback:  Function to remove
+	:return None:
+	"""
+	if callback in listeners:
+		listeners.remove(callback)
+	return None
+
+
+@contextlib.contextmanager
+def listening(callback):
+	"""
+		Context manager which adds the listener for the code within it, if callback is None then nothing is added
+	:param callback:  Function which takes a single ProgressEvent as an input
+	"""
+	if callback is not None:
+		add_listener(callback)
+	try:
+		yield
+	finally:
+		if callback is not None:
+			remove_listener(callback)
+
+
+class Progress:
+	"""
+		Tracks the progress of a single stage and sends a ProgressEvent to the listeners each time items are
+		completed.  The logger is sent an event for every item if log_each is True, otherwise only every
+		constants.General.progress_log_interval seconds and when the stage is completed.
+	"""
+	def __init__(self, stage, total, log_each=True):
+		"""
+		:param str stage:  Name of the stage
+		:param int total:  Total number of items in the stage
+		:param bool log_each:  (optional=True) If False then the logger is only sent events periodically
+		"""
+		self.stage = stage
+		self.total = total
+		self.log_each = log_each
+		self.done = 0
+		self.t0 = time.perf_counter()
+		self.last_logged = self.t0
+
+		# Listeners are informed the stage has started
+		self.emit(event=self.event(item=str()), log=False)
+
+	def event(self, item):
+		"""
+			Produces the event for the current progress
+		:param str item:  Name of the item just completed
+		:return ProgressEvent event:
+		"""
+		elapsed = time.perf_counter() - self.t0
+		rate = self.done / elapsed if elapsed > 0 else 0.0
+		eta = (self.total - self.done) / rate if rate > 0 else None
+		return ProgressEvent(
+			stage=self.stage, done=self.done, total=self.total, item=str(item), elapsed=elapsed, rate=rate, eta=eta
+		)
+
+	def update(self, item=str(), count=1):
+		"""
+			Records that items have been completed and sends the event to the listeners
+		:param str item:  (optional) Name of the item completed
+		:param int count:  (optional=1) Number of items completed
+		:return ProgressEvent event:
+		"""
+		self.done += count
+		event = self.event(item=item)
+
+		# Events are only logged periodically for stages with a large number of items
+		log = self.log_each or self.done >= self.total
+		if not log and event.elapsed - (self.last_logged - self.t0) >= constants.General.progress_log_interval:
+			log = True
+		if log:
+			self.last_logged = self.t0 + event.elapsed
+
+		self.emit(event=event, log=log)
+		return event
+
+	@staticmethod
+	def emit(event, log=True):
+		"""
+			Sends the event to the logger and each of the listeners
+		:param ProgressEvent event:  Event to send
+		:param bool log:  (optional=True) If False then the event is not sent to the logger
+		:return None:
+		"""
+		if log and constants.logger is not None:
+			constants.logger.progress(event)
+		for callback in list(listeners):
+			callback(event)
+		return None
@@ -0,0 +1,164 @@
+"""
+#######################################################################################################################
+###													timing.py														###
+###		Records the time taken by each stage of the studies and results processing so that a report detailing		###
+###		where the time is spent can be written alongside the results												###
+###																													###
+#######################################################################################################################
+"""
+import contextlib
+import functools
+import json
+import os
+import time
+
+import pandas as pd
+
+import pscharmonics.constants as constants
+
+# Labels used for each timing record
+lbl_stage = 'stage'
+lbl_parent = 'parent'
+lbl_start = 'start'
+lbl_duration = 'duration'
+lbl_pid = 'pid'
+
+
+class Timings:
+	"""
+		Time taken by each stage, each stage is timed using the span context manager and any additional details
+		(i.e. project or study case name) are included with the record
+	"""
+	def __init__(self):
+		self.records = list()
+		# Stages that are currently running so that each record references the stage it is part of
+		self.stack = list()
+
+	@contextlib.contextmanager
+	def span(self, stage, **details):
+		"""
+			Context manager which records the time taken for the code within it
+		:param str stage:  Name of the stage being timed
+		:param details:  Any additional details to include in the record, converted to strings
+		"""
+		parent = self.stack[-1] if self.stack else str()
+		self.stack.append(stage)
+		start = time.time()
+		t0 = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.stack.pop()
+			self.add(stage=stage, duration=time.perf_counter() - t0, start=start, parent=parent, **details)
+
+	def add(self, stage, duration, start=None, parent=str(), **details):
+		"""
+			Adds a record for a stage which has been timed separately
+		:param str stage:  Name of the stage
+		:param float duration:  Time taken in seconds
+		:param float start:  (optional=None) Time the stage started, if None then assumed to have just finished
+		:param str parent:  (optional) Name of the stage this is part of
+		:param details:  Any additional details to include in the record
+		:return None:
+		"""
+		if start is None:
+			start = time.time() - duration
+
+		record = {
+			lbl_stage: stage,
+			lbl_parent: parent,
+			lbl_start: start,
+			lbl_duration: duration,
+			lbl_pid: os.getpid(),
+		}
+		record.update({key: str(value) for key, value in details.items()})
+		self.records.append(record)
+		return None
+
+	def extend(self, records):
+		"""
+			Adds the records returned from a worker process
+		:param list records:  List of records from Timings.records
+		:return None:
+		"""
+		self.records.extend(records)
+		return None
+
+	def clear(self):
+		"""
+			Removes all existing records
+		:return None:
+		"""
+		self.records = list()
+		self.stack = list()
+		return None
+
+	def to_dataframe(self):
+		"""
+			Returns the records as a DataFrame with a row for each record in the order they were completed
+		:return pd.DataFrame df:
+		"""
+		if not self.records:
+			return pd.DataFrame(columns=[lbl_stage, lbl_parent, lbl_start, lbl_duration, lbl_pid])
+		return pd.DataFrame(self.records)
+
+	def summary(self):
+		"""
+			Summary of the time taken for each stage.  Since stages can be part of other stages (i.e. apply_outage
+			is part of create_cases) the totals of different stages should not be added together.
+		:return pd.DataFrame df_summary:  DataFrame indexed by stage with the count, total, mean and max duration
+		"""
+		df = self.to_dataframe()
+		df_summary = df.groupby(lbl_stage, sort=False)[lbl_duration].agg(['count', 'sum', 'mean', 'max'])
+		df_summary.columns = ['count', 'total', 'mean', 'max']
+		return df_summary
+
+	def write_report(self, pth):
+		"""
+			Writes the records to a CSV file and a summary plus the records to a JSON file
+		:param str pth:  Full path to the report without an extension, .json and .csv will be added
+		:return (str, str) pth_json, pth_csv:  Paths to the files written, or None if they could not be written
+		"""
+		logger = constants.logger
+
+		pth_json = '{}.json'.format(pth)
+		pth_csv = '{}.csv'.format(pth)
+
+		report = dict(
+			uid=constants.uid,
+			created=time.strftime('%Y-%m-%d %H:%M:%S'),
+			summary=json.loads(self.summary().to_json(orient='index')),
+			records=self.records,
+		)
+
+		try:
+			with open(pth_json, 'w') as f:
+				json.dump(report, f, indent=2)
+			self.to_dataframe().to_csv(pth_csv, index=False)
+		except OSError:
+			logger.warning('Unable to write the timing report to {}'.format(pth))
+			return None, None
+
+		logger.info('Timing report written to {}'.format(pth_json))
+		return pth_json, pth_csv
+
+
+def timed(stage, *attributes):
+	"""
+		Decorator for methods which records the time taken each time the method is called
+	:param str stage:  Name of the stage being timed
+	:param attributes:  Names of the attributes of the instance to include in the record (i.e. name)
+	:return function decorator:
+	"""
+	def decorator(func):
+		@functools.wraps(func)
+		def wrapper(self, *args, **kwargs):
+			details = {attr: getattr(self, attr, str()) for attr in attributes}
+			with timings.span(stage, **details):
+				return func(self, *args, **kwargs)
+		return wrapper
+	return decorator
+
+
+# Single instance used for recording all of the timings in this process
+timings = Timings()
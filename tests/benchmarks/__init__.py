@@ -0,0 +1,7 @@
+"""
+#######################################################################################################################
+###											Initialisation															###
+###		Benchmarks for the processing of the results exported from PowerFactory, see benchmark_results.py			###
+###																													###
+#######################################################################################################################
+"""
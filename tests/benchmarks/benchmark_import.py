@@ -0,0 +1,150 @@
+"""
+#######################################################################################################################
+###												benchmark_import.py													###
+###		Times how long it takes to import pscharmonics for each of the entry points, each import is run in a new	###
+###		Python process so that nothing has already been imported, and writes a JSON report that can be compared	###
+###		against a previous report to identify any regressions in the start up time.								###
+###																													###
+###		Run from the repository folder:																				###
+###			python -m tests.benchmarks.benchmark_import --output report.json										###
+###			python -m tests.benchmarks.benchmark_import --baseline report.json										###
+###																													###
+#######################################################################################################################
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from tests.benchmarks.benchmark_results import summarise, compare, DEFAULT_TOLERANCE
+
+# Version of the report format, increased if the layout of the report changes
+REPORT_VERSION = 1
+
+# Folder containing the pscharmonics package
+PACKAGE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Statements timed for each entry point, batch is everything loaded by PSC_Harmonics_Batch.py before the inputs are
+# imported and gui is everything loaded by PSC_Harmonics_GUI.py before the window is displayed
+STAGES = {
+	'import_package': 'import pscharmonics',
+	'batch': 'import pscharmonics; pscharmonics.batch_mode; pscharmonics.pf',
+	'gui': 'import pscharmonics; pscharmonics.gui',
+}
+
+# Dependencies that are reported if they have been loaded by an entry point
+DEPENDENCIES = ('pandas', 'numpy', 'shapely', 'xlsxwriter', 'tkinter', 'PIL')
+
+# Code run in the new process which prints the time taken and the dependencies loaded
+CHILD_CODE = '''
+import json, sys, time
+sys.path.insert(0, {folder!r})
+t0 = time.perf_counter()
+{statement}
+duration = time.perf_counter() - t0
+print(json.dumps(dict(duration=duration, loaded=[x for x in {dependencies!r} if x in sys.modules])))
+'''
+
+
+def time_import(statement, repeats):
+	"""
+		Times the statement in a new Python process for the number of repeats provided
+	:param str statement:  Import statement to time
+	:param int repeats:  Number of times to run the statement
+	:return (list, list) times, loaded:  Time in seconds for each repeat and the dependencies loaded by the statement
+	"""
+	code = CHILD_CODE.format(folder=PACKAGE_FOLDER, statement=statement.replace('; ', '\n'), dependencies=DEPENDENCIES)
+	times = list()
+	loaded = list()
+	for _ in range(repeats):
+		output = subprocess.run(
+			[sys.executable, '-c', code], cwd=PACKAGE_FOLDER, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+			check=True, universal_newlines=True
+		).stdout
+		# Only the last line is the result, the logger may print messages before it
+		result = json.loads(output.strip().splitlines()[-1])
+		times.append(result['duration'])
+		loaded = result['loaded']
+	return times, loaded
+
+
+def run_benchmarks(repeats=5, stages=None):
+	"""
+		Times the import for each of the entry points
+	:param int repeats:  (optional=5) Number of times to run each import
+	:param tuple stages:  (optional=None) Names of the stages to run, if None then all stages are run
+	:return dict report:  Report detailing the environment, the dependencies loaded and the time taken for each stage
+	"""
+	stages = STAGES.keys() if stages is None else stages
+	timings = dict()
+	loaded = dict()
+	for stage in stages:
+		times, loaded[stage] = time_import(statement=STAGES[stage], repeats=repeats)
+		timings[stage] = summarise(times)
+
+	report = dict(
+		report_version=REPORT_VERSION,
+		created=time.strftime('%Y-%m-%d %H:%M:%S'),
+		environment=dict(
+			python=platform.python_version(),
+			platform=platform.platform(),
+			cpu_count=os.cpu_count(),
+		),
+		config=dict(repeats=repeats),
+		sizes=dict(),
+		loaded=loaded,
+		stages=timings,
+	)
+	return report
+
+
+def main(args=None):
+	"""
+		Command line interface for running the benchmarks
+	:param list args:  (optional=None) Command line arguments, if None then sys.argv is used
+	:return int exit_code:  0 if successful, 1 if any stage is slower than the baseline
+	"""
+	parser = argparse.ArgumentParser(description='Benchmarks the time taken to import pscharmonics')
+	parser.add_argument('--repeats', type=int, default=5, help='Number of times each import is run')
+	parser.add_argument(
+		'--stages', nargs='+', default=None, choices=tuple(STAGES.keys()), help='Entry points to time, default is all'
+	)
+	parser.add_argument('--output', default=None, help='Path to write the JSON report to')
+	parser.add_argument('--baseline', default=None, help='Previous JSON report to compare against')
+	parser.add_argument(
+		'--tolerance', type=float, default=DEFAULT_TOLERANCE,
+		help='Allowed fractional increase in the median time of a stage compared to the baseline'
+	)
+	options = parser.parse_args(args)
+
+	report = run_benchmarks(repeats=options.repeats, stages=options.stages)
+
+	if options.output:
+		with open(options.output, 'w') as f:
+			json.dump(report, f, indent=2)
+
+	print('\nImport benchmark ({} repeats)'.format(options.repeats))
+	for stage, summary in report['stages'].items():
+		print('\t{:<16}median {:8.3f} s\tmin {:8.3f} s\tmax {:8.3f} s\tloads: {}'.format(
+			stage, summary['median'], summary['min'], summary['max'], ', '.join(report['loaded'][stage])
+		))
+
+	exit_code = 0
+	if options.baseline:
+		with open(options.baseline, 'r') as f:
+			baseline = json.load(f)
+		regressions = compare(report=report, baseline=baseline, tolerance=options.tolerance)
+		for stage, baseline_median, new_median in regressions:
+			print('\tREGRESSION: {} median increased from {:.3f} s to {:.3f} s'.format(stage, baseline_median, new_median))
+		if regressions:
+			exit_code = 1
+
+	return exit_code
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+#######################################################################################################################
+###												benchmark_results.py												###
+###		Times each stage of the processing of the results exported from PowerFactory using synthetic results of a	###
+###		configurable size and writes a JSON report that can be compared against a previous report to identify		###
+###		any performance regressions.																				###
+###																													###
+###		Run from the repository folder:																				###
+###			python -m tests.benchmarks.benchmark_results --terminals 50 --contingencies 20 --output report.json		###
+###			python -m tests.benchmarks.benchmark_results --baseline report.json										###
+###																													###
+#######################################################################################################################
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from tests.context import pscharmonics
+from tests.benchmarks.synthetic_results import SyntheticStudy
+
+# Version of the report format, increased if the layout of the report changes
+REPORT_VERSION = 1
+
+# Stages that are timed, combine_multiple_runs includes the import of every results folder and so also includes the
+# time taken by PreviousResultsExport
+STAGES = ('PreviousResultsExport', 'combine_multiple_runs', 'calculate_convex_vertices', 'extract_results')
+
+# Default allowed increase in the median time of a stage compared to the baseline before it is considered a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def new_extract_results():
+	"""
+		Returns an ExtractResults instance without running the complete extraction so that each stage can be run
+		separately
+	:return pscharmonics.file_io.ExtractResults extract:
+	"""
+	extract = pscharmonics.file_io.ExtractResults.__new__(pscharmonics.file_io.ExtractResults)
+	extract.logger = pscharmonics.constants.logger
+	extract.include_convex = False
+	extract.nom_frequency = float()
+	extract.freq_bands = dict()
+	extract.exclude = dict()
+	extract.max_vertices = dict()
+	extract.band_index = None
+	return extract
+
+
+def time_stage(func, repeats, setup=None):
+	"""
+		Times the function for the number of repeats provided
+	:param func:  Function to time, called with the value returned by setup if provided
+	:param int repeats:  Number of times to run the function
+	:param setup:  (optional=None) Function called before each repeat that is not included in the timing
+	:return (list, object) times, result:  Time in seconds for each repeat and the value returned by the last repeat
+	"""
+	times = list()
+	result = None
+	for _ in range(repeats):
+		args = setup() if setup is not None else tuple()
+		t0 = time.perf_counter()
+		result = func(*args)
+		times.append(time.perf_counter() - t0)
+	return times, result
+
+
+def summarise(times):
+	"""
+		Summary statistics for the times recorded for a stage
+	:param list times:  Time in seconds for each repeat
+	:return dict summary:
+	"""
+	return dict(
+		repeats=len(times),
+		min=min(times),
+		median=statistics.median(times),
+		mean=statistics.mean(times),
+		max=max(times),
+		times=times,
+	)
+
+
+def run_benchmarks(study, pth, repeats=3, ingest_workers=1, hull_workers=1, streaming=False):
+	"""
+		Writes the synthetic results to the folder provided and then times each stage of the results processing
+	:param SyntheticStudy study:  Details of the synthetic results to produce
+	:param str pth:  Folder to write the synthetic results to, any existing folder is replaced
+	:param int repeats:  (optional=3) Number of times to run each stage
+	:param int ingest_workers:  (optional=1) Number of worker processes used to import the results files
+	:param int hull_workers:  (optional=1) Number of worker processes used to calculate the convex hulls
+	:param bool streaming:  (optional=False) Whether the results workbook is written in constant memory mode
+	:return dict report:  Report detailing the environment, size of the results and the time taken for each stage
+	"""
+	c = pscharmonics.constants
+	file_io = pscharmonics.file_io
+
+	t0 = time.perf_counter()
+	sizes = study.write(pth=pth)
+	generation_time = time.perf_counter() - t0
+
+	# Cached results would mean that only the first repeat processes the results files
+	original_settings = (c.Results.cache_results, c.Results.ingest_workers)
+	c.Results.cache_results = False
+	c.Results.ingest_workers = ingest_workers
+	stages = dict()
+	try:
+		times, _ = time_stage(func=lambda: file_io.PreviousResultsExport(pth=pth), repeats=repeats)
+		stages['PreviousResultsExport'] = summarise(times)
+
+		extract = new_extract_results()
+		times, (df, vars_to_export) = time_stage(
+			func=lambda: extract.combine_multiple_runs(search_paths=(pth, )), repeats=repeats
+		)
+		stages['combine_multiple_runs'] = summarise(times)
+
+		# Rows for each frequency band are shared between the convex hull and the export as in ExtractResults
+		extract.band_index = file_io.frequency_band_index(index=df.index, frequency_bounds=extract.freq_bands)
+		times, df_convex = time_stage(
+			func=lambda: file_io.calculate_convex_vertices(
+				df=df, frequency_bounds=extract.freq_bands, percentage_to_exclude=extract.exclude,
+				max_vertices=extract.max_vertices, nom_frequency=extract.nom_frequency, workers=hull_workers,
+				band_index=extract.band_index
+			),
+			repeats=repeats
+		)
+		stages['calculate_convex_vertices'] = summarise(times)
+
+		# extract_results removes columns from the DataFrame provided and so each repeat is given a new copy
+		pth_results = os.path.join(pth, 'Results_benchmark{}'.format(c.Results.extension))
+		times, _ = time_stage(
+			func=lambda _df: extract.extract_results(
+				pth_file=pth_results, df=_df, vars_to_export=vars_to_export, df_convex=df_convex, streaming=streaming
+			),
+			repeats=repeats,
+			setup=lambda: (df.copy(), )
+		)
+		stages['extract_results'] = summarise(times)
+	finally:
+		c.Results.cache_results, c.Results.ingest_workers = original_settings
+
+	sizes['combined_columns'] = df.shape[1]
+	sizes['convex_columns'] = df_convex.shape[1]
+
+	report = dict(
+		report_version=REPORT_VERSION,
+		created=time.strftime('%Y-%m-%d %H:%M:%S'),
+		environment=dict(
+			pscharmonics=c.__version__,
+			python=platform.python_version(),
+			pandas=pd.__version__,
+			numpy=np.__version__,
+			platform=platform.platform(),
+			cpu_count=os.cpu_count(),
+		),
+		config=dict(
+			repeats=repeats,
+			ingest_workers=ingest_workers,
+			hull_workers=hull_workers,
+			streaming=streaming,
+			fstart=study.fstart,
+			fstop=study.fstop,
+			fstep=study.fstep,
+			nom_freq=study.nom_freq,
+			export_rx=study.export_rx,
+		),
+		sizes=sizes,
+		generation_time=generation_time,
+		stages=stages,
+	)
+	return report
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+	"""
+		Compares the median time of each stage against a previous report
+	:param dict report:  Report produced by run_benchmarks
+	:param dict baseline:  Previous report to compare against
+	:param float tolerance:  (optional=0.25) Allowed fractional increase in the median time
+	:return list regressions:  List of tuples in the format (stage, baseline median, new median) for each stage that
+		is slower than allowed
+	"""
+	if baseline.get('sizes') != report['sizes']:
+		pscharmonics.constants.logger.warning(
+			'The baseline report is for a different size of results and so the comparison may not be meaningful'
+		)
+
+	regressions = list()
+	for stage, summary in report['stages'].items():
+		try:
+			baseline_median = baseline['stages'][stage]['median']
+		except KeyError:
+			continue
+		if summary['median'] > baseline_median * (1.0 + tolerance):
+			regressions.append((stage, baseline_median, summary['median']))
+	return regressions
+
+
+def main(args=None):
+	"""
+		Command line interface for running the benchmarks
+	:param list args:  (optional=None) Command line arguments, if None then sys.argv is used
+	:return int exit_code:  0 if successful, 1 if any stage is slower than the baseline
+	"""
+	parser = argparse.ArgumentParser(description='Benchmarks the processing of the PowerFactory results exports')
+	parser.add_argument('--terminals', type=int, default=10, help='Number of terminals')
+	parser.add_argument('--mutuals', type=int, default=2, help='Number of terminals with mutual impedances')
+	parser.add_argument('--contingencies', type=int, default=5, help='Number of contingencies per study case')
+	parser.add_argument('--study-cases', type=int, default=1, help='Number of study cases')
+	parser.add_argument('--fstart', type=float, default=50.0, help='Frequency sweep start (Hz)')
+	parser.add_argument('--fstop', type=float, default=2500.0, help='Frequency sweep stop (Hz)')
+	parser.add_argument('--fstep', type=float, default=5.0, help='Frequency sweep step (Hz)')
+	parser.add_argument('--repeats', type=int, default=3, help='Number of times each stage is run')
+	parser.add_argument('--ingest-workers', type=int, default=1, help='Worker processes for importing results')
+	parser.add_argument('--hull-workers', type=int, default=1, help='Worker processes for the convex hulls')
+	parser.add_argument('--streaming', action='store_true', help='Write the workbook in constant memory mode')
+	parser.add_argument('--folder', default=None, help='Folder for the synthetic results, temporary if not provided')
+	parser.add_argument('--output', default=None, help='Path to write the JSON report to')
+	parser.add_argument('--baseline', default=None, help='Previous JSON report to compare against')
+	parser.add_argument(
+		'--tolerance', type=float, default=DEFAULT_TOLERANCE,
+		help='Allowed fractional increase in the median time of a stage compared to the baseline'
+	)
+	options = parser.parse_args(args)
+
+	study = SyntheticStudy(
+		terminals=options.terminals, mutuals=options.mutuals, contingencies=options.contingencies,
+		study_cases=options.study_cases, fstart=options.fstart, fstop=options.fstop, fstep=options.fstep
+	)
+
+	if options.folder is None:
+		temp_folder = tempfile.mkdtemp(prefix='pscharmonics_benchmark_')
+		pth = os.path.join(temp_folder, 'results')
+	else:
+		temp_folder = None
+		pth = options.folder
+
+	try:
+		report = run_benchmarks(
+			study=study, pth=pth, repeats=options.repeats, ingest_workers=options.ingest_workers,
+			hull_workers=options.hull_workers, streaming=options.streaming
+		)
+	finally:
+		if temp_folder is not None:
+			shutil.rmtree(temp_folder, ignore_errors=True)
+
+	if options.output:
+		with open(options.output, 'w') as f:
+			json.dump(report, f, indent=2)
+
+	print('\nResults processing benchmark ({} files, {} columns per file, {} frequencies)'.format(
+		report['sizes']['results_files'], report['sizes']['columns_per_file'], report['sizes']['frequency_points']
+	))
+	for stage, summary in report['stages'].items():
+		print('\t{:<28}median {:8.3f} s\tmin {:8.3f} s\tmax {:8.3f} s'.format(
+			stage, summary['median'], summary['min'], summary['max']
+		))
+
+	exit_code = 0
+	if options.baseline:
+		with open(options.baseline, 'r') as f:
+			baseline = json.load(f)
+		regressions = compare(report=report, baseline=baseline, tolerance=options.tolerance)
+		for stage, baseline_median, new_median in regressions:
+			print('\tREGRESSION: {} median increased from {:.3f} s to {:.3f} s'.format(stage, baseline_median, new_median))
+		if regressions:
+			exit_code = 1
+
+	return exit_code
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+#######################################################################################################################
+###												synthetic_results.py												###
+###		Generates a folder of synthetic frequency sweep results in the same CSV layout as a PowerFactory ComRes		###
+###		export alongside a matching inputs workbook so that the results processing can be benchmarked at any size	###
+###																													###
+#######################################################################################################################
+"""
+
+import os
+import shutil
+
+import numpy as np
+import openpyxl
+
+from tests.context import pscharmonics
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'test_files')
+
+# Inputs workbook used as the template for the generated inputs, only the study cases, terminals and study settings
+# are replaced so the loci settings remain as defined in the template
+TEMPLATE_INPUTS = os.path.join(TESTS_DIR, 'Inputs.xlsx')
+
+# First row of data in the study case and terminals worksheets
+FIRST_ROW = 5
+
+# Name of the project referred to in the generated inputs workbook
+PROJECT_NAME = 'benchmark_project'
+
+
+class SyntheticStudy:
+	"""
+		Details of the synthetic study which determine the size of the results that are produced.  Each terminal is in
+		its own substation and each of the terminals flagged as mutual has a mutual impedance to every other terminal
+	"""
+	def __init__(self, terminals=10, mutuals=2, contingencies=5, study_cases=1,
+				 fstart=50.0, fstop=2500.0, fstep=5.0, nom_freq=50.0, export_rx=True):
+		"""
+		:param int terminals:  (optional=10) Number of terminals
+		:param int mutuals:  (optional=2) Number of terminals for which mutual impedances are included
+		:param int contingencies:  (optional=5) Number of contingencies, in addition to the intact case, for each
+			study case
+		:param int study_cases:  (optional=1) Number of study cases
+		:param float fstart:  (optional=50.0) Starting frequency of the frequency sweep in Hz
+		:param float fstop:  (optional=2500.0) Stopping frequency of the frequency sweep in Hz
+		:param float fstep:  (optional=5.0) Frequency step in Hz
+		:param float nom_freq:  (optional=50.0) Nominal frequency in Hz
+		:param bool export_rx:  (optional=True) Whether the R and X values are included as well as the impedance
+		"""
+		if mutuals > terminals:
+			raise ValueError(
+				'Number of mutual terminals ({}) cannot exceed the number of terminals ({})'.format(mutuals, terminals)
+			)
+		# Study case names are matched with the results file names so must be fewer than 100 to avoid one name being
+		# contained within another
+		if not 0 < study_cases < 100:
+			raise ValueError('Number of study cases must be between 1 and 99 but {} provided'.format(study_cases))
+
+		self.terminals = terminals
+		self.mutuals = mutuals
+		self.contingencies = contingencies
+		self.study_cases = study_cases
+		self.fstart = fstart
+		self.fstop = fstop
+		self.fstep = fstep
+		self.nom_freq = nom_freq
+		self.export_rx = export_rx
+
+	def frequencies(self):
+		"""
+			Frequencies included in the frequency sweep
+		:return np.ndarray frequencies:
+		"""
+		return np.arange(self.fstart, self.fstop + self.fstep / 2.0, self.fstep)
+
+	def terminal_details(self):
+		"""
+			Details of each terminal to include, the nominal voltage is included in the substation name
+		:return list terminals:  List of tuples in the format (name, substation, terminal, include_mutual)
+		"""
+		voltages = (132, 220, 275, 330, 400)
+		terminals = list()
+		for i in range(self.terminals):
+			substation = 'SUB{:03d} {}KV'.format(i+1, voltages[i % len(voltages)])
+			terminals.append((substation, substation, 'BUS{:03d}'.format(i+1), i < self.mutuals))
+		return terminals
+
+	def case_names(self):
+		"""
+			Names of the study cases
+		:return list names:
+		"""
+		return ['SC{:02d}'.format(i+1) for i in range(self.study_cases)]
+
+	def contingency_names(self):
+		"""
+			Names of the contingencies including the intact case
+		:return list names:
+		"""
+		contingencies = ['Cont {:03d}'.format(i+1) for i in range(self.contingencies)]
+		return [pscharmonics.constants.Contingencies.intact] + contingencies
+
+	def sizes(self):
+		"""
+			Summary of the size of the results produced for inclusion in the benchmark report
+		:return dict sizes:
+		"""
+		self_vars = 4 if self.export_rx else 2
+		mutual_vars = 3 if self.export_rx else 1
+		mutual_elements = self.mutuals * (self.terminals - 1)
+		return dict(
+			terminals=self.terminals,
+			mutual_terminals=self.mutuals,
+			mutual_elements=mutual_elements,
+			study_cases=self.study_cases,
+			contingencies=self.contingencies,
+			results_files=self.study_cases * (self.contingencies + 1),
+			frequency_points=len(self.frequencies()),
+			columns_per_file=self.terminals * self_vars + mutual_elements * mutual_vars + 2,
+		)
+
+	def write(self, pth):
+		"""
+			Writes the inputs workbook and the results files for every study case and contingency to the folder
+			provided, any existing folder is replaced
+		:param str pth:  Folder to write the synthetic results to
+		:return dict sizes:  Summary of the size of the results produced
+		"""
+		if os.path.isdir(pth):
+			shutil.rmtree(pth)
+		os.makedirs(pth)
+
+		self.write_inputs(pth_file=os.path.join(pth, '{}_benchmark{}'.format(
+			pscharmonics.constants.StudyInputs.file_name, pscharmonics.constants.StudyInputs.file_format
+		)))
+		self.write_results(pth=pth)
+
+		return self.sizes()
+
+	def write_inputs(self, pth_file):
+		"""
+			Writes an inputs workbook that refers to the synthetic study cases and terminals.  Formulas in the
+			template are replaced by their values since openpyxl does not calculate the formulas when saving.
+		:param str pth_file:  Full path to save the inputs workbook to
+		:return None:
+		"""
+		c = pscharmonics.constants.StudyInputs
+		wkbk = openpyxl.load_workbook(TEMPLATE_INPUTS)
+		wkbk_values = openpyxl.load_workbook(TEMPLATE_INPUTS, data_only=True)
+
+		for sht in wkbk.worksheets:
+			sht_values = wkbk_values[sht.title]
+			for row in sht.iter_rows():
+				for cell in row:
+					if cell.data_type == 'f':
+						cell.value = sht_values[cell.coordinate].value
+
+		# Study cases
+		sht = wkbk[c.study_cases]
+		clear_rows(sht=sht, columns=4)
+		for i, sc_name in enumerate(self.case_names()):
+			for j, value in enumerate((sc_name, PROJECT_NAME, sc_name, sc_name)):
+				sht.cell(row=FIRST_ROW + i, column=j + 1, value=value)
+
+		# Terminals
+		sht = wkbk[c.terminals]
+		clear_rows(sht=sht, columns=4)
+		for i, details in enumerate(self.terminal_details()):
+			for j, value in enumerate(details):
+				sht.cell(row=FIRST_ROW + i, column=j + 1, value=value)
+
+		# Study settings, only the settings that affect the results processing are changed
+		s = pscharmonics.constants.StudySettings
+		settings = {
+			s.export_folder: None,
+			s.export_rx: self.export_rx,
+			s.export_mutual: self.mutuals > 0,
+			s.include_intact: True,
+			s.include_loci: True,
+		}
+		sht = wkbk[c.study_settings]
+		for row in sht.iter_rows(min_col=1, max_col=2):
+			if row[0].value in settings:
+				row[1].value = settings[row[0].value]
+
+		wkbk.save(pth_file)
+		return None
+
+	def write_results(self, pth):
+		"""
+			Uses the mock PowerFactory engine to produce and export a results file for every study case and
+			contingency, the variables are added in the same order as pf.py
+		:param str pth:  Folder to write the results files to
+		:return None:
+		"""
+		pf_mock = pscharmonics.pf_mock
+		c = pscharmonics.constants.PowerFactory
+
+		self_variables = (c.pf_nom_voltage, c.pf_z1, c.pf_r1, c.pf_x1) if self.export_rx else (c.pf_nom_voltage, c.pf_z1)
+		mutual_variables = (c.pf_z12, c.pf_r12, c.pf_x12) if self.export_rx else (c.pf_z12, )
+
+		pf_mock.reset()
+		try:
+			prj = pf_mock.create_project(name=PROJECT_NAME)
+			prj.Activate()
+			app = pf_mock.GetApplicationExt()
+			grid = app.GetProjectFolder(c.pf_netdata_folder_type).GetContents('*.{}'.format(c.pf_network_elements))[0]
+			sc_folder = app.GetProjectFolder(c.pf_sc_folder_type)
+
+			# Terminals
+			terminals = list()
+			for name, substation, terminal, include_mutual in self.terminal_details():
+				sub = grid.CreateObject(c.pf_substation, substation)
+				term = sub.CreateObject(c.pf_terminal, terminal)
+				term.uknom = float(substation.split(' ')[-1].replace('KV', ''))
+				terminals.append((name, term, include_mutual))
+
+			# Mutual impedances from each mutual terminal to every other terminal
+			mutuals = list()
+			if self.mutuals > 0:
+				mutual_folder = grid.CreateObject(c.pf_folder_type, 'mutual_elements_benchmark')
+				for name, term, include_mutual in terminals:
+					if not include_mutual:
+						continue
+					for other_name, other_term, _ in terminals:
+						if other_term is term:
+							continue
+						_, used_name = pscharmonics.pf.create_mutual_name(term1=name, term2=other_name)
+						mutual = mutual_folder.CreateObject(c.pf_mutual, used_name)
+						mutual.bus1 = term
+						mutual.bus2 = other_term
+						mutuals.append(mutual)
+
+			frequencies = self.frequencies()
+			for sc_name in self.case_names():
+				for cont_name in self.contingency_names():
+					full_name = '{}{}{}'.format(sc_name, pscharmonics.constants.Results.joiner, cont_name)
+					sc = sc_folder.CreateObject(c.pf_case, full_name)
+					res = sc.CreateObject(c.pf_results, 'PSC_FS_Res')
+					for _, term, _ in terminals:
+						for var in self_variables:
+							res.AddVariable(term, var)
+					for mutual in mutuals:
+						for var in mutual_variables:
+							res.AddVariable(mutual, var)
+
+					res.sweep(frequencies=frequencies, frnom=self.nom_freq)
+					res.export(pth=os.path.join(pth, '{}{}{}.csv'.format(
+						pscharmonics.constants.Results.study_fs, pscharmonics.constants.Results.joiner, full_name
+					)))
+					# Results no longer needed once exported
+					sc.Delete()
+		finally:
+			pf_mock.reset()
+
+		return None
+
+
+def clear_rows(sht, columns):
+	"""
+		Removes the existing data from the worksheet below the header row
+	:param openpyxl.worksheet.worksheet.Worksheet sht:  Worksheet to clear
+	:param int columns:  Number of columns to clear
+	:return None:
+	"""
+	for row in sht.iter_rows(min_row=FIRST_ROW, max_row=sht.max_row, max_col=columns):
+		for cell in row:
+			cell.value = None
+	return None
@@ -0,0 +1,104 @@
+"""
+#######################################################################################################################
+###													test_benchmarks.py												###
+###		Test code for the synthetic results generator and the results processing benchmarks							###
+###																													###
+#######################################################################################################################
+"""
+
+import unittest
+import os
+import sys
+import glob
+import json
+import shutil
+import pandas as pd
+
+from tests.context import pscharmonics
+from tests.benchmarks import synthetic_results, benchmark_results, benchmark_import
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), 'test_files')
+
+
+class TestSyntheticResults(unittest.TestCase):
+	""" Tests the synthetic results are produced in the same layout as the PowerFactory results """
+	def setUp(self):
+		self.pth = os.path.join(TESTS_DIR, 'Benchmark_Synthetic')
+		self.study = synthetic_results.SyntheticStudy(
+			terminals=3, mutuals=1, contingencies=2, fstart=50.0, fstop=500.0, fstep=10.0
+		)
+
+	def tearDown(self):
+		shutil.rmtree(self.pth, ignore_errors=True)
+
+	def test_write(self):
+		""" Confirms a results file is written for every contingency and can be imported with the inputs """
+		sizes = self.study.write(pth=self.pth)
+
+		files = glob.glob(os.path.join(self.pth, 'FS_*.csv'))
+		self.assertEqual(len(files), sizes['results_files'])
+		self.assertEqual(len(files), 3)
+
+		df = pd.read_csv(os.path.join(self.pth, 'FS_SC01_Intact.csv'), header=[0, 1])
+		self.assertEqual(df.shape, (sizes['frequency_points'], sizes['columns_per_file']))
+		self.assertEqual(df.columns[-1][1], pscharmonics.constants.PowerFactory.pf_freq)
+
+		combined = pscharmonics.file_io.PreviousResultsExport(pth=self.pth)
+		self.assertEqual(len(combined.inputs.terminals), 3)
+		self.assertEqual(combined.df.shape[0], sizes['frequency_points'])
+
+
+class TestBenchmarkResults(unittest.TestCase):
+	""" Tests the benchmark report """
+	def setUp(self):
+		self.pth = os.path.join(TESTS_DIR, 'Benchmark_Results')
+		self.pth_report = os.path.join(TESTS_DIR, 'Benchmark_Report.json')
+
+	def tearDown(self):
+		shutil.rmtree(self.pth, ignore_errors=True)
+		if os.path.isfile(self.pth_report):
+			os.remove(self.pth_report)
+
+	def test_report(self):
+		""" Confirms every stage is timed and the report can be compared against a baseline """
+		exit_code = benchmark_results.main(args=[
+			'--terminals', '3', '--mutuals', '1', '--contingencies', '1', '--fstop', '500', '--fstep', '10',
+			'--repeats', '1', '--folder', self.pth, '--output', self.pth_report
+		])
+		self.assertEqual(exit_code, 0)
+
+		with open(self.pth_report, 'r') as f:
+			report = json.load(f)
+		self.assertEqual(tuple(report['stages'].keys()), benchmark_results.STAGES)
+		for summary in report['stages'].values():
+			self.assertEqual(summary['repeats'], 1)
+			self.assertGreater(summary['median'], 0.0)
+		self.assertGreater(report['sizes']['convex_columns'], 0)
+
+		# Comparing against the same report produces no regressions, a faster baseline results in every stage
+		self.assertEqual(benchmark_results.compare(report=report, baseline=report), [])
+		baseline = json.loads(json.dumps(report))
+		for summary in baseline['stages'].values():
+			summary['median'] /= 2.0
+		regressions = benchmark_results.compare(report=report, baseline=baseline, tolerance=0.5)
+		self.assertEqual([x[0] for x in regressions], list(benchmark_results.STAGES))
+
+
+class TestBenchmarkImport(unittest.TestCase):
+	""" Tests the import benchmark """
+	def test_report(self):
+		""" Importing the package does not load any of the heavy dependencies until a submodule is used """
+		report = benchmark_import.run_benchmarks(repeats=1, stages=('import_package', 'batch'))
+		self.assertEqual(report['loaded']['import_package'], list())
+		self.assertIn('pandas', report['loaded']['batch'])
+		self.assertNotIn('tkinter', report['loaded']['batch'])
+		self.assertGreater(report['stages']['import_package']['median'], 0.0)
+
+		# Submodules are still available as attributes of the package
+		self.assertIs(pscharmonics.pf, sys.modules['pscharmonics.pf'])
+		with self.assertRaises(AttributeError):
+			_ = pscharmonics.missing_module
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 import os
+import shutil
 
 from tests.context import pscharmonics
 
@@ -92,3 +93,47 @@ class TestUserGuideExists(unittest.TestCase):
 			self.assertTrue(
 				os.path.isfile(logo),
 				msg='Logo for GUI {} does not exist'.format(logo))
+
+class TestColorMap(unittest.TestCase):
+	""" Tests the colour map is only loaded once and can be precompiled """
+	def setUp(self):
+		self.c = pscharmonics.constants.Results
+		self.original_table = self.c.color_map_table
+		self.c.color_map_table = os.path.join(TESTS_DIR, 'N1_color_map_test.json')
+		self.c.color_maps.clear()
+
+	def tearDown(self):
+		if os.path.isfile(self.c.color_map_table):
+			os.remove(self.c.color_map_table)
+		self.c.color_map_table = self.original_table
+		self.c.color_maps.clear()
+
+	def test_shared_color_map(self):
+		""" Colour map is shared by every instance and the precompiled table matches the workbook """
+		color_map = self.c().get_color_map()
+		self.assertIs(self.c().get_color_map(), color_map)
+		self.assertEqual(color_map[0], '#000000')
+
+		self.c().compile_color_map()
+		self.c.color_maps.clear()
+		compiled = self.c().get_color_map()
+		self.assertIsNot(compiled, color_map)
+		self.assertEqual(len(compiled), len(color_map))
+		self.assertEqual([compiled[x] for x in range(0, 100, 10)], [color_map[x] for x in range(0, 100, 10)])
+
+		# Table is ignored if the workbook has been modified since it was produced
+		os.utime(self.c.color_map_table, (0, 0))
+		self.assertFalse(self.c().table_up_to_date())
+
+	def test_custom_color_map_table(self):
+		""" Table for a custom workbook is saved alongside it without replacing the table for the default workbook """
+		pth_custom = os.path.join(TESTS_DIR, 'N1_color_map_custom.xlsm')
+		pth_table = os.path.join(TESTS_DIR, 'N1_color_map_custom.json')
+		shutil.copyfile(src=self.c.color_map_file, dst=pth_custom)
+		self.addCleanup(os.remove, pth_custom)
+
+		self.assertEqual(self.c().compile_color_map(pth_color_map=pth_custom), pth_table)
+		self.addCleanup(os.remove, pth_table)
+		self.assertFalse(os.path.isfile(self.c.color_map_table))
+		self.assertTrue(self.c().table_up_to_date(pth_color_map=pth_custom))
+		self.assertEqual(self.c().get_color_map(pth_color_map=pth_custom)[0], '#000000')
@@ -11,13 +11,16 @@
 import unittest
 import os
 import pandas as pd
+import numpy as np
 import time
 import shutil
 import random
 import string
+import collections
 import shapely.geometry
 import shapely.geometry.polygon
 import matplotlib.pyplot
+import openpyxl
 from functools import partial
 
 from tests.context import pscharmonics
@@ -53,6 +56,8 @@ class MockExtractResults:
 	def __init__(self):
 		self.include_convex = True
 		self.combine_multiple_runs = partial(pscharmonics.file_io.ExtractResults.combine_multiple_runs, self)
+		self.combine_inputs = partial(pscharmonics.file_io.ExtractResults.combine_inputs, self)
+		self.remove_duplicates = partial(pscharmonics.file_io.ExtractResults.remove_duplicates, self)
 
 		self.nom_frequency = float()
 		# Create target frequency range
@@ -68,8 +73,14 @@ class MockPreviousResultsExport:
 		self.study_type = 'FS'
 
 		# Functions to be defined
+		self.import_all_results = partial(pscharmonics.file_io.PreviousResultsExport.import_all_results, self)
+		self.results_files = partial(pscharmonics.file_io.PreviousResultsExport.results_files, self)
+		self.iter_results = partial(pscharmonics.file_io.PreviousResultsExport.iter_results, self)
+		self.cache_key = partial(pscharmonics.file_io.PreviousResultsExport.cache_key, self)
+		self.load_file = partial(pscharmonics.file_io.PreviousResultsExport.load_file, self)
 		self.process_file = partial(pscharmonics.file_io.PreviousResultsExport.process_file, self)
 		self.process_file_name = partial(pscharmonics.file_io.PreviousResultsExport.process_file_name, self)
+		self.process_headers = partial(pscharmonics.file_io.PreviousResultsExport.process_headers, self)
 		self.extract_var_name = partial(pscharmonics.file_io.PreviousResultsExport.extract_var_name, self)
 		self.extract_var_type = partial(pscharmonics.file_io.PreviousResultsExport.extract_var_type, self)
 
@@ -106,6 +117,49 @@ class TestInputs(unittest.TestCase):
 
 		self.assertEqual(self.inputs.cases.loc['BASE', pscharmonics.constants.StudySettings.name], 'BASE')
 
+class TestLoadStudyInputs(unittest.TestCase):
+	""" Tests the parsed inputs are reused for identical inputs workbooks """
+	def setUp(self):
+		self.pth = os.path.join(TESTS_DIR, 'Cached_Inputs')
+		self.folders = [os.path.join(self.pth, 'Results_{}'.format(i)) for i in range(2)]
+		for folder in self.folders:
+			os.makedirs(folder)
+			shutil.copyfile(src=os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'), dst=os.path.join(folder, 'Inputs.xlsx'))
+		pscharmonics.file_io.inputs_cache.clear()
+
+	def tearDown(self):
+		pscharmonics.file_io.inputs_cache.clear()
+		shutil.rmtree(self.pth, ignore_errors=True)
+
+	def test_cached_inputs(self):
+		""" Workbook is only parsed once and each call returns a separate instance for the workbook provided """
+		pth_inputs = [os.path.join(folder, 'Inputs.xlsx') for folder in self.folders]
+		logger = pscharmonics.constants.logger
+		initial_warnings = logger.warning_count + logger.error_count
+		inputs = pscharmonics.file_io.load_study_inputs(pth_file=pth_inputs[0])
+		parse_warnings = logger.warning_count + logger.error_count - initial_warnings
+		self.assertGreater(parse_warnings, 0)
+		# Nothing is written alongside the workbook
+		self.assertEqual(os.listdir(self.folders[0]), ['Inputs.xlsx'])
+
+		# Parsing the workbook again would fail
+		original = pscharmonics.file_io.StudyInputs.process_study_cases
+		pscharmonics.file_io.StudyInputs.process_study_cases = None
+		try:
+			initial_warnings = logger.warning_count + logger.error_count
+			cached = pscharmonics.file_io.load_study_inputs(pth_file=pth_inputs[1])
+		finally:
+			pscharmonics.file_io.StudyInputs.process_study_cases = original
+
+		# Warnings raised during parsing are reported again
+		self.assertEqual(logger.warning_count + logger.error_count - initial_warnings, parse_warnings)
+		self.assertIsNot(cached, inputs)
+		self.assertEqual(cached.pth, pth_inputs[1])
+		self.assertEqual(cached.settings.pth, pth_inputs[1])
+		pd.testing.assert_frame_equal(cached.cases, inputs.cases)
+		self.assertEqual(list(cached.terminals.keys()), list(inputs.terminals.keys()))
+		self.assertEqual(cached.loci_settings.freq_bands, inputs.loci_settings.freq_bands)
+
 class GeneralTests(unittest.TestCase):
 	"""
 		This class is for testing functions which are stand-alone and not part of any
@@ -136,6 +190,41 @@ class GeneralTests(unittest.TestCase):
 		_, updated = pscharmonics.file_io.update_duplicates(key=key, df=df_new)
 		self.assertFalse(updated)
 
+	def test_duplicated_columns_removed(self):
+		""" Test that only columns with the same name and the same values are removed """
+		columns = pd.MultiIndex.from_tuples(
+			[('A', 'R'), ('A', 'X'), ('A', 'R'), ('B', 'R'), ('A', 'X'), ('A', 'R')]
+		)
+		data = [
+			[1.0, 2.0, 1.0, 1.0, 5.0, 1.0],
+			[float('nan'), 3.0, float('nan'), float('nan'), 3.0, float('nan')],
+		]
+		df = pd.DataFrame(data=data, columns=columns)
+
+		df_new = pscharmonics.file_io.remove_duplicated_columns(df=df)
+
+		# Both repeats of (A, R) removed but (A, X) has different values so is kept
+		self.assertEqual(df_new.shape, (2, 4))
+		self.assertEqual(df_new.columns.tolist(), [('A', 'R'), ('A', 'X'), ('B', 'R'), ('A', 'X')])
+		self.assertTrue(df_new.iloc[:, 3].equals(df.iloc[:, 4]))
+
+		# DataFrame returned unchanged if no duplicated column names
+		df_unique = df.iloc[:, [0, 1, 3]]
+		self.assertTrue(pscharmonics.file_io.remove_duplicated_columns(df=df_unique).equals(df_unique))
+
+	def test_frequency_band_index(self):
+		""" Test that the rows for each frequency band match those found by comparing every frequency """
+		frequency_bounds = {2: (75.0, 125.0), 3: (125.0, 175.0), 4: (187.5, 212.5), 20: (975.0, 1025.0)}
+		frequencies = np.arange(50.0, 502.5, 2.5)
+
+		# Check for both a sorted and unsorted index
+		for index in (pd.Index(frequencies), pd.Index(frequencies[::-1])):
+			band_index = pscharmonics.file_io.frequency_band_index(index=index, frequency_bounds=frequency_bounds)
+			for h, (min_f, max_f) in frequency_bounds.items():
+				expected = np.flatnonzero((index >= min_f) & (index <= max_f))
+				self.assertTrue(np.array_equal(np.arange(len(index))[band_index[h]], expected))
+				self.assertEqual(pscharmonics.file_io.band_size(band_index[h]), len(expected))
+
 class TestStudySettings(unittest.TestCase):
 	"""
 		Tests that the class to process all of the study settings works correctly
@@ -689,6 +778,70 @@ class TestCombineResults(unittest.TestCase):
 
 		pscharmonics.file_io.ExtractResults(target_file=target_file, search_paths=src_paths)
 
+	def test_export_combined_results_set_streaming(self):
+		""" Tests exporting one node at a time produces the same values as exporting all the results together """
+
+		src_paths = (self.results1, self.results2)
+		target_files = dict()
+		initial_streaming = pscharmonics.file_io.ExtractResults.streaming_export
+		try:
+			for streaming in (False, True):
+				target_files[streaming] = os.path.join(
+					TESTS_DIR, 'combined_results_streaming_{}.xlsx'.format(streaming)
+				)
+				if os.path.isfile(target_files[streaming]):
+					os.remove(target_files[streaming])
+
+				pscharmonics.file_io.ExtractResults.streaming_export = streaming
+				pscharmonics.file_io.ExtractResults(target_file=target_files[streaming], search_paths=src_paths)
+		finally:
+			pscharmonics.file_io.ExtractResults.streaming_export = initial_streaming
+
+		wkbk = openpyxl.load_workbook(target_files[False])
+		wkbk_streaming = openpyxl.load_workbook(target_files[True])
+		self.assertEqual(wkbk.sheetnames, wkbk_streaming.sheetnames)
+		for sheet_name in wkbk.sheetnames:
+			self.assertEqual(
+				[[x.value for x in row] for row in wkbk[sheet_name].iter_rows()],
+				[[x.value for x in row] for row in wkbk_streaming[sheet_name].iter_rows()]
+			)
+
+		for pth in target_files.values():
+			os.remove(pth)
+
+	def test_export_streaming_band_index_per_node(self):
+		""" Tests the rows for each loci frequency range are determined from each node's own results """
+		extract_cls = pscharmonics.file_io.ExtractResults
+		target_file = os.path.join(TESTS_DIR, 'combined_results_streaming_band_index.xlsx')
+		if os.path.isfile(target_file):
+			os.remove(target_file)
+
+		# Record the frequencies and band index passed in for each node
+		written = list()
+		initial_write_node = extract_cls.write_node
+		initial_streaming = extract_cls.streaming_export
+
+		def write_node(_self, **kwargs):
+			written.append((kwargs['df_node'].index, kwargs['band_index']))
+			return initial_write_node(_self, **kwargs)
+
+		try:
+			extract_cls.streaming_export = True
+			extract_cls.write_node = write_node
+			extract = extract_cls(target_file=target_file, search_paths=(self.results1, self.results2))
+		finally:
+			extract_cls.streaming_export = initial_streaming
+			extract_cls.write_node = initial_write_node
+
+		self.assertTrue(len(written) > 1)
+		for index, band_index in written:
+			expected = pscharmonics.file_io.frequency_band_index(index=index, frequency_bounds=extract.freq_bands)
+			self.assertEqual(band_index.keys(), expected.keys())
+			for h, rows in expected.items():
+				self.assertTrue(np.array_equal(np.arange(len(index))[band_index[h]], np.arange(len(index))[rows]))
+
+		os.remove(target_file)
+
 	def test_export_single_results_set3_no_contingencies(self):
 		""" Tests exporting of a results set with no contingencies (only the base case) works """
 
@@ -755,6 +908,225 @@ class TestResultsProcessing(unittest.TestCase):
 			)
 
 
+class TestParallelImport(unittest.TestCase):
+	""" Tests that importing the results files using worker processes matches importing them serially """
+
+	def setUp(self):
+		""" Copy the previous results to a temporary folder so the fixture folder is not modified """
+		results5 = os.path.join(TESTS_DIR, 'Detailed_5')
+		self.assertTrue(os.path.isdir(results5))
+		self.results5 = os.path.join(TESTS_DIR, 'temp_parallel_import')
+		shutil.rmtree(self.results5, ignore_errors=True)
+		shutil.copytree(src=results5, dst=self.results5)
+		self.addCleanup(shutil.rmtree, self.results5, ignore_errors=True)
+
+		# Without the cache every results file is processed by the worker processes
+		self.original_cache = pscharmonics.constants.Results.cache_results
+		pscharmonics.constants.Results.cache_results = False
+
+		self.cls_mock = MockPreviousResultsExport()
+		self.cls_mock.search_pth = self.results5
+		self.cls_mock.inputs = pscharmonics.file_io.StudyInputs(
+			pth_file=os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'), gui_mode=True
+		)
+
+	def tearDown(self):
+		pscharmonics.constants.Results.cache_results = self.original_cache
+
+	def test_parallel_matches_serial(self):
+		""" Tests the same DataFrame is returned in the same order """
+		df_serial = self.cls_mock.import_all_results(workers=1)
+		df_parallel = self.cls_mock.import_all_results(workers=2)
+
+		self.assertTrue(df_serial.columns.equals(df_parallel.columns))
+		self.assertTrue(df_serial.equals(df_parallel))
+		# Nothing other than the results files is written to the folder
+		self.assertEqual(
+			sorted(os.listdir(self.results5)), sorted(os.listdir(os.path.join(TESTS_DIR, 'Detailed_5')))
+		)
+
+class TestResultsCache(unittest.TestCase):
+	""" Tests that the processed results are cached and reloaded only when the results file is unchanged """
+
+	def setUp(self):
+		""" Copy results file to a temporary folder so the cache can be created """
+		test_dir = os.path.join(TESTS_DIR, 'RawResultsFiles')
+		self.temp_folder = os.path.join(TESTS_DIR, 'temp_cache')
+		if not os.path.isdir(self.temp_folder):
+			os.mkdir(self.temp_folder)
+		# Temporary folder deleted even if setUp fails
+		self.addCleanup(shutil.rmtree, self.temp_folder, ignore_errors=True)
+
+		self.test_results = os.path.join(self.temp_folder, 'FS_BASE_Intact.csv')
+		shutil.copyfile(src=os.path.join(test_dir, 'FS_BASE_Intact.csv'), dst=self.test_results)
+		self.pth_cache = '{}{}'.format(self.test_results, pscharmonics.constants.Results.cache_extension)
+		if os.path.isfile(self.pth_cache):
+			os.remove(self.pth_cache)
+
+		# Cache is disabled by default
+		self.original_cache = pscharmonics.constants.Results.cache_results
+		pscharmonics.constants.Results.cache_results = True
+
+		self.cls_mock = MockPreviousResultsExport()
+		self.cls_mock.inputs = pscharmonics.file_io.StudyInputs(
+			pth_file=os.path.join(test_dir, 'InputsDetailed_Results.xlsx'), gui_mode=True
+		)
+
+		# Count the number of times the results file is processed
+		self.processed = list()
+		process_file = self.cls_mock.process_file
+		def counted_process_file(pth):
+			self.processed.append(pth)
+			return process_file(pth=pth)
+		self.cls_mock.process_file = counted_process_file
+
+	def tearDown(self):
+		pscharmonics.constants.Results.cache_results = self.original_cache
+
+	def test_cache_created_and_reused(self):
+		""" Tests that the cache is created and the same DataFrame returned from it """
+		df = self.cls_mock.load_file(pth=self.test_results)
+		self.assertTrue(os.path.isfile(self.pth_cache))
+
+		df_cached = self.cls_mock.load_file(pth=self.test_results)
+		self.assertEqual(len(self.processed), 1)
+		self.assertTrue(df.equals(df_cached))
+		self.assertTrue(df.columns.equals(df_cached.columns))
+		self.assertEqual(df.index.name, df_cached.index.name)
+
+	def test_cache_invalidated(self):
+		""" Tests that changing the results file results in it being processed again """
+		_ = self.cls_mock.load_file(pth=self.test_results)
+		_ = self.cls_mock.load_file(pth=self.test_results)
+		self.assertEqual(len(self.processed), 1)
+
+		# Change the modified time of the results file
+		stats = os.stat(self.test_results)
+		os.utime(self.test_results, ns=(stats.st_atime_ns, stats.st_mtime_ns + 10**9))
+		_ = self.cls_mock.load_file(pth=self.test_results)
+		self.assertEqual(len(self.processed), 2)
+
+	def test_cache_unreadable(self):
+		""" Tests that a cache which cannot be read results in the results file being processed again """
+		df = self.cls_mock.load_file(pth=self.test_results)
+		with open(self.pth_cache, 'wb') as f:
+			f.write(b'not a cache file')
+
+		df_reprocessed = self.cls_mock.load_file(pth=self.test_results)
+		self.assertEqual(len(self.processed), 2)
+		self.assertTrue(df.equals(df_reprocessed))
+
+class TestStreamingExport(unittest.TestCase):
+	""" Tests that the streaming writer produces the same worksheet layout as pd.ExcelWriter """
+
+	def setUp(self):
+		""" Creates a DataFrame in the same format as the results """
+		columns = pd.MultiIndex.from_tuples(
+			[('NODE', 'BASE', 'm:Z'), ('NODE', 'BASE', 'm:R'), ('NODE', 'CONT', 'm:Z')],
+			names=('Terminal', 'Study Case', 'Result Type')
+		)
+		self.df = pd.DataFrame(
+			data=[[1.0, 2.0, 3.0], [4.0, float('nan'), 6.0], [7.0, 8.0, 9.0]], columns=columns, index=[50.0, 100.0, 150.0]
+		)
+
+		self.pandas_file = os.path.join(TESTS_DIR, 'streaming_pandas.xlsx')
+		self.streaming_file = os.path.join(TESTS_DIR, 'streaming_constant_memory.xlsx')
+
+	def test_streaming_matches_pandas(self):
+		""" Tests the values and merged cells match when multiple DataFrames are written to the same sheet """
+		blocks = (('SHEET 1', 5, 0), ('SHEET 1', 5, 6), ('SHEET 2', 1, 0))
+
+		with pd.ExcelWriter(self.pandas_file, engine='xlsxwriter') as writer:
+			for sheet_name, row, col in blocks:
+				self.df.to_excel(
+					writer, merge_cells=True, sheet_name=sheet_name, startrow=row, startcol=col, index_label=False
+				)
+
+		with pscharmonics.file_io.StreamingExcelWriter(self.streaming_file) as writer:
+			for sheet_name, row, col in blocks:
+				writer.to_excel(df=self.df, sheet_name=sheet_name, startrow=row, startcol=col)
+
+		wkbk_pandas = openpyxl.load_workbook(self.pandas_file)
+		wkbk_streaming = openpyxl.load_workbook(self.streaming_file)
+		self.assertEqual(wkbk_pandas.sheetnames, wkbk_streaming.sheetnames)
+		for sheet_name in wkbk_pandas.sheetnames:
+			sht_pandas = wkbk_pandas[sheet_name]
+			sht_streaming = wkbk_streaming[sheet_name]
+			self.assertEqual(
+				[[x.value for x in row] for row in sht_pandas.iter_rows()],
+				[[x.value for x in row] for row in sht_streaming.iter_rows()]
+			)
+			self.assertEqual(
+				sorted(str(x) for x in sht_pandas.merged_cells.ranges),
+				sorted(str(x) for x in sht_streaming.merged_cells.ranges)
+			)
+
+	def tearDown(self):
+		""" Delete the workbooks created """
+		for pth in (self.pandas_file, self.streaming_file):
+			if os.path.isfile(pth):
+				os.remove(pth)
+
+class TestTerminalLookup(unittest.TestCase):
+	""" Tests that the terminal lookup matches the results headers to the correct reference terminals """
+
+	def setUp(self):
+		""" Creates a set of terminals where some names are the start of others """
+		self.terminals = collections.OrderedDict()
+		for name, sub, term in (
+				('TERM A', 'SUB A', 'A1'),
+				('TERM A 2', 'SUB A', 'A2'),
+				('TERM B', 'SUB B', 'B1'),
+				('TERM B DUP', 'SUB B', 'B1'),
+		):
+			self.terminals[name] = pscharmonics.file_io.TerminalDetails(name=name, substation=sub, terminal=term)
+
+		self.lookup = pscharmonics.file_io.TerminalLookup(terminals=self.terminals)
+
+	def test_terminal(self):
+		""" Tests substation and terminal return the first matching terminal """
+		self.assertEqual(self.lookup.terminal(var_sub='SUB A.ElmSubstat', var_term='A2.ElmTerm'), 'TERM A 2')
+		self.assertEqual(self.lookup.terminal(var_sub='SUB B.ElmSubstat', var_term='B1.ElmTerm'), 'TERM B')
+		self.assertEqual(self.lookup.terminal(var_sub='SUB C.ElmSubstat', var_term='B1.ElmTerm'), '')
+
+	def test_mutual_terminals(self):
+		""" Tests the mutual terminals match those found by checking every terminal """
+		for var_name in ('TERM A_TERM B', 'TERM A 2_TERM A', 'TERM B DUP_TERM A 2', 'UNKNOWN_TERM B'):
+			term1 = None
+			term2 = None
+			for term in self.terminals.keys():
+				if var_name.startswith(term):
+					term1 = term
+				if var_name.endswith(term):
+					term2 = term
+
+			self.assertEqual(self.lookup.mutual_terminals(var_name=var_name), (term1, term2))
+
+class TestConvexVerticesRegression(unittest.TestCase):
+	"""
+		Tests that limiting the number of vertices returns exactly the same vertices as previously calculated and saved
+		in the reference file
+	"""
+	def setUp(self):
+		""" Import the reference vertices """
+		pth_reference = os.path.join(TESTS_DIR, 'convex_vertices_reference.csv')
+		self.df_reference = pd.read_csv(pth_reference, float_precision='round_trip')
+
+	def test_vertices_match_reference(self):
+		""" Tests that the vertices match for each of the random data sets """
+		for (seed, max_vertices), df_expected in self.df_reference.groupby(['seed', 'max_vertices']):
+			# Reproduce the same random data points used to produce the reference
+			random_state = np.random.RandomState(seed)
+			x_points = random_state.uniform(0.1, 100.0, 80)
+			y_points = random_state.uniform(-50.0, 100.0, 80)
+
+			corners = pscharmonics.file_io.find_convex_vertices(
+				x_values=x_points, y_values=y_points, max_vertices=max_vertices
+			)
+
+			self.assertTrue(np.array_equal(np.array(corners[0]), df_expected['x'].values))
+			self.assertTrue(np.array_equal(np.array(corners[1]), df_expected['y'].values))
+
 class TestCreateConvex(unittest.TestCase):
 	""" Tests that passing R/X data will return ConvexHull around data points """
 
@@ -1030,6 +1402,36 @@ class TestCreateConvex(unittest.TestCase):
 		self.assertTrue(max_values_50[0]<max_values_5[0]<max_values_all[0])
 		self.assertTrue(max_values_50[1]<max_values_5[1]<=max_values_all[1])
 
+	def test_convex_from_data_for_detailed4_data_parallel(self):
+		"""
+			Tests that calculating the convex hulls using worker processes returns the same DataFrame
+		"""
+		# Import the necessary raw data
+		src_paths = (self.results4,)
+		df, extract_vars = self.cls_extract.combine_multiple_runs(search_paths=src_paths)
+
+		# Create target frequency range
+		target_freq_range = dict()
+		percentage_to_exclude = dict()
+		max_vertices = dict()
+		nom_freq = 50.0
+		for h in range(2, 12):
+			target_freq_range[h] = (h*nom_freq - nom_freq / 2.0, h*nom_freq + nom_freq/2.0)
+			percentage_to_exclude[h] = 0.05
+			max_vertices[h] = 5
+
+		df_convex_serial = pscharmonics.file_io.calculate_convex_vertices(
+			df=df, frequency_bounds=target_freq_range, percentage_to_exclude=percentage_to_exclude,
+			max_vertices=max_vertices, workers=1
+		)
+		df_convex_parallel = pscharmonics.file_io.calculate_convex_vertices(
+			df=df, frequency_bounds=target_freq_range, percentage_to_exclude=percentage_to_exclude,
+			max_vertices=max_vertices, workers=2
+		)
+
+		self.assertTrue(df_convex_serial.columns.equals(df_convex_parallel.columns))
+		self.assertTrue(df_convex_serial.equals(df_convex_parallel))
+
 	def test_raw_r_x_values_for_detailed_4(self):
 		"""
 			Confirms that the raw_r and raw_x excel references match up for the data provided
@@ -0,0 +1,75 @@
+"""
+#######################################################################################################################
+###													test_logger.py													###
+###		Test code for writing the log messages to file																###
+###																													###
+#######################################################################################################################
+"""
+
+import unittest
+import os
+import shutil
+
+from tests.context import pscharmonics
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), 'test_files')
+
+
+class TestAsyncLogging(unittest.TestCase):
+	""" Tests the log messages are written by the background thread """
+	def setUp(self):
+		self.pth = os.path.join(TESTS_DIR, 'Async_Logs')
+		os.mkdir(self.pth)
+		self.original_setting = pscharmonics.constants.General.async_logging
+		pscharmonics.constants.General.async_logging = True
+		self.logger = pscharmonics.logger.Logger(
+			pth_debug_log=os.path.join(self.pth, 'DEBUG.log'),
+			pth_progress_log=os.path.join(self.pth, 'INFO.log'),
+			pth_error_log=os.path.join(self.pth, 'ERROR.log'),
+		)
+
+	def tearDown(self):
+		self.logger.close_logging()
+		pscharmonics.constants.General.async_logging = self.original_setting
+		# Logger for the tests shares the same underlying logger and so its handlers are restored
+		pscharmonics.constants.logger.setup_logging()
+		shutil.rmtree(self.pth, ignore_errors=True)
+
+	def test_async_logging(self):
+		""" Messages are formatted and written in the order they were logged once flushed """
+		self.assertTrue(self.logger.listener_running)
+		for i in range(100):
+			self.logger.info('Message {} of {}', i, 100)
+		self.logger.error('Error message')
+		self.logger.flush()
+		self.assertTrue(self.logger.listener_running)
+
+		with open(os.path.join(self.pth, 'INFO.log'), 'r') as f:
+			lines = [x for x in f.readlines() if 'Message' in x]
+		self.assertEqual(len(lines), 100)
+		self.assertTrue(lines[0].endswith('Message 0 of 100\n'))
+		self.assertTrue(lines[-1].endswith('Message 99 of 100\n'))
+		with open(os.path.join(self.pth, 'ERROR.log'), 'r') as f:
+			self.assertIn('Error message', f.read())
+
+		self.logger.close_logging()
+		self.assertFalse(self.logger.listener_running)
+
+	def test_critical_arguments(self):
+		""" Critical messages accept arguments in the same way as the other levels """
+		self.logger.critical('Failed {} of {}', 3, 10)
+		self.logger.flush()
+		self.assertEqual(self.logger.critical_count, 1)
+		with open(os.path.join(self.pth, 'ERROR.log'), 'r') as f:
+			self.assertIn('function <test_critical_arguments> reported Failed 3 of 10', f.read())
+
+	def test_lazy_message(self):
+		""" Message is only formatted when converted to a string """
+		values = list()
+		message = pscharmonics.logger.LazyMessage(msg='Values: {}', args=(values, ))
+		values.append(1)
+		self.assertEqual(str(message), 'Values: [1]')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import os
 import sys
 import pandas as pd
+import numpy as np
 import random
 import string
 import glob
@@ -2190,3 +2191,51 @@ class TestPFDetailedInputs(unittest.TestCase):
 		# Deactivate and then delete the project
 		cls.pf.deactivate_project()
 		cls.pf.delete_object(pf_obj=cls.pf_test_project)
+
+
+class TestProcessContResults(unittest.TestCase):
+	""" Tests the processing of the contingency analysis results without needing PowerFactory """
+	def setUp(self):
+		""" Creates a study case with a contingency results file for a large number of contingencies """
+		c = pscharmonics.constants.Contingencies
+		self.number_of_conts = 10000
+
+		# Contingency numbers in reverse order to the results with a contingency which has no results
+		self.sc = pscharmonics.pf.PFStudyCase.__new__(pscharmonics.pf.PFStudyCase)
+		self.sc.logger = pscharmonics.constants.logger
+		self.sc.name, self.sc.prj, self.sc.sc, self.sc.op = 'Test', 'Prj', 'SC', 'OP'
+		self.df_status = pd.DataFrame({c.idx: range(self.number_of_conts, -1, -1)})
+
+		# Every 7th contingency is non-convergent
+		numbers = np.arange(self.number_of_conts, dtype=float)
+		non_convergent = (numbers % 7 == 0).astype(float)
+		res = pscharmonics.pf_mock.new_object(pfclass='ElmRes', name='Contingency Results')
+		res.variables = [(res, c.col_number), (res, c.col_nonconvergent)]
+		# The final row of the results file is not included in the results
+		res.values = np.column_stack((numbers, non_convergent))
+		res.values = np.vstack((res.values, [-1.0, 0.0]))
+		res.frequencies = np.zeros(self.number_of_conts + 1)
+		self.sc.cont_results = res
+
+	def test_status(self):
+		""" Confirms the status of every contingency is populated from the results """
+		c = pscharmonics.constants.Contingencies
+		df = self.sc.process_cont_results(df_status=self.df_status).set_index(c.idx)
+		# Status table provided is not modified
+		self.assertNotIn(c.status, self.df_status.columns)
+
+		self.assertEqual(df[c.status].dtype, bool)
+		self.assertFalse(df.loc[0, c.status])
+		self.assertTrue(df.loc[1, c.status])
+		self.assertFalse(df.loc[7, c.status])
+		# Contingency with no results is not convergent
+		self.assertFalse(df.loc[self.number_of_conts, c.status])
+		self.assertEqual(df[c.status].sum(), self.number_of_conts - len(range(0, self.number_of_conts, 7)))
+
+	def test_no_results(self):
+		""" Confirms every contingency is not convergent if there are no results """
+		c = pscharmonics.constants.Contingencies
+		self.sc.cont_results.variables = list()
+		self.sc.cont_results.values = None
+		df = self.sc.process_cont_results(df_status=self.df_status)
+		self.assertFalse(df[c.status].any())
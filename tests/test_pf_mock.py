@@ -0,0 +1,656 @@
+"""
+#######################################################################################################################
+###													test_pf_mock.py													###
+###		Test code for the mock PowerFactory engine used to run the study pipeline without PowerFactory				###
+###																													###
+#######################################################################################################################
+"""
+
+import unittest
+import unittest.mock
+import os
+import collections
+import glob
+import json
+import time
+import shutil
+import sys
+import pandas as pd
+import numpy as np
+import openpyxl
+
+from tests.context import pscharmonics
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), 'test_files')
+
+
+class TestMockDatabase(unittest.TestCase):
+	""" Tests the DataObject tree replicates the PowerFactory behaviour relied upon by pf.py """
+	def setUp(self):
+		""" Create a new project with a single substation """
+		pscharmonics.pf_mock.reset()
+		self.app = pscharmonics.pf_mock.GetApplicationExt()
+		self.prj = pscharmonics.pf_mock.create_project(name='test_project')
+		self.app.ActivateProject('test_project')
+		self.net_data = self.app.GetProjectFolder(pscharmonics.constants.PowerFactory.pf_netdata_folder_type)
+		grid = self.net_data.GetContents('*.ElmNet')[0]
+		sub = grid.CreateObject('ElmSubstat', 'SUB 132KV')
+		sub.CreateObject('ElmTerm', 'BUS 1')
+		sub.CreateObject('ElmTerm', 'BUS 2')
+		sub.CreateObject('ElmCoup', 'CB1')
+
+	def tearDown(self):
+		pscharmonics.pf_mock.reset()
+
+	def test_get_contents_wildcards(self):
+		""" Confirms wildcards, class endings, recursive searches and relative paths are supported """
+		self.assertEqual(len(self.net_data.GetContents('*.ElmTerm')), 0)
+		self.assertEqual(len(self.net_data.GetContents('*.ElmTerm', 1)), 2)
+		self.assertEqual(len(self.net_data.GetContents('BUS ?.ElmTerm', 1)), 2)
+		self.assertEqual(len(self.net_data.GetContents('CB1', 1)), 1)
+		self.assertEqual(len(self.app.GetCurrentUser().GetContents('Set\\Def\\Settings.SetUser')), 1)
+		self.assertEqual(self.app.GetActiveProject(), self.prj)
+
+	def test_add_copy_updates_references(self):
+		""" Confirms that references between objects within a copied study case refer to the copies """
+		sc_folder = self.app.GetProjectFolder(pscharmonics.constants.PowerFactory.pf_sc_folder_type)
+		sc = sc_folder.CreateObject('IntCase', 'Base')
+		res = sc.CreateObject('ElmRes', 'Results')
+		fs = sc.CreateObject('ComFsweep', 'Sweep')
+		fs.p_resvar = res
+
+		new_sc = sc_folder.AddCopy(sc, 'Copy')
+		new_fs = new_sc.GetContents('*.ComFsweep')[0]
+
+		self.assertEqual(new_sc.loc_name, 'Copy')
+		self.assertIs(new_fs.p_resvar, new_sc.GetContents('*.ElmRes')[0])
+		self.assertIs(fs.p_resvar, res)
+		# Copying again with the same name should not clash
+		self.assertEqual(sc_folder.AddCopy(sc, 'Copy').loc_name, 'Copy(1)')
+
+	def test_execute_latency(self):
+		""" Confirms the configured latency is applied when executing a command """
+		sc_folder = self.app.GetProjectFolder(pscharmonics.constants.PowerFactory.pf_sc_folder_type)
+		ldf = sc_folder.CreateObject('IntCase', 'Base').CreateObject('ComLdf', 'Load Flow')
+
+		original = dict(pscharmonics.constants.PowerFactory.mock_latency_by_class)
+		pscharmonics.constants.PowerFactory.mock_latency_by_class['ComLdf'] = 0.05
+		try:
+			t0 = time.time()
+			error = ldf.Execute()
+			self.assertEqual(error, 0)
+			self.assertGreaterEqual(time.time() - t0, 0.05)
+		finally:
+			pscharmonics.constants.PowerFactory.mock_latency_by_class = original
+
+	def test_results_export_layout(self):
+		""" Confirms the exported results can be read back in the same way as results exported by PowerFactory """
+		c = pscharmonics.constants.PowerFactory
+		sc_folder = self.app.GetProjectFolder(c.pf_sc_folder_type)
+		sc = sc_folder.CreateObject('IntCase', 'Base')
+		res = sc.CreateObject('ElmRes', 'Results')
+		terminal = self.net_data.GetContents('BUS 1.ElmTerm', 1)[0]
+		for var in (c.pf_nom_voltage, c.pf_z1, c.pf_r1, c.pf_x1):
+			res.AddVariable(terminal, var)
+
+		fs = sc.CreateObject('ComFsweep', 'Sweep')
+		fs.fstart, fs.fstop, fs.fstep = 50.0, 1000.0, 10.0
+		fs.p_resvar = res
+		pth = os.path.join(TESTS_DIR, 'FS_Mock_Export.csv')
+		self.addCleanup(lambda: os.path.isfile(pth) and os.remove(pth))
+
+		export = sc.CreateObject('ComRes', 'Export')
+		export.SetAttribute('pResult', res)
+		export.SetAttribute('f_name', pth)
+		self.assertEqual(fs.Execute(), 0)
+		self.assertEqual(export.Execute(), 0)
+
+		df = pd.read_csv(pth, header=[0, 1])
+		self.assertEqual(df.shape, (96, 6))
+		self.assertEqual(df.columns[0][1], c.pf_harm)
+		self.assertEqual(df.columns[-1][1], c.pf_freq)
+		self.assertEqual(df.columns[2], (str(terminal), 'm:Z in Ohm'))
+		# Impedance magnitude consistent with the R and X values
+		z = (df.iloc[:, 3] ** 2 + df.iloc[:, 4] ** 2) ** 0.5
+		self.assertTrue(((z - df.iloc[:, 2]).abs() < 1e-5).all())
+
+
+class TestRetrieveResults(unittest.TestCase):
+	""" Tests the results are read from a results file in the same way with and without the column getter """
+	def setUp(self):
+		pscharmonics.pf_mock.reset()
+		c = pscharmonics.constants.PowerFactory
+		self.app = pscharmonics.pf_mock.GetApplicationExt()
+		prj = pscharmonics.pf_mock.create_project(name='test_project')
+		prj.Activate()
+		grid = self.app.GetProjectFolder(c.pf_netdata_folder_type).GetContents('*.ElmNet')[0]
+		sub = grid.CreateObject('ElmSubstat', 'SUB 132KV')
+		sc = self.app.GetProjectFolder(c.pf_sc_folder_type).CreateObject('IntCase', 'Base')
+		self.res = sc.CreateObject('ElmRes', 'Results')
+		for name in ('BUS 1', 'BUS 2'):
+			terminal = sub.CreateObject('ElmTerm', name)
+			for var in (c.pf_z1, c.pf_r1):
+				self.res.AddVariable(terminal, var)
+		self.res.sweep(frequencies=np.arange(50.0, 550.0, 50.0), frnom=50.0)
+
+	def tearDown(self):
+		pscharmonics.pf_mock.reset()
+
+	def test_bulk_matches_cell_values(self):
+		""" DataFrame produced using the column getter is identical to reading each value """
+		df_bulk = pscharmonics.pf.retrieve_results(elmres=self.res, res_type=0, write_as_df=True)
+		# Without the column getter each value is read individually
+		self.res.GetColumnValues = None
+		df_cells = pscharmonics.pf.retrieve_results(elmres=self.res, res_type=0, write_as_df=True)
+
+		pd.testing.assert_frame_equal(df_bulk, df_cells)
+		# Duplicated variable names are combined into a single column and the final row is not included
+		self.assertEqual(df_bulk.shape, (9, 2))
+		self.assertEqual(df_bulk.iloc[0, 0], self.res.values[0, 2])
+
+	def test_column_getter(self):
+		""" Column getter fills the list provided and returns an error code for a column which does not exist """
+		self.res.Load()
+		values = list()
+		self.assertEqual(self.res.GetColumnValues(values, 1), 0)
+		self.assertEqual(values, self.res.values[:, 1].tolist())
+		self.assertEqual(self.res.GetColumnValues(list(), self.res.GetNumberOfColumns()), 1)
+
+		values, bulk = pscharmonics.pf.get_column_values(elmres=self.res, col=1, rno=self.res.GetNumberOfRows())
+		self.assertTrue(bulk)
+		np.testing.assert_array_equal(values, self.res.values[:, 1])
+
+	def test_lists(self):
+		""" Scale and results are returned as lists including the variable and object names """
+		scale, results = pscharmonics.pf.retrieve_results(elmres=self.res, res_type=0)
+		self.assertEqual(len(results), 4)
+		self.assertEqual(results[0][:2], [pscharmonics.constants.PowerFactory.pf_z1, str(self.res.variables[0][0])])
+		self.assertEqual(scale[2:], self.res.frequencies.tolist())
+		_, results = pscharmonics.pf.retrieve_results(elmres=self.res, res_type=1)
+		self.assertEqual(len(results), 3)
+
+
+class TestMockInitialisation(unittest.TestCase):
+	""" Tests that the mock engine is used by pf.PowerFactory when selected """
+	def setUp(self):
+		pscharmonics.constants.PowerFactory.mock_engine = True
+		pscharmonics.pf_mock.reset()
+
+	def tearDown(self):
+		pscharmonics.constants.PowerFactory.mock_engine = False
+		pscharmonics.pf.app = None
+		pscharmonics.pf.powerfactory = None
+		pscharmonics.constants.logger.app = None
+		pscharmonics.pf_mock.reset()
+
+	def test_initialise_mock_engine(self):
+		""" PowerFactory can be initialised and a project activated without an installation """
+		pscharmonics.pf_mock.create_project(name='mock_project')
+		pf = pscharmonics.pf.PowerFactory()
+		pf.initialise_power_factory()
+
+		self.assertIs(pscharmonics.pf.powerfactory, pscharmonics.pf_mock)
+		self.assertIs(pscharmonics.pf.app, pscharmonics.pf_mock.GetApplicationExt())
+		self.assertIsNotNone(pf.activate_project(project_name='mock_project'))
+		self.assertIsNone(pf.activate_project(project_name='missing_project'))
+
+
+class TestMockProject(unittest.TestCase):
+	""" Tests the status tables produced by PFProject using the mock engine """
+	def setUp(self):
+		pscharmonics.constants.PowerFactory.mock_engine = True
+		pscharmonics.pf_mock.reset()
+		c = pscharmonics.constants.PowerFactory
+
+		# Project with two terminals, a study case and an operating scenario
+		pscharmonics.pf_mock.create_project(name='mock_project').Activate()
+		app = pscharmonics.pf_mock.GetApplicationExt()
+		grid = app.GetProjectFolder(c.pf_netdata_folder_type).GetContents('*.ElmNet')[0]
+		for sub_name, term_name, breaker_name in (('SUB A 132KV', 'BUS 1', 'CB1'), ('SUB B 132KV', 'BUS 2', 'CB2')):
+			substation = grid.CreateObject(c.pf_substation, sub_name)
+			substation.CreateObject(c.pf_terminal, term_name)
+			substation.CreateObject(c.pf_coupler, breaker_name).on_off = 1
+		grid.CreateObject(c.pf_line, 'Line 1')
+		sc = app.GetProjectFolder(c.pf_sc_folder_type).CreateObject(c.pf_case, 'Base')
+		sc.CreateObject(c.ldf_command, 'Load Flow Calculation')
+		sc.CreateObject(c.fs_command, 'Frequency Sweep')
+		app.GetProjectFolder(c.pf_os_folder_type).CreateObject(c.pf_scenario, 'Op')
+
+		pscharmonics.pf.PowerFactory().initialise_power_factory()
+		df_studycases = pd.DataFrame(
+			[['BASE', 'mock_project', 'Base', 'Op']], columns=pscharmonics.constants.StudySettings.studycase_columns
+		).set_index(pscharmonics.constants.StudySettings.name, drop=False)
+		self.project = pscharmonics.pf.PFProject(name='mock_project', df_studycases=df_studycases, uid='TEST')
+
+		self.terminals = collections.OrderedDict()
+		for name, sub_name, term_name, include_mutual in (
+				('A', 'SUB A 132KV', 'BUS 1', True),
+				('B', 'SUB B 132KV', 'BUS 2', False),
+				('C', 'SUB C 132KV', 'BUS 3', True),
+		):
+			self.terminals[name] = pscharmonics.file_io.TerminalDetails(
+				name=name, substation=sub_name, terminal=term_name, include_mutual=include_mutual
+			)
+
+		# Contingencies for a circuit breaker, a line, a non-convergent circuit breaker and a missing circuit breaker
+		self.contingencies = collections.OrderedDict()
+		for name, cb_inputs, line_inputs in (
+				('Cont 1', ['SUB A 132KV', 'CB1', 'Open'], list()),
+				('Cont 2', list(), ['Line 1', 'Out of Service']),
+				('Cont 3', ['SUB B 132KV', 'CB2', 'Open'], list()),
+				('Cont 4', ['SUB B 132KV', 'CB9', 'Open'], list()),
+		):
+			self.contingencies[name] = {
+				pscharmonics.constants.Contingencies.cb: pscharmonics.file_io.ContingencyDetails([name] + cb_inputs),
+				pscharmonics.constants.Contingencies.lines: pscharmonics.file_io.ContingencyDetails(
+					[name] + line_inputs, line_data=True
+				),
+			}
+		self.original_settings = (
+			pscharmonics.constants.Contingencies.batch_pre_case, pscharmonics.constants.PowerFactory.mock_nonconvergent,
+			pscharmonics.constants.Contingencies.cache_pre_case, pscharmonics.constants.Contingencies.pre_case_cache_file
+		)
+		pscharmonics.constants.PowerFactory.mock_nonconvergent = ('Cont 3', )
+		self.pth_cache = os.path.join(TESTS_DIR, 'Mock_PreCaseCache', 'pre_case_cache.json')
+
+	def tearDown(self):
+		pscharmonics.constants.PowerFactory.mock_engine = False
+		(
+			pscharmonics.constants.Contingencies.batch_pre_case, pscharmonics.constants.PowerFactory.mock_nonconvergent,
+			pscharmonics.constants.Contingencies.cache_pre_case, pscharmonics.constants.Contingencies.pre_case_cache_file
+		) = self.original_settings
+		shutil.rmtree(os.path.dirname(self.pth_cache), ignore_errors=True)
+		pscharmonics.pf.app = None
+		pscharmonics.pf.powerfactory = None
+		pscharmonics.constants.logger.app = None
+		pscharmonics.pf_mock.reset()
+
+	def test_find_terminals(self):
+		""" Every input terminal and mutual element is included in the status table """
+		c = pscharmonics.constants.Terminals
+		df = self.project.find_terminals(terminals_to_include=self.terminals, include_mutual=True)
+
+		self.assertEqual(list(df.index), ['A', 'B', 'C', 'A_B'])
+		self.assertEqual(list(df[c.status]), [True, True, False, True])
+		self.assertEqual(df.loc['A_B', c.bus2], 'BUS 2')
+		self.assertEqual(df.loc['C', c.sub1], 'SUB C 132KV')
+		self.assertEqual(list(self.project.mutuals.keys()), ['A_B'])
+
+	def test_element_lookup(self):
+		""" Elements are found from a single index for each class which is shared with the study cases """
+		c = pscharmonics.constants.PowerFactory
+		lookup = self.project.element_lookup
+		self.assertIs(self.project.base_sc['BASE'].element_lookup, lookup)
+
+		substation = self.project.find_element(element_name='SUB A 132KV')
+		self.assertEqual(substation.loc_name, 'SUB A 132KV')
+		self.assertEqual(list(lookup.index.keys()), [(c.pf_substation, 0)])
+		self.assertEqual(
+			self.project.base_sc['BASE'].find_element(
+				element_name='Line 1', ending=(c.pf_line, c.pf_branch), recursive=1
+			).loc_name,
+			'Line 1'
+		)
+		self.assertEqual(len(lookup.index), 3)
+
+		# Elements created after the index are still found
+		grid = self.project.net_data_items[0]
+		grid.CreateObject(c.pf_substation, 'SUB C 132KV')
+		self.assertEqual(self.project.find_element(element_name='SUB C 132KV').loc_name, 'SUB C 132KV')
+		self.assertIsNone(self.project.find_element(element_name='SUB D 132KV'))
+
+		lookup.clear()
+		self.assertEqual(lookup.index, dict())
+
+	def test_pre_case_check(self):
+		""" Status of the intact case is included in the pre-case check """
+		c = pscharmonics.constants.Contingencies
+		df = self.project.pre_case_check(include_intact=True)
+
+		self.assertEqual(df.shape, (1, 6))
+		self.assertEqual(list(df.columns), [c.cont, c.status, c.already_run, c.prj, c.sc, c.op])
+		self.assertTrue(df[c.status].iloc[0])
+		self.assertFalse(df[c.already_run].iloc[0])
+		self.assertEqual(df[c.prj].iloc[0], 'mock_project')
+
+	def test_pre_case_check_load_flows(self):
+		""" Convergence of each contingency is found by running a load flow for each contingency case """
+		c = pscharmonics.constants.Contingencies
+		df = self.project.pre_case_check(contingencies=self.contingencies, include_intact=True)
+
+		self.assertEqual(list(df[c.cont]), [c.intact, 'Cont 1', 'Cont 2', 'Cont 3', 'Cont 4'])
+		self.assertEqual(list(df[c.status]), [True, True, True, False, False])
+		self.assertIsNone(self.project.base_sc['BASE'].cont_analysis)
+
+	def test_pre_case_check_batch(self):
+		""" Convergence from a single contingency analysis matches the load flow for each contingency case """
+		c = pscharmonics.constants.Contingencies
+		c.batch_pre_case = True
+		df = self.project.pre_case_check(contingencies=self.contingencies, include_intact=True)
+
+		self.assertEqual(list(df[c.cont]), [c.intact, 'Cont 1', 'Cont 2', 'Cont 3', 'Cont 4'])
+		self.assertEqual(list(df[c.status]), [True, True, True, False, False])
+
+		base_case = self.project.base_sc['BASE']
+		# Temporary contingency analysis command is deleted
+		self.assertEqual(len(base_case.sc.GetContents('{}.{}'.format(
+			pscharmonics.constants.General.cmd_cont_leader, pscharmonics.constants.PowerFactory.pf_cont_analysis
+		))), 0)
+
+		# The missing circuit breaker is not included in the contingency analysis
+		with unittest.mock.patch.object(
+				pscharmonics.pf_mock.ComSimoutage, 'Delete', autospec=True, return_value=0
+		) as delete:
+			df_status = base_case.batch_pre_case_check(contingencies=self.contingencies)
+		cont_analysis = delete.call_args[0][0]
+		fault_cases = cont_analysis.GetContents('*.{}'.format(pscharmonics.constants.PowerFactory.pf_outage))
+		self.assertEqual([x.loc_name for x in fault_cases], ['Cont 1', 'Cont 2', 'Cont 3'])
+		self.assertEqual(fault_cases[0].GetContents('*')[0].p_target.loc_name, 'CB1')
+		self.assertEqual(fault_cases[1].GetContents('*')[0].p_target.loc_name, 'Line 1')
+
+		# Status table is returned and includes the contingency which could not be applied
+		self.assertEqual(list(df_status[c.cont]), ['Cont 1', 'Cont 2', 'Cont 3', 'Cont 4'])
+		self.assertEqual(list(df_status[c.idx]), [1, 2, 3, 0])
+		self.assertEqual(list(df_status[c.status]), [True, True, False, False])
+
+		# Other than the base case, study cases are only created for the convergent contingencies
+		created = [x.loc_name for x in self.project.sc_folder.GetContents('*.{}'.format(
+			pscharmonics.constants.PowerFactory.pf_case
+		))]
+		self.assertEqual(created, ['BASE', 'BASE_Cont 1', 'BASE_Cont 2'])
+		self.assertEqual(df.loc[('BASE', 'Cont 3'), c.sc], 'BASE_Cont 3')
+
+	def test_pre_case_check_completed(self):
+		""" Cases which already have results are reported as already run without being created or checked """
+		c = pscharmonics.constants.Contingencies
+		df = self.project.pre_case_check(
+			contingencies=self.contingencies, include_intact=True, completed={'BASE_Intact', 'BASE_Cont 1'}
+		)
+
+		self.assertEqual(list(df[c.cont]), [c.intact, 'Cont 1', 'Cont 2', 'Cont 3', 'Cont 4'])
+		self.assertEqual(list(df[c.already_run]), [True, True, False, False, False])
+		self.assertEqual(list(df[c.status]), [True, True, True, False, False])
+
+		# No study case is created for the contingency which has already been run
+		created = [x.loc_name for x in self.project.sc_folder.GetContents('*.{}'.format(
+			pscharmonics.constants.PowerFactory.pf_case
+		))]
+		self.assertNotIn('BASE_Cont 1', created)
+		self.assertIn('BASE_Cont 2', created)
+
+	def test_pre_case_check_cache(self):
+		""" Convergence is reused from a previous pre-case check unless the models have been modified """
+		c = pscharmonics.constants.Contingencies
+		c.cache_pre_case = True
+		c.pre_case_cache_file = self.pth_cache
+		app = pscharmonics.pf_mock.GetApplicationExt()
+		line_type = app.GetProjectFolder(
+			pscharmonics.constants.PowerFactory.pf_type_library_folder_type
+		).CreateObject('TypLne', 'Type 1')
+		df = self.project.pre_case_check(contingencies=self.contingencies, include_intact=True)
+		self.assertTrue(os.path.isfile(self.pth_cache))
+		self.project.delete_temp_folders()
+
+		def new_project():
+			return pscharmonics.pf.PFProject(
+				name='mock_project', df_studycases=self.project.df_sc, uid='TEST2'
+			)
+
+		# Every contingency now converges but the cached status is used since nothing has changed
+		pscharmonics.constants.PowerFactory.mock_nonconvergent = tuple()
+		project = new_project()
+		df_cached = project.pre_case_check(contingencies=self.contingencies, include_intact=True)
+		self.assertEqual(list(df_cached[c.status]), list(df[c.status]))
+		self.assertEqual(list(df_cached[c.status]), [True, True, True, False, False])
+		project.delete_temp_folders()
+
+		# Modifying a type in the type library means the pre-case check is repeated
+		app.active_scenario = None
+		line_type.uline = 132.0
+		project = new_project()
+		df_new = project.pre_case_check(contingencies=self.contingencies, include_intact=True)
+		self.assertEqual(list(df_new[c.status]), [True, True, True, True, False])
+		project.delete_temp_folders()
+
+		# As does modifying an element within the grid
+		pscharmonics.constants.PowerFactory.mock_nonconvergent = ('Cont 1', )
+		app.active_scenario = None
+		line = self.project.find_element(
+			element_name='Line 1', ending=(pscharmonics.constants.PowerFactory.pf_line, ), recursive=1
+		)
+		line.dline = 2.0
+		df_new = new_project().pre_case_check(contingencies=self.contingencies, include_intact=True)
+		self.assertEqual(list(df_new[c.status]), [True, False, True, True, False])
+
+	def test_pre_case_cache_size(self):
+		""" Only the most recently used entries are kept in the pre-case check cache """
+		cache = pscharmonics.pf.PreCaseCache(pth=self.pth_cache, max_entries=2)
+		cases = [self.project.base_sc['BASE']]
+		for fingerprint in ('A', 'B', 'C'):
+			cache.update(fingerprint=fingerprint, cases=cases)
+			time.sleep(0.01)
+		self.assertIsNotNone(cache.get('A'))
+		cache.save()
+
+		cache = pscharmonics.pf.PreCaseCache(pth=self.pth_cache, max_entries=2)
+		self.assertEqual(sorted(cache.entries), ['A', 'C'])
+		self.assertEqual(cache.get('A'), {'Intact': False})
+
+	def test_pre_case_check_batch_cmd(self):
+		""" Fault cases in the contingencies command are copied before being renumbered """
+		c = pscharmonics.constants.Contingencies
+		c.batch_pre_case = True
+		cont_cmd = self.project.base_sc['BASE'].sc.CreateObject(
+			pscharmonics.constants.PowerFactory.pf_cont_analysis, 'Contingency Analysis'
+		)
+		for name in ('Cont 1', 'Cont 3'):
+			cont_cmd.CreateObject(pscharmonics.constants.PowerFactory.pf_outage, name)
+
+		df = self.project.pre_case_check(contingencies_cmd='Contingency Analysis')
+
+		self.assertEqual(list(df[c.cont]), ['Cont 1', 'Cont 3'])
+		self.assertEqual(list(df[c.status]), [True, False])
+		self.assertEqual([x.number for x in cont_cmd.GetContents('*')], [0, 0])
+
+
+class TestMockBatchRun(unittest.TestCase):
+	""" Runs the complete batch mode study using the mock engine """
+	def setUp(self):
+		pscharmonics.constants.PowerFactory.mock_engine = True
+		pscharmonics.pf_mock.reset()
+		self.target_export_pth = os.path.join(TESTS_DIR, 'Mock_Batch_Test')
+		if os.path.isdir(self.target_export_pth):
+			shutil.rmtree(self.target_export_pth)
+		os.mkdir(self.target_export_pth)
+
+	def tearDown(self):
+		pscharmonics.constants.PowerFactory.mock_engine = False
+		pscharmonics.pf.app = None
+		pscharmonics.pf.powerfactory = None
+		pscharmonics.constants.logger.app = None
+		pscharmonics.pf_mock.reset()
+		shutil.rmtree(self.target_export_pth, ignore_errors=True)
+
+	def test_batch_mode(self):
+		""" Confirms that the results for every case are exported and combined into the results workbook """
+		pscharmonics.constants.uid = 'Test_Mock'
+		target_results_filename = 'Results_{}.xlsx'.format(pscharmonics.constants.uid)
+
+		inputs = pscharmonics.file_io.StudyInputs(pth_file=os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'))
+		inputs.settings.export_folder = self.target_export_pth
+		inputs.settings.results_name = target_results_filename
+
+		# Populate the mock database with everything referred to in the inputs
+		pscharmonics.pf_mock.create_project_from_inputs(inputs=inputs)
+
+		events = list()
+		success = pscharmonics.batch_mode.run(test_settings=inputs, progress_callback=events.append)
+		self.assertTrue(success)
+
+		# Results file for the intact case and each contingency
+		results_folder = os.path.join(self.target_export_pth, os.path.splitext(target_results_filename)[0])
+		self.assertTrue(os.path.isfile(os.path.join(results_folder, 'FS_BASE_Intact.csv')))
+		self.assertTrue(os.path.isfile(os.path.join(self.target_export_pth, target_results_filename)))
+
+		# Timing report is written to the results folder and alongside the results workbook
+		self.assertTrue(os.path.isfile(os.path.join(results_folder, 'Timings.csv')))
+		with open(os.path.join(self.target_export_pth, 'Results_Test_Mock_Timings.json'), 'r') as f:
+			report = json.load(f)
+		for stage in (
+				'PFProject.create_cases', 'PFStudyCase.apply_outage', 'PFStudyCase.create_studies',
+				'PFProject.run_parallel_tasks', 'run_studies', 'PreviousResultsExport.import_all_results',
+				'ExtractResults.extract_results'
+		):
+			self.assertIn(stage, report['summary'])
+
+		# Progress is reported for importing the results and exporting each node, ending with every item completed
+		for stage in (pscharmonics.progress.stage_ingest, pscharmonics.progress.stage_export):
+			stage_events = [x for x in events if x.stage == stage]
+			self.assertGreater(len(stage_events), 1)
+			self.assertEqual(stage_events[-1].done, stage_events[-1].total)
+		self.assertNotIn(events.append, pscharmonics.progress.listeners)
+
+	def test_batch_mode_resume(self):
+		""" Confirms that only the cases with missing or incomplete results are run again when resuming """
+		c = pscharmonics.constants
+
+		# Inputs workbook which exports to the test folder
+		pth_inputs = os.path.join(self.target_export_pth, 'Inputs_Resume.xlsx')
+		wkbk = openpyxl.load_workbook(os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'))
+		sht = wkbk[c.StudyInputs.study_settings]
+		sht['B5'] = self.target_export_pth
+		sht['B6'] = 'Results_Resume'
+		wkbk.save(pth_inputs)
+		pscharmonics.pf_mock.create_project_from_inputs(inputs=pscharmonics.file_io.StudyInputs(pth_file=pth_inputs))
+
+		# test_excel_settings replaces process_export_folder for all tests and so the folder from the workbook is
+		# used directly
+		export_folder = unittest.mock.patch.object(
+			pscharmonics.file_io.StudySettings, 'process_export_folder',
+			new=lambda _self, *args, **kwargs: _self.df.loc[_self.c.export_folder]
+		)
+
+		original_resume = c.Results.resume_studies
+		c.Results.resume_studies = True
+		try:
+			export_folder.start()
+			c.uid = 'Test_Mock_Resume'
+			self.assertTrue(pscharmonics.batch_mode.run(pth_inputs=pth_inputs))
+
+			# Results name does not include the time stamp so a second run finds the same folder
+			results_folder = os.path.join(self.target_export_pth, 'Results_Resume')
+			files = sorted(glob.glob(os.path.join(results_folder, 'FS_*.csv')))
+			self.assertGreater(len(files), 2)
+
+			# One results file is deleted and another only includes the headers
+			os.remove(files[0])
+			with open(files[1], 'r') as f:
+				headers = [next(f), next(f)]
+			with open(files[1], 'w') as f:
+				f.writelines(headers)
+			modified_times = {x: os.path.getmtime(x) for x in files[2:]}
+
+			# Inputs are loaded from the workbook again as they would be for a new run
+			c.uid = 'Test_Mock_Resume_2'
+			self.assertTrue(pscharmonics.batch_mode.run(pth_inputs=pth_inputs))
+		finally:
+			export_folder.stop()
+			c.Results.resume_studies = original_resume
+
+		self.assertTrue(os.path.isfile('{}{}'.format(results_folder, c.Results.extension)))
+
+		# Cases with complete results are also excluded from the pre-case check
+		df_pre_case = pd.read_excel(
+			os.path.join(self.target_export_pth, 'Pre Case Check_{}.xlsx'.format(c.uid)),
+			sheet_name=c.Contingencies.export_sheet_name
+		)
+		self.assertEqual(int(df_pre_case[c.Contingencies.already_run].sum()), len(files) - 2)
+
+		self.assertEqual(sorted(glob.glob(os.path.join(results_folder, 'FS_*.csv'))), files)
+		fs_settings = pscharmonics.file_io.StudyInputs(pth_file=pth_inputs).fs_settings
+		completed = pscharmonics.pf.find_completed_results(pth=results_folder, fs_settings=fs_settings)
+		self.assertEqual(completed, set(os.path.splitext(os.path.basename(x))[0][3:] for x in files))
+		self.assertEqual({x: os.path.getmtime(x) for x in files[2:]}, modified_times)
+
+	def test_batch_mode_concurrent_projects(self):
+		""" Confirms that the studies for each project are run in separate engines and the results combined """
+		c = pscharmonics.constants
+		c.uid = 'Test_Mock_Concurrent'
+		target_results_filename = 'Results_{}.xlsx'.format(c.uid)
+
+		inputs = pscharmonics.file_io.StudyInputs(pth_file=os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'))
+		inputs.settings.export_folder = self.target_export_pth
+		inputs.settings.results_name = target_results_filename
+
+		# Second project with the same study case
+		case = inputs.cases.iloc[0].copy()
+		case[c.StudySettings.name] = 'SECOND'
+		case[c.StudySettings.project] = 'second_mock_project'
+		inputs.cases.loc['SECOND'] = case
+		pscharmonics.pf_mock.create_project_from_inputs(inputs=inputs)
+
+		original_max_engines = c.PowerFactory.max_engines
+		c.PowerFactory.max_engines = 0
+		try:
+			success = pscharmonics.batch_mode.run(test_settings=inputs)
+		finally:
+			c.PowerFactory.max_engines = original_max_engines
+		self.assertTrue(success)
+
+		results_folder = os.path.join(self.target_export_pth, os.path.splitext(target_results_filename)[0])
+		for name in ('BASE', 'SECOND'):
+			self.assertTrue(os.path.isfile(os.path.join(results_folder, 'FS_{}_Intact.csv'.format(name))))
+
+	def test_run_project_worker(self):
+		""" Worker creates its own logger and uses the pre-case check results from the main process """
+		c = pscharmonics.constants
+		c.uid = 'Test_Mock_Worker'
+		inputs = pscharmonics.file_io.StudyInputs(pth_file=os.path.join(TESTS_DIR, 'Inputs_Detailed5.xlsx'))
+		inputs.settings.export_folder = self.target_export_pth
+		project_name = inputs.cases[c.StudySettings.project].iloc[0]
+
+		# Worker replaces the logger for the process and so this is restored afterwards
+		original_logger = c.logger
+		named_logger = original_logger.logger
+		original_handlers, original_propagate = list(named_logger.handlers), named_logger.propagate
+		# Settings from the main process are applied by the worker and so are also restored afterwards
+		original_settings = pscharmonics.pf.worker_settings()
+		settings = dict(original_settings)
+		settings['Contingencies.batch_pre_case'] = True
+		settings['Results.resume_studies'] = True
+		try:
+			summary = pscharmonics.pf.run_project_worker(
+				project_name=project_name, inputs=inputs, uid=c.uid, settings=settings,
+				convergence={'BASE': {c.Contingencies.intact: True}}
+			)
+			worker_logger = c.logger
+			worker_settings = pscharmonics.pf.worker_settings()
+		finally:
+			c.logger = original_logger
+			named_logger.handlers, named_logger.propagate = original_handlers, original_propagate
+			pscharmonics.pf.apply_worker_settings(settings=original_settings)
+
+		self.assertIsNot(worker_logger, original_logger)
+		self.assertEqual(worker_settings, settings)
+		self.assertFalse(c.Contingencies.batch_pre_case)
+		self.assertTrue(summary['success'])
+		self.assertTrue(any('Pre-case check results from the main process' in msg for _, msg in summary['logs']))
+		# Only the intact case is convergent in the results provided and so no contingency cases are run
+		self.assertEqual([os.path.basename(x) for x in summary['results']], ['FS_BASE_Intact.csv'])
+
+	def test_worker_executable(self):
+		""" PowerFactory is not used as the interpreter for worker processes """
+		self.assertEqual(pscharmonics.pf.worker_executable(), sys.executable)
+
+		original_executable = sys.executable
+		sys.executable = os.path.join('C:\\', 'DIgSILENT', 'PowerFactory 2020', 'PowerFactory.exe')
+		try:
+			executable = pscharmonics.pf.worker_executable()
+		finally:
+			sys.executable = original_executable
+		if executable is not None:
+			self.assertEqual(os.path.basename(executable), 'python.exe')
+
+
+if __name__ == '__main__':
+	unittest.main()
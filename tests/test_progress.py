@@ -0,0 +1,77 @@
+"""
+#######################################################################################################################
+###													test_progress.py												###
+###		Test code for the progress events reported for each stage of the results processing						###
+###																													###
+#######################################################################################################################
+"""
+
+import unittest
+
+from tests.context import pscharmonics
+
+
+class TestProgress(unittest.TestCase):
+	""" Tests the progress events sent to the logger and listeners """
+	def setUp(self):
+		self.events = list()
+		self.logged = list()
+		self.logger = pscharmonics.constants.logger
+		# Record the events sent to the logger rather than writing them to the log files
+		self.original_progress = self.logger.progress
+		self.logger.progress = self.logged.append
+
+	def tearDown(self):
+		self.logger.progress = self.original_progress
+		pscharmonics.progress.remove_listener(self.events.append)
+
+	def test_events(self):
+		""" Events detail the number of items completed, the rate and the time remaining """
+		with pscharmonics.progress.listening(self.events.append):
+			tracker = pscharmonics.progress.Progress(stage='Test', total=4)
+			tracker.update(item='A')
+			tracker.update(item='B', count=3)
+
+		# Start of the stage is sent to listeners but not logged
+		self.assertEqual([x.done for x in self.events], [0, 1, 4])
+		self.assertEqual([x.item for x in self.events], ['', 'A', 'B'])
+		self.assertEqual([x.item for x in self.logged], ['A', 'B'])
+		self.assertIsNone(self.events[0].eta)
+		self.assertTrue(all(x.total == 4 and x.stage == 'Test' for x in self.events))
+
+		event = self.events[1]
+		self.assertAlmostEqual(event.rate, event.done / event.elapsed)
+		self.assertAlmostEqual(event.eta, (event.total - event.done) / event.rate)
+		self.assertEqual(self.events[-1].eta, 0.0)
+
+		# Listener is removed when leaving the context manager
+		self.assertNotIn(self.events.append, pscharmonics.progress.listeners)
+
+	def test_log_interval(self):
+		""" Stages which don't log each item only log periodically and when completed but listeners get every event """
+		pscharmonics.progress.add_listener(self.events.append)
+		original_interval = pscharmonics.constants.General.progress_log_interval
+		pscharmonics.constants.General.progress_log_interval = 1000.0
+		try:
+			tracker = pscharmonics.progress.Progress(stage='Test', total=10, log_each=False)
+			for i in range(10):
+				tracker.update(item=str(i))
+		finally:
+			pscharmonics.constants.General.progress_log_interval = original_interval
+
+		self.assertEqual(len(self.events), 11)
+		self.assertEqual([x.item for x in self.logged], ['9'])
+
+	def test_track_hulls(self):
+		""" Vertices are returned unchanged in the order of the jobs with progress reported for each """
+		jobs = [(None, None, 4, 'Node_A', 5), (None, None, 4, 'Node_B', 7)]
+		with pscharmonics.progress.listening(self.events.append):
+			vertices = list(pscharmonics.file_io.track_hulls(vertices=iter(['V1', 'V2']), jobs=jobs))
+
+		self.assertEqual(vertices, ['V1', 'V2'])
+		self.assertEqual([x.item for x in self.events[1:]], ['Node_A h5', 'Node_B h7'])
+		self.assertEqual(self.events[-1].stage, pscharmonics.progress.stage_hull)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,84 @@
+"""
+#######################################################################################################################
+###													test_timing.py													###
+###		Test code for the timing of each stage and the timing report												###
+###																													###
+#######################################################################################################################
+"""
+
+import unittest
+import os
+import json
+import pandas as pd
+
+from tests.context import pscharmonics
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), 'test_files')
+
+
+class TestTimings(unittest.TestCase):
+	""" Tests the recording of each stage and the report produced """
+	def setUp(self):
+		self.timings = pscharmonics.timing.Timings()
+		self.pth = os.path.join(TESTS_DIR, 'Timings_Test')
+
+	def tearDown(self):
+		for extension in ('.json', '.csv'):
+			if os.path.isfile('{}{}'.format(self.pth, extension)):
+				os.remove('{}{}'.format(self.pth, extension))
+
+	def test_span(self):
+		""" Nested stages reference the stage they are part of and are recorded even if an exception occurs """
+		with self.timings.span('outer', name='Project'):
+			with self.timings.span('inner'):
+				pass
+			with self.assertRaises(ValueError):
+				with self.timings.span('inner'):
+					raise ValueError
+
+		self.assertEqual([x['stage'] for x in self.timings.records], ['inner', 'inner', 'outer'])
+		self.assertEqual([x['parent'] for x in self.timings.records], ['outer', 'outer', ''])
+		self.assertEqual(self.timings.records[-1]['name'], 'Project')
+		self.assertEqual(self.timings.stack, list())
+
+		df = self.timings.summary()
+		self.assertEqual(list(df.index), ['inner', 'outer'])
+		self.assertEqual(df.loc['inner', 'count'], 2)
+		self.assertGreaterEqual(df.loc['outer', 'total'], df.loc['inner', 'total'])
+
+	def test_timed(self):
+		""" Decorated methods are timed and include the requested attributes """
+		timings = pscharmonics.timing.timings
+		timings.clear()
+
+		class Example:
+			name = 'Example'
+
+			@pscharmonics.timing.timed('Example.run', 'name')
+			def run(self, value):
+				return value * 2
+
+		self.assertEqual(Example().run(value=2), 4)
+		self.assertEqual(len(timings.records), 1)
+		self.assertEqual(timings.records[0]['stage'], 'Example.run')
+		self.assertEqual(timings.records[0]['name'], 'Example')
+		timings.clear()
+
+	def test_write_report(self):
+		""" Report is written as both a JSON and a CSV file """
+		self.timings.add(stage='stage_1', duration=1.5, name='A')
+		self.timings.add(stage='stage_1', duration=0.5, name='B')
+		pth_json, pth_csv = self.timings.write_report(pth=self.pth)
+
+		with open(pth_json, 'r') as f:
+			report = json.load(f)
+		self.assertEqual(report['summary']['stage_1']['count'], 2)
+		self.assertAlmostEqual(report['summary']['stage_1']['total'], 2.0)
+		self.assertEqual(len(report['records']), 2)
+
+		df = pd.read_csv(pth_csv)
+		self.assertEqual(list(df['name']), ['A', 'B'])
+
+
+if __name__ == '__main__':
+	unittest.main()